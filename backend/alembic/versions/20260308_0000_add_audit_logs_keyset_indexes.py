@@ -0,0 +1,34 @@
+"""add audit_logs keyset indexes
+
+Revision ID: 20260308_0000
+Revises: 20260307_0100
+Create Date: 2026-03-08 00:00:00.000000
+"""
+from alembic import op
+
+revision = '20260308_0000'
+down_revision = '20260307_0100'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Índices compuestos que cubren las combinaciones de filtros de la bitácora
+    # con el orden (created_at DESC, id DESC) usado por la paginación keyset
+    op.create_index('ix_audit_logs_created_at_id', 'audit_logs', ['created_at', 'id'])
+    op.create_index('ix_audit_logs_tenant_created_at', 'audit_logs', ['tenant_id', 'created_at', 'id'])
+    op.create_index(
+        'ix_audit_logs_tenant_module_created_at', 'audit_logs',
+        ['tenant_id', 'module_key', 'created_at', 'id']
+    )
+    op.create_index(
+        'ix_audit_logs_tenant_action_created_at', 'audit_logs',
+        ['tenant_id', 'action', 'created_at', 'id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audit_logs_tenant_action_created_at', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_tenant_module_created_at', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_tenant_created_at', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_created_at_id', table_name='audit_logs')
@@ -0,0 +1,126 @@
+"""partition audit_logs by month
+
+Revision ID: 20260308_0100
+Revises: 20260308_0000
+Create Date: 2026-03-08 01:00:00.000000
+
+Convierte audit_logs en una tabla particionada por RANGE (created_at) con
+una partición por mes. Las filas existentes se copian a sus particiones y
+la tabla original se elimina. La PK pasa a ser (id, created_at) porque
+PostgreSQL exige que incluya la llave de partición.
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20260308_0100'
+down_revision = '20260308_0000'
+branch_labels = None
+depends_on = None
+
+# Meses futuros a pre-crear (el job de Celery Beat mantiene la ventana)
+MONTHS_AHEAD = 3
+
+INDEXES = [
+    ('ix_audit_logs_action', ['action']),
+    ('ix_audit_logs_created_at', ['created_at']),
+    ('ix_audit_logs_module_key', ['module_key']),
+    ('ix_audit_logs_request_id', ['request_id']),
+    ('ix_audit_logs_tenant_id', ['tenant_id']),
+    ('ix_audit_logs_user_id', ['user_id']),
+    ('ix_audit_logs_created_at_id', ['created_at', 'id']),
+    ('ix_audit_logs_tenant_created_at', ['tenant_id', 'created_at', 'id']),
+    ('ix_audit_logs_tenant_module_created_at', ['tenant_id', 'module_key', 'created_at', 'id']),
+    ('ix_audit_logs_tenant_action_created_at', ['tenant_id', 'action', 'created_at', 'id']),
+]
+
+
+def _add_months(value: date, months: int) -> date:
+    index = value.year * 12 + (value.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # 1. Apartar la tabla actual
+    for name, _ in INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+    op.execute('ALTER TABLE audit_logs RENAME TO audit_logs_legacy')
+    op.execute('ALTER TABLE audit_logs_legacy RENAME CONSTRAINT audit_logs_pkey TO audit_logs_legacy_pkey')
+
+    # 2. Tabla padre particionada (reutiliza la secuencia existente de id)
+    op.execute("""
+        CREATE TABLE audit_logs (
+            id INTEGER NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+            tenant_id INTEGER REFERENCES tenants (id),
+            user_id INTEGER REFERENCES users (id),
+            module_key VARCHAR(50),
+            action VARCHAR(50),
+            entity_type VARCHAR(50),
+            entity_id INTEGER,
+            before_data JSON,
+            after_data JSON,
+            ip_address VARCHAR(50),
+            user_agent TEXT,
+            request_id VARCHAR(50),
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            CONSTRAINT audit_logs_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute('ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id')
+
+    # 3. Particiones mensuales desde la fila más antigua hasta MONTHS_AHEAD
+    oldest = conn.execute(sa.text('SELECT min(created_at) FROM audit_logs_legacy')).scalar()
+    today = date.today()
+    current = date(today.year, today.month, 1)
+    month = date(oldest.year, oldest.month, 1) if oldest else current
+    last = _add_months(current, MONTHS_AHEAD)
+    while month <= last:
+        end = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE audit_logs_p{month.year:04d}_{month.month:02d} "
+            f"PARTITION OF audit_logs FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        month = end
+    # Red de seguridad si el job de Beat no corre a tiempo
+    op.execute('CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT')
+
+    # 4. Índices (se propagan a cada partición)
+    for name, columns in INDEXES:
+        op.create_index(name, 'audit_logs', columns)
+
+    # 5. Copiar datos y eliminar la tabla original
+    op.execute('INSERT INTO audit_logs SELECT * FROM audit_logs_legacy')
+    op.execute('DROP TABLE audit_logs_legacy')
+
+
+def downgrade() -> None:
+    for name, _ in INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+    op.execute('ALTER TABLE audit_logs RENAME TO audit_logs_partitioned')
+    op.execute('ALTER TABLE audit_logs_partitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_partitioned_pkey')
+    op.execute("""
+        CREATE TABLE audit_logs (
+            id INTEGER NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+            tenant_id INTEGER REFERENCES tenants (id),
+            user_id INTEGER REFERENCES users (id),
+            module_key VARCHAR(50),
+            action VARCHAR(50),
+            entity_type VARCHAR(50),
+            entity_id INTEGER,
+            before_data JSON,
+            after_data JSON,
+            ip_address VARCHAR(50),
+            user_agent TEXT,
+            request_id VARCHAR(50),
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+        )
+    """)
+    op.execute('INSERT INTO audit_logs SELECT * FROM audit_logs_partitioned')
+    op.execute('ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id')
+    op.execute('DROP TABLE audit_logs_partitioned CASCADE')
+    op.execute('ALTER TABLE audit_logs ADD CONSTRAINT audit_logs_pkey PRIMARY KEY (id)')
+    for name, columns in INDEXES:
+        op.create_index(name, 'audit_logs', columns)
@@ -0,0 +1,24 @@
+"""add compliance_audit_logs (tenant_id, created_at) index
+
+Revision ID: 20260308_0200
+Revises: 20260308_0100
+Create Date: 2026-03-08 02:00:00.000000
+"""
+from alembic import op
+
+revision = '20260308_0200'
+down_revision = '20260308_0100'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Usado por la bitácora de cumplimiento y por el barrido del job de archivado
+    op.create_index(
+        'ix_compliance_audit_logs_tenant_created_at', 'compliance_audit_logs',
+        ['tenant_id', 'created_at']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_compliance_audit_logs_tenant_created_at', table_name='compliance_audit_logs')
@@ -0,0 +1,22 @@
+"""add licenses.rate_limit_per_minute
+
+Revision ID: 20260308_0300
+Revises: 20260308_0200
+Create Date: 2026-03-08 03:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20260308_0300'
+down_revision = '20260308_0200'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Cuota de requests/minuto del tenant; NULL usa RATE_LIMIT_TENANT_PER_MINUTE
+    op.add_column('licenses', sa.Column('rate_limit_per_minute', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('licenses', 'rate_limit_per_minute')
@@ -0,0 +1,47 @@
+"""task comments/activity keyset indexes and JSONB activity payload
+
+Revision ID: 20260308_0400
+Revises: 20260308_0300
+Create Date: 2026-03-08 04:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '20260308_0400'
+down_revision = '20260308_0300'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Timelines paginados por (created_at, id) dentro de cada tarea
+    op.create_index(
+        'ix_task_comments_task_created_at', 'task_comments',
+        ['task_id', 'created_at', 'id']
+    )
+    op.create_index(
+        'ix_task_activity_logs_task_created_at', 'task_activity_logs',
+        ['task_id', 'created_at', 'id']
+    )
+
+    # payload_json: Text con JSON -> JSONB (filtrable en el servidor)
+    op.alter_column(
+        'task_activity_logs', 'payload_json',
+        existing_type=sa.Text(),
+        type_=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using="NULLIF(payload_json, '')::jsonb",
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'task_activity_logs', 'payload_json',
+        existing_type=postgresql.JSONB(),
+        type_=sa.Text(),
+        existing_nullable=True,
+        postgresql_using='payload_json::text',
+    )
+    op.drop_index('ix_task_activity_logs_task_created_at', table_name='task_activity_logs')
+    op.drop_index('ix_task_comments_task_created_at', table_name='task_comments')
@@ -0,0 +1,57 @@
+"""denormalize project_id/tenant_id on task_activity_logs for activity feeds
+
+Revision ID: 20260308_0500
+Revises: 20260308_0400
+Create Date: 2026-03-08 05:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20260308_0500'
+down_revision = '20260308_0400'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('task_activity_logs', sa.Column('project_id', sa.Integer(), nullable=True))
+    op.add_column('task_activity_logs', sa.Column('tenant_id', sa.Integer(), nullable=True))
+
+    # Backfill desde la tarea y su proyecto
+    op.execute("""
+        UPDATE task_activity_logs l
+        SET project_id = p.id, tenant_id = p.tenant_id
+        FROM project_tasks t
+        JOIN projects p ON p.id = t.project_id
+        WHERE t.id = l.task_id
+    """)
+
+    op.alter_column('task_activity_logs', 'project_id', nullable=False)
+    op.alter_column('task_activity_logs', 'tenant_id', nullable=False)
+    op.create_foreign_key(
+        'fk_task_activity_logs_project_id', 'task_activity_logs', 'projects',
+        ['project_id'], ['id']
+    )
+    op.create_foreign_key(
+        'fk_task_activity_logs_tenant_id', 'task_activity_logs', 'tenants',
+        ['tenant_id'], ['id']
+    )
+
+    # Feeds de actividad paginados por (created_at, id)
+    op.create_index(
+        'ix_task_activity_logs_project_created_at', 'task_activity_logs',
+        ['project_id', 'created_at', 'id']
+    )
+    op.create_index(
+        'ix_task_activity_logs_tenant_created_at', 'task_activity_logs',
+        ['tenant_id', 'created_at', 'id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_activity_logs_tenant_created_at', table_name='task_activity_logs')
+    op.drop_index('ix_task_activity_logs_project_created_at', table_name='task_activity_logs')
+    op.drop_constraint('fk_task_activity_logs_tenant_id', 'task_activity_logs', type_='foreignkey')
+    op.drop_constraint('fk_task_activity_logs_project_id', 'task_activity_logs', type_='foreignkey')
+    op.drop_column('task_activity_logs', 'tenant_id')
+    op.drop_column('task_activity_logs', 'project_id')
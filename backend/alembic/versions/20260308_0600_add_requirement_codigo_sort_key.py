@@ -0,0 +1,33 @@
+"""add natural-sort key for compliance_requirements.codigo
+
+Revision ID: 20260308_0600
+Revises: 20260308_0500
+Create Date: 2026-03-08 06:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20260308_0600'
+down_revision = '20260308_0500'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # "2.10" -> "000002.000010": ordena como número cada grupo de dígitos
+    op.add_column(
+        'compliance_requirements',
+        sa.Column(
+            'codigo_sort_key',
+            sa.String(120),
+            sa.Computed(
+                r"regexp_replace(regexp_replace(codigo, '(\d+)', '00000\1', 'g'), '0*(\d{6})', '\1', 'g')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('compliance_requirements', 'codigo_sort_key')
@@ -2,13 +2,16 @@
 Auth Dependencies
 Dependencias para autenticación y autorización
 """
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from app.core.config import settings
+from app.core.authentication import (
+    PRINCIPAL_SCOPE_KEY,
+    get_request_principal,
+    principal_from_token,
+)
 from app.db.session import get_db
 from app.models.user import User
 
@@ -16,35 +19,32 @@ security = HTTPBearer()
 
 
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db)
 ) -> User:
     """
     Obtener usuario actual desde el token JWT
-    """
-    token = credentials.credentials
     
+    Reutiliza el principal verificado por AuthenticationMiddleware; sólo
+    decodifica el token si el middleware no está montado.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="No se pudo validar las credenciales",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        payload = jwt.decode(
-            token, 
-            settings.SECRET_KEY, 
-            algorithms=[settings.ALGORITHM]
-        )
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
+    if PRINCIPAL_SCOPE_KEY in request.scope:
+        principal = get_request_principal(request)
+    else:
+        principal = principal_from_token(credentials.credentials)
+    if principal is None:
         raise credentials_exception
     
     # Buscar usuario en la base de datos
     result = await db.execute(
-        select(User).where(User.id == int(user_id))
+        select(User).where(User.id == principal.user_id)
     )
     user = result.scalar_one_or_none()
     
@@ -3,7 +3,7 @@ Admin API Router
 Rutas administrativas solo para superadmin
 """
 from fastapi import APIRouter
-from app.api.v1.admin import quote_items, tenants, users, companies, security_levels, quotes, audit_logs, organization
+from app.api.v1.admin import quote_items, tenants, users, companies, security_levels, quotes, audit_logs, organization, system
 
 router = APIRouter()
 
@@ -16,3 +16,4 @@ router.include_router(companies.router, prefix="/companies", tags=["Admin - Comp
 router.include_router(security_levels.router, prefix="/security-levels", tags=["Admin - Security Levels"])
 router.include_router(audit_logs.router, prefix="/audit-logs", tags=["Admin - Audit Logs"])
 router.include_router(organization.router, prefix="/organization", tags=["Admin - Organization"])
+router.include_router(system.router, prefix="/system", tags=["Admin - System"])
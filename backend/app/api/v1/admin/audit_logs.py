@@ -2,14 +2,25 @@
 Admin – Audit Logs
 Consulta de la bitácora de acciones del sistema (solo superadmin)
 """
+import csv
+import io
+import json
+
 from fastapi import APIRouter, Depends, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
-from typing import Optional, List
+from sqlalchemy import select, and_
+from typing import Any, AsyncIterator, Optional, List
+from types import SimpleNamespace
 from datetime import datetime, date
 from pydantic import BaseModel
 
-from app.db.session import get_db
+from app.core.config import settings
+from app.core.audit_archive import ArchiveQuery, scan_archive
+from app.core.responses import FastJSONResponse
+from app.core.pagination import COUNT_MODE_PATTERN, count_rows, encode_cursor, keyset_before, next_cursor_from
+from app.db.session import get_read_db, read_session_factory
 from app.models.audit_log import AuditLog
 from app.models.user import User
 from app.api.dependencies import get_current_superadmin
@@ -41,34 +52,28 @@ class AuditLogItem(BaseModel):
 
 class AuditLogListResponse(BaseModel):
     items: List[AuditLogItem]
-    total: int
+    total: Optional[int]
     page: int
     page_size: int
-    pages: int
+    pages: Optional[int]
+    next_cursor: Optional[str] = None
+    total_is_exact: bool = True
 
 
 # ---------------------------------------------------------------------------
-# Endpoints
+# Helpers (compartidos con el endpoint tenant)
 # ---------------------------------------------------------------------------
 
-@router.get("", response_model=AuditLogListResponse)
-async def list_audit_logs(
-    page: int = Query(1, ge=1),
-    page_size: int = Query(50, ge=1, le=200),
-    tenant_id: Optional[int] = Query(None),
-    user_id: Optional[int] = Query(None),
-    module_key: Optional[str] = Query(None),
-    action: Optional[str] = Query(None),
-    entity_type: Optional[str] = Query(None),
-    date_from: Optional[date] = Query(None),
-    date_to: Optional[date] = Query(None),
-    db: AsyncSession = Depends(get_db),
-    _: User = Depends(get_current_superadmin),
-):
-    """
-    Listar entradas de la bitácora con filtros.
-    Solo accesible para superadmin.
-    """
+def build_audit_log_filters(
+    tenant_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    module_key: Optional[str] = None,
+    action: Optional[str] = None,
+    entity_type: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> list:
+    """Condiciones WHERE de la bitácora a partir de los filtros del query string."""
     filters = []
     if tenant_id is not None:
         filters.append(AuditLog.tenant_id == tenant_id)
@@ -84,63 +89,238 @@ async def list_audit_logs(
         filters.append(AuditLog.created_at >= datetime.combine(date_from, datetime.min.time()))
     if date_to:
         filters.append(AuditLog.created_at <= datetime.combine(date_to, datetime.max.time()))
+    return filters
+
+
+async def load_user_emails(db: AsyncSession, user_ids: set[int]) -> dict[int, str]:
+    """Mapa user_id → email para enriquecer las entradas de la bitácora."""
+    if not user_ids:
+        return {}
+    users_result = await db.execute(
+        select(User.id, User.email).where(User.id.in_(user_ids))
+    )
+    return {row.id: row.email for row in users_result}
+
+
+def to_audit_log_item(log: Any, users_map: dict[int, str]) -> AuditLogItem:
+    """Construir AuditLogItem desde una fila ORM o un registro archivado."""
+    return AuditLogItem(
+        id=log.id,
+        tenant_id=log.tenant_id,
+        user_id=log.user_id,
+        user_email=users_map.get(log.user_id) if log.user_id else None,
+        module_key=log.module_key,
+        action=log.action,
+        entity_type=log.entity_type,
+        entity_id=log.entity_id,
+        ip_address=log.ip_address,
+        after_data=log.after_data,
+        before_data=log.before_data,
+        request_id=log.request_id,
+        created_at=log.created_at,
+    )
 
+
+async def fetch_audit_log_page(
+    db: AsyncSession,
+    filters: list,
+    page: int,
+    page_size: int,
+    cursor: Optional[str],
+    count: str,
+    archive: Optional[ArchiveQuery] = None,
+) -> AuditLogListResponse:
+    """
+    Obtener una página de la bitácora.
+
+    Con `cursor` se usa paginación keyset sobre (created_at, id), que cuesta lo
+    mismo en la página 1 que en la 10,000. Sin cursor se mantiene OFFSET/LIMIT
+    por compatibilidad. En ambos casos se devuelve `next_cursor`.
+
+    Con `archive`, cuando la tabla viva se agota la página continúa con los
+    segmentos archivados en MinIO (siempre más antiguos), de modo que el mismo
+    cursor recorre ambas fuentes.
+    """
     where = and_(*filters) if filters else True
 
-    # Total
-    count_result = await db.execute(select(func.count()).select_from(AuditLog).where(where))
-    total = count_result.scalar_one()
+    total, total_is_exact = await count_rows(
+        db, AuditLog, where,
+        mode=count,
+        cap=settings.AUDIT_LOG_COUNT_CAP,
+        has_filters=bool(filters),
+    )
 
-    # Paginated items
-    offset = (page - 1) * page_size
-    result = await db.execute(
+    query = (
         select(AuditLog)
         .where(where)
-        .order_by(AuditLog.created_at.desc())
-        .offset(offset)
-        .limit(page_size)
+        .order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+        .limit(page_size + 1)
     )
-    logs = result.scalars().all()
+    if cursor:
+        query = query.where(keyset_before(AuditLog.created_at, AuditLog.id, cursor))
+    else:
+        query = query.offset((page - 1) * page_size)
 
-    # Enrich with user emails
-    user_ids = {log.user_id for log in logs if log.user_id}
-    users_map: dict[int, str] = {}
-    if user_ids:
-        users_result = await db.execute(
-            select(User.id, User.email).where(User.id.in_(user_ids))
+    result = await db.execute(query)
+    rows = list(result.scalars().all())
+
+    # Continuar con el archivo frío (sólo navegable por cursor o desde la página 1)
+    if archive is not None and len(rows) <= page_size and (cursor or page == 1):
+        archive_cursor = encode_cursor(rows[-1].created_at, rows[-1].id) if rows else cursor
+        archived = await run_in_threadpool(
+            scan_archive, "audit_logs", archive, archive_cursor, page_size + 1 - len(rows)
         )
-        users_map = {row.id: row.email for row in users_result}
-
-    items = []
-    for log in logs:
-        items.append(AuditLogItem(
-            id=log.id,
-            tenant_id=log.tenant_id,
-            user_id=log.user_id,
-            user_email=users_map.get(log.user_id) if log.user_id else None,
-            module_key=log.module_key,
-            action=log.action,
-            entity_type=log.entity_type,
-            entity_id=log.entity_id,
-            ip_address=log.ip_address,
-            after_data=log.after_data,
-            before_data=log.before_data,
-            request_id=log.request_id,
-            created_at=log.created_at,
-        ))
+        rows.extend(SimpleNamespace(**row) for row in archived)
+        total_is_exact = False
+
+    next_cursor = next_cursor_from(rows, page_size)
+    logs = rows[:page_size]
+
+    # Enrich with user emails
+    users_map = await load_user_emails(db, {log.user_id for log in logs if log.user_id})
 
     return AuditLogListResponse(
-        items=items,
+        items=[to_audit_log_item(log, users_map) for log in logs],
         total=total,
         page=page,
         page_size=page_size,
-        pages=max(1, -(-total // page_size)),  # ceiling division
+        pages=max(1, -(-total // page_size)) if total is not None else None,  # ceiling division
+        next_cursor=next_cursor,
+        total_is_exact=total_is_exact,
+    )
+
+
+EXPORT_COLUMNS = [
+    "id", "created_at", "tenant_id", "user_id", "user_email", "module_key", "action",
+    "entity_type", "entity_id", "ip_address", "request_id", "before_data", "after_data",
+]
+EXPORT_BATCH_SIZE = 1000
+
+
+async def stream_audit_log_export(filters: list, fmt: str) -> AsyncIterator[str]:
+    """
+    Generar la exportación de la bitácora en CSV o NDJSON.
+
+    Usa un cursor del lado del servidor (stream_scalars + yield_per) y emite un
+    bloque por lote, así la memoria es constante sin importar el tamaño. Los
+    emails se resuelven por lote y sólo para usuarios aún no vistos.
+
+    Abre su propia sesión: las dependencias con yield se cierran antes de que
+    StreamingResponse empiece a enviar el cuerpo.
+    """
+    where = and_(*filters) if filters else True
+    query = (
+        select(AuditLog)
+        .where(where)
+        .order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+    if fmt == "csv":
+        header = io.StringIO()
+        csv.writer(header).writerow(EXPORT_COLUMNS)
+        yield header.getvalue()
+
+    users_map: dict[int, str] = {}
+    session_factory = await read_session_factory()
+    async with session_factory() as db:
+        result = await db.stream_scalars(query)
+        async for batch in result.partitions():
+            pending = {log.user_id for log in batch if log.user_id and log.user_id not in users_map}
+            users_map.update(await load_user_emails(db, pending))
+
+            chunk = io.StringIO()
+            writer = csv.writer(chunk) if fmt == "csv" else None
+            for log in batch:
+                item = to_audit_log_item(log, users_map).model_dump(mode="json")
+                if writer:
+                    writer.writerow([
+                        json.dumps(item[col]) if col in ("before_data", "after_data") and item[col] is not None
+                        else item[col]
+                        for col in EXPORT_COLUMNS
+                    ])
+                else:
+                    chunk.write(json.dumps({col: item[col] for col in EXPORT_COLUMNS}) + "\n")
+            yield chunk.getvalue()
+
+            # Liberar las filas del lote del identity map
+            db.expunge_all()
+
+
+def audit_log_export_response(filters: list, fmt: str) -> StreamingResponse:
+    media_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    filename = f"bitacora_{datetime.utcnow():%Y%m%d_%H%M%S}.{fmt}"
+    return StreamingResponse(
+        stream_audit_log_export(filters, fmt),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# ---------------------------------------------------------------------------
+# Endpoints
+# ---------------------------------------------------------------------------
+
+@router.get("", response_model=AuditLogListResponse)
+async def list_audit_logs(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor de la página anterior"),
+    count: str = Query("exact", pattern=COUNT_MODE_PATTERN),
+    tenant_id: Optional[int] = Query(None),
+    user_id: Optional[int] = Query(None),
+    module_key: Optional[str] = Query(None),
+    action: Optional[str] = Query(None),
+    entity_type: Optional[str] = Query(None),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    include_archive: bool = Query(False, description="Continuar en el archivo frío de MinIO"),
+    db: AsyncSession = Depends(get_read_db),
+    _: User = Depends(get_current_superadmin),
+):
+    """
+    Listar entradas de la bitácora con filtros.
+    Solo accesible para superadmin.
+    """
+    filters = build_audit_log_filters(
+        tenant_id=tenant_id, user_id=user_id, module_key=module_key, action=action,
+        entity_type=entity_type, date_from=date_from, date_to=date_to,
+    )
+
+    archive = ArchiveQuery(
+        tenant_id=tenant_id, all_tenants=tenant_id is None, user_id=user_id, module_key=module_key, action=action,
+        entity_type=entity_type, date_from=date_from, date_to=date_to,
+    ) if include_archive else None
+
+    return FastJSONResponse(await fetch_audit_log_page(db, filters, page, page_size, cursor, count, archive))
+
+
+@router.get("/export")
+async def export_audit_logs(
+    fmt: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    tenant_id: Optional[int] = Query(None),
+    user_id: Optional[int] = Query(None),
+    module_key: Optional[str] = Query(None),
+    action: Optional[str] = Query(None),
+    entity_type: Optional[str] = Query(None),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    _: User = Depends(get_current_superadmin),
+):
+    """
+    Exportar la bitácora completa (mismos filtros que el listado) en streaming.
+    Solo accesible para superadmin.
+    """
+    filters = build_audit_log_filters(
+        tenant_id=tenant_id, user_id=user_id, module_key=module_key, action=action,
+        entity_type=entity_type, date_from=date_from, date_to=date_to,
     )
+    return audit_log_export_response(filters, fmt)
 
 
 @router.get("/modules", response_model=List[str])
 async def list_modules(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _: User = Depends(get_current_superadmin),
 ):
     """Lista de módulos distintos que han generado entradas."""
@@ -152,7 +332,7 @@ async def list_modules(
 
 @router.get("/actions", response_model=List[str])
 async def list_actions(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _: User = Depends(get_current_superadmin),
 ):
     """Lista de acciones distintas registradas."""
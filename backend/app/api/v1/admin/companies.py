@@ -13,6 +13,8 @@ from app.models.user import User
 from app.models.company import Company
 from app.models.tenant import Tenant
 from app.models.document import Document
+from app.core.classification import calcular_clasificacion
+from app.core.etag import bump_version, company_resource
 from app.core.minio_client import minio_client
 from pydantic import BaseModel, Field, EmailStr
 
@@ -90,20 +92,6 @@ class CompanyUpdate(BaseModel):
     is_active: Optional[bool] = None
 
 
-def _calcular_clasificacion(data: dict) -> Optional[str]:
-    """Clasificación automática por demanda contratada"""
-    demanda = data.get("demanda_contratada_kw")
-    if not demanda:
-        return None
-    if demanda >= 1000:
-        return "Grande"
-    elif demanda >= 500:
-        return "Mediana"
-    elif demanda >= 100:
-        return "Pequeña"
-    return "Micro"
-
-
 @router.get("/")
 async def list_companies(
     tenant_id: Optional[int] = None,
@@ -258,7 +246,7 @@ async def create_company(
 
     data = company_data.model_dump()
     data["rfc"] = data["rfc"].upper()
-    data["clasificacion"] = _calcular_clasificacion(data)
+    data["clasificacion"] = calcular_clasificacion(data)
 
     company = Company(**data)
     db.add(company)
@@ -301,16 +289,18 @@ async def update_company(
         if result.scalar_one_or_none():
             raise HTTPException(status_code=400, detail="El RPU ya está registrado en otra empresa")
 
-    # Recalcular clasificación si cambió la demanda
-    if "demanda_contratada_kw" in update_data:
-        update_data["clasificacion"] = _calcular_clasificacion(
-            {**company.__dict__, **update_data}
-        )
+    # Recalcular clasificación si cambió algo relevante
+    if any(k in update_data for k in ("tipo_suministro", "demanda_contratada_kw")):
+        update_data["clasificacion"] = calcular_clasificacion({
+            "tipo_suministro": update_data.get("tipo_suministro", company.tipo_suministro),
+            "demanda_contratada_kw": update_data.get("demanda_contratada_kw", company.demanda_contratada_kw),
+        })
 
     for field, value in update_data.items():
         setattr(company, field, value)
 
     await db.commit()
+    await bump_version(company_resource(company_id))
     await db.refresh(company)
 
     return company
@@ -8,6 +8,7 @@ from sqlalchemy import select, func, and_, or_
 from typing import Optional
 
 from app.api.dependencies import get_current_superadmin, get_db
+from app.core.etag import CATALOG_RESOURCE, bump_version
 from app.models.user import User
 from app.models.quote_item import QuoteItem, TenantQuoteItemPrice
 from app.schemas.quote_item import (
@@ -42,6 +43,7 @@ async def create_quote_item(
     )
     db.add(db_item)
     await db.commit()
+    await bump_version(CATALOG_RESOURCE)
     await db.refresh(db_item)
     
     return db_item
@@ -155,6 +157,7 @@ async def update_quote_item(
     item.updated_by = current_user.id
     
     await db.commit()
+    await bump_version(CATALOG_RESOURCE)
     await db.refresh(item)
     
     return item
@@ -181,6 +184,7 @@ async def delete_quote_item(
     item.updated_by = current_user.id
     
     await db.commit()
+    await bump_version(CATALOG_RESOURCE)
     
     return {"message": "Quote item deactivated successfully"}
 
@@ -0,0 +1,31 @@
+"""
+Admin System Router
+Telemetría de infraestructura del proceso (solo superadmin)
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.api.dependencies import get_current_superadmin
+from app.db.pool import pool_status
+from app.db.session import engine, read_engine
+from app.models.user import User
+
+router = APIRouter()
+
+
+@router.get("/db-pool")
+async def get_db_pool_status(
+    role: str = Query("primary", pattern="^(primary|replica)$"),
+    current_user: User = Depends(get_current_superadmin),
+):
+    """
+    Estado del pool de conexiones del worker que atiende el request
+
+    Incluye conexiones en uso, overflow actual, tiempo de espera acumulado
+    y eventos de overflow/timeout/invalidación desde el arranque del proceso.
+    Con role=replica, el pool del engine de réplica de lectura.
+    """
+    if role == "replica":
+        if read_engine is None:
+            raise HTTPException(status_code=404, detail="No hay réplica de lectura configurada")
+        return pool_status(read_engine.pool)
+    return pool_status(engine.pool)
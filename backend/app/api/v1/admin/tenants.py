@@ -12,6 +12,7 @@ from app.api.dependencies import get_current_superadmin, get_db
 from app.models.user import User
 from app.models.tenant import Tenant
 from app.models.license import License
+from app.core.tenant_cache import publish_invalidation
 from pydantic import BaseModel, Field, EmailStr
 
 router = APIRouter()
@@ -228,6 +229,7 @@ async def update_tenant(
         setattr(tenant, field, value)
     
     await db.commit()
+    await publish_invalidation(tenant_id)
     await db.refresh(tenant)
     
     return TenantResponse.model_validate(tenant)
@@ -254,5 +256,6 @@ async def delete_tenant(
     tenant.status = TenantStatus.SUSPENDED
     
     await db.commit()
+    await publish_invalidation(tenant_id)
     
     return {"message": "Tenant deactivated successfully"}
@@ -4,104 +4,95 @@ Consulta de bitácora filtrada por tenant del usuario autenticado.
 """
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, and_
 from typing import Optional, List
-from datetime import datetime, date
+from datetime import date
 
-from app.db.session import get_db
+from app.core.audit_archive import ArchiveQuery
+from app.core.pagination import COUNT_MODE_PATTERN
+from app.core.responses import FastJSONResponse
+from app.db.session import get_read_db
 from app.models.audit_log import AuditLog
 from app.models.user import User
 from app.api.dependencies import get_current_active_user
-from app.api.v1.admin.audit_logs import AuditLogItem, AuditLogListResponse
+from app.api.v1.admin.audit_logs import (
+    AuditLogListResponse,
+    audit_log_export_response,
+    build_audit_log_filters,
+    fetch_audit_log_page,
+)
 
 router = APIRouter()
 
 
+def _tenant_scope(current_user: User) -> list:
+    """
+    Restricción de tenant para usuarios no superadmin
+
+    Se construye aquí y no con build_audit_log_filters, que omite el filtro
+    con tenant_id None: un usuario sin tenant sólo ve filas con tenant NULL.
+    """
+    if current_user.is_superadmin:
+        return []
+    return [AuditLog.tenant_id == current_user.tenant_id]
+
+
 @router.get("", response_model=AuditLogListResponse)
 async def list_my_audit_logs(
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor de la página anterior"),
+    count: str = Query("exact", pattern=COUNT_MODE_PATTERN),
     module_key: Optional[str] = Query(None),
     action: Optional[str] = Query(None),
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
-    db: AsyncSession = Depends(get_db),
+    include_archive: bool = Query(False, description="Continuar en el archivo frío de MinIO"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """
     Bitácora filtrada por el tenant del usuario autenticado.
     Si es superadmin, ve todo (misma vista que el endpoint admin).
     """
-    filters = []
-    if not current_user.is_superadmin:
-        filters.append(AuditLog.tenant_id == current_user.tenant_id)
-
-    if module_key:
-        filters.append(AuditLog.module_key == module_key)
-    if action:
-        filters.append(AuditLog.action == action)
-    if date_from:
-        filters.append(AuditLog.created_at >= datetime.combine(date_from, datetime.min.time()))
-    if date_to:
-        filters.append(AuditLog.created_at <= datetime.combine(date_to, datetime.max.time()))
-
-    where = and_(*filters) if filters else True
-
-    count_result = await db.execute(select(func.count()).select_from(AuditLog).where(where))
-    total = count_result.scalar_one()
-
-    offset = (page - 1) * page_size
-    result = await db.execute(
-        select(AuditLog)
-        .where(where)
-        .order_by(AuditLog.created_at.desc())
-        .offset(offset)
-        .limit(page_size)
+    filters = _tenant_scope(current_user) + build_audit_log_filters(
+        module_key=module_key, action=action, date_from=date_from, date_to=date_to,
     )
-    logs = result.scalars().all()
 
-    user_ids = {log.user_id for log in logs if log.user_id}
-    users_map: dict[int, str] = {}
-    if user_ids:
-        users_result = await db.execute(
-            select(User.id, User.email).where(User.id.in_(user_ids))
-        )
-        users_map = {row.id: row.email for row in users_result}
+    archive = ArchiveQuery(
+        tenant_id=None if current_user.is_superadmin else current_user.tenant_id,
+        all_tenants=current_user.is_superadmin,
+        module_key=module_key, action=action, date_from=date_from, date_to=date_to,
+    ) if include_archive else None
+
+    return FastJSONResponse(await fetch_audit_log_page(db, filters, page, page_size, cursor, count, archive))
 
-    items = [
-        AuditLogItem(
-            id=log.id,
-            tenant_id=log.tenant_id,
-            user_id=log.user_id,
-            user_email=users_map.get(log.user_id) if log.user_id else None,
-            module_key=log.module_key,
-            action=log.action,
-            entity_type=log.entity_type,
-            entity_id=log.entity_id,
-            ip_address=log.ip_address,
-            after_data=log.after_data,
-            before_data=log.before_data,
-            request_id=log.request_id,
-            created_at=log.created_at,
-        )
-        for log in logs
-    ]
 
-    return AuditLogListResponse(
-        items=items,
-        total=total,
-        page=page,
-        page_size=page_size,
-        pages=max(1, -(-total // page_size)),
+@router.get("/export")
+async def export_my_audit_logs(
+    fmt: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    module_key: Optional[str] = Query(None),
+    action: Optional[str] = Query(None),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Exportar la bitácora del tenant en streaming (CSV o NDJSON).
+    Si es superadmin, exporta todo.
+    """
+    filters = _tenant_scope(current_user) + build_audit_log_filters(
+        module_key=module_key, action=action, date_from=date_from, date_to=date_to,
     )
+    return audit_log_export_response(filters, fmt)
 
 
 @router.get("/modules", response_model=List[str])
 async def list_my_modules(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    filters = [] if current_user.is_superadmin else [AuditLog.tenant_id == current_user.tenant_id]
+    filters = _tenant_scope(current_user)
     where = and_(*filters) if filters else True
     result = await db.execute(
         select(AuditLog.module_key).where(where).distinct().order_by(AuditLog.module_key)
@@ -111,10 +102,10 @@ async def list_my_modules(
 
 @router.get("/actions", response_model=List[str])
 async def list_my_actions(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    filters = [] if current_user.is_superadmin else [AuditLog.tenant_id == current_user.tenant_id]
+    filters = _tenant_scope(current_user)
     where = and_(*filters) if filters else True
     result = await db.execute(
         select(AuditLog.action).where(where).distinct().order_by(AuditLog.action)
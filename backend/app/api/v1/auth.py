@@ -2,7 +2,7 @@
 Authentication Router
 Endpoints para login, refresh token, logout
 """
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, Request, status, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from datetime import datetime
@@ -10,6 +10,8 @@ from datetime import datetime
 from app.schemas.auth import LoginRequest, TokenResponse, UserProfile, RefreshTokenRequest
 from app.core.security import verify_password, create_access_token, create_refresh_token, hash_password
 from app.core.config import settings
+from app.core.etag import conditional_response
+from app.core.tenant_cache import tenant_cache
 from app.db.session import get_db
 from app.db.base import import_models
 from app.api.dependencies import get_current_user
@@ -18,7 +20,6 @@ from app.api.dependencies import get_current_user
 import_models()
 
 from app.models.user import User
-from app.models.tenant import Tenant
 from app.models.security_level import SecurityLevel
 
 router = APIRouter()
@@ -61,11 +62,8 @@ async def login(
     
     # Si no es superadmin, verificar que el tenant esté activo
     if not user.is_superadmin and user.tenant_id:
-        result = await db.execute(
-            select(Tenant).where(Tenant.id == user.tenant_id)
-        )
-        tenant = result.scalar_one_or_none()
-        if not tenant or (hasattr(tenant.status, 'value') and tenant.status.value != 'active'):
+        tenant = await tenant_cache.get(user.tenant_id, db)
+        if not tenant or not tenant.is_active:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Tenant inactivo"
@@ -148,13 +146,19 @@ async def refresh_token(
 
 @router.get("/me", response_model=UserProfile)
 async def get_current_user_profile(
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get current user profile
-    Devuelve información del usuario autenticado
+    Devuelve información del usuario autenticado (con ETag / 304)
     """
+    return conditional_response(request, await build_user_profile(current_user, db))
+
+
+async def build_user_profile(current_user: User, db: AsyncSession) -> UserProfile:
+    """Perfil del usuario con tenant, roles, permisos y módulos de seguridad"""
     from app.models.role import Role
     from app.models.permission import Permission
     from app.models.module import Module
@@ -162,10 +166,7 @@ async def get_current_user_profile(
     # Obtener nombre del tenant si existe
     tenant_name = None
     if current_user.tenant_id:
-        result = await db.execute(
-            select(Tenant).where(Tenant.id == current_user.tenant_id)
-        )
-        tenant = result.scalar_one_or_none()
+        tenant = await tenant_cache.get(current_user.tenant_id, db)
         if tenant:
             tenant_name = tenant.name
     
@@ -248,7 +249,7 @@ async def update_profile(
     current_user.full_name = data.full_name.strip()
     await db.commit()
     await db.refresh(current_user)
-    return await get_current_user_profile(current_user, db)
+    return await build_user_profile(current_user, db)
 
 
 @router.post("/me/photo", response_model=UserProfile)
@@ -278,7 +279,7 @@ async def upload_profile_photo(
     current_user.photo_url = photo_url
     await db.commit()
     await db.refresh(current_user)
-    return await get_current_user_profile(current_user, db)
+    return await build_user_profile(current_user, db)
 
 
 class ChangePasswordRequest(PydanticBaseModel):
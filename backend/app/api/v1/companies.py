@@ -2,66 +2,42 @@
 Companies Router
 Endpoints para gestión de empresas
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import uuid
+
+from fastapi import APIRouter, Depends, File, HTTPException, status, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, distinct, func, or_
 from typing import Optional
 
 from app.schemas.company import CompanyCreate, CompanyUpdate, CompanyResponse, CompanyListResponse
 from app.db.session import get_db
 from app.models.company import Company
+from app.models.compliance import CompanyClassification
+from app.models.project import Project, ProjectStatus, ProjectTask, TaskStatus
 from app.models.user import User
 from app.api.dependencies import get_current_active_user
+from app.core.classification import calcular_clasificacion
+from app.core.company_import import ImportFileError, import_format, read_header
+from app.core.config import settings
+from app.core.etag import bump_version, company_resource
+from app.core.exports import export_response
+from app.core.jobs import register_job
+from app.core.minio_client import minio_client
+from app.core.responses import FastJSONResponse
+from app.schemas.job import JobAccepted
+from app.workers.tasks import import_companies_job, reclassify_companies_job
 
 router = APIRouter()
 
 
-def calcular_clasificacion(company_data: dict) -> str:
-    """
-    Calcular clasificación automática basada en tipo de suministro y demanda
-    """
-    tipo = company_data.get('tipo_suministro')
-    demanda = company_data.get('demanda_contratada_kw') or 0
-    
-    # Convertir a float si es necesario y manejar None
-    try:
-        demanda = float(demanda) if demanda is not None else 0.0
-    except (ValueError, TypeError):
-        demanda = 0.0
-    
-    if tipo == 'GDMTH':
-        if demanda >= 1000:
-            return 'GDMTH-ALTO'
-        elif demanda >= 500:
-            return 'GDMTH-MEDIO'
-        else:
-            return 'GDMTH-BAJO'
-    elif tipo == 'GDMTO':
-        if demanda >= 500:
-            return 'GDMTO-ALTO'
-        else:
-            return 'GDMTO-MEDIO'
-    elif tipo == 'GDBT':
-        return 'GDBT'
-    else:
-        return tipo
-
-
-@router.get("/", response_model=CompanyListResponse)
-async def list_companies(
-    page: int = Query(1, ge=1),
-    page_size: int = Query(10, ge=1, le=1000),
-    search: Optional[str] = None,
-    tipo_suministro: Optional[str] = None,
-    is_active: Optional[bool] = None,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
-):
-    """
-    Listar empresas del tenant del usuario autenticado
-    """
-    query = select(Company)
-    
+def _company_filters(
+    current_user: User,
+    search: Optional[str],
+    tipo_suministro: Optional[str],
+    is_active: Optional[bool],
+) -> list:
+    """Condiciones WHERE del listado (y de la exportación) de empresas"""
     filters = []
     
     # FILTRO POR TENANT: Solo ver empresas de su organización
@@ -84,6 +60,26 @@ async def list_companies(
     if is_active is not None:
         filters.append(Company.is_active == is_active)
     
+    return filters
+
+
+@router.get("/", response_model=CompanyListResponse)
+async def list_companies(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=1000),
+    search: Optional[str] = None,
+    tipo_suministro: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Listar empresas del tenant del usuario autenticado
+    """
+    query = select(Company)
+    
+    filters = _company_filters(current_user, search, tipo_suministro, is_active)
+    
     if filters:
         query = query.where(*filters)
     
@@ -109,6 +105,81 @@ async def list_companies(
     )
 
 
+EXPORT_COLUMNS = [
+    "id", "razon_social", "nombre_comercial", "rfc", "rpu", "ciudad", "estado",
+    "tipo_suministro", "tension_suministro", "demanda_contratada_kw", "demanda_maxima_kw",
+    "factor_carga", "factor_potencia", "consumo_mensual_kwh", "costo_mensual_aproximado",
+    "clasificacion", "tipo_centro_carga", "is_active",
+    "proyectos", "proyectos_abiertos", "tareas", "tareas_completadas", "avance_porcentaje",
+]
+
+
+def _company_export_query(filters: list, tenant_id: Optional[int]):
+    """
+    Empresas con datos eléctricos, clasificación y avance de proyectos
+
+    El avance sale de un solo agregado (proyectos JOIN tareas agrupado por
+    empresa) unido a las empresas, no de una consulta por empresa.
+    """
+    progress = (
+        select(
+            Project.company_id,
+            func.count(distinct(Project.id)).label("projects"),
+            func.count(distinct(Project.id)).filter(
+                Project.status.in_([ProjectStatus.ABIERTO, ProjectStatus.EN_PROGRESO])
+            ).label("open_projects"),
+            func.count(ProjectTask.id).label("tasks"),
+            func.count(ProjectTask.id).filter(ProjectTask.status == TaskStatus.COMPLETADO).label("completed_tasks"),
+        )
+        .outerjoin(ProjectTask, ProjectTask.project_id == Project.id)
+        .group_by(Project.company_id)
+    )
+    if tenant_id is not None:
+        progress = progress.where(Project.tenant_id == tenant_id)
+    progress = progress.subquery()
+
+    query = (
+        select(
+            Company.id, Company.razon_social, Company.nombre_comercial, Company.rfc, Company.rpu,
+            Company.ciudad, Company.estado, Company.tipo_suministro, Company.tension_suministro,
+            Company.demanda_contratada_kw, Company.demanda_maxima_kw,
+            Company.factor_carga, Company.factor_potencia,
+            Company.consumo_mensual_kwh, Company.costo_mensual_aproximado,
+            Company.clasificacion, CompanyClassification.tipo_centro_carga, Company.is_active,
+            func.coalesce(progress.c.projects, 0),
+            func.coalesce(progress.c.open_projects, 0),
+            func.coalesce(progress.c.tasks, 0),
+            func.coalesce(progress.c.completed_tasks, 0),
+            func.round(
+                100.0 * progress.c.completed_tasks / func.nullif(progress.c.tasks, 0), 2
+            ),
+        )
+        .outerjoin(CompanyClassification, CompanyClassification.company_id == Company.id)
+        .outerjoin(progress, progress.c.company_id == Company.id)
+        .order_by(Company.razon_social, Company.id)
+    )
+    if filters:
+        query = query.where(*filters)
+    return query
+
+
+@router.get("/export")
+async def export_companies(
+    fmt: str = Query("csv", alias="format", pattern="^(csv|xlsx)$"),
+    search: Optional[str] = None,
+    tipo_suministro: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Exportar empresas del tenant (CSV o XLSX) con datos eléctricos,
+    clasificación y avance de sus proyectos, en streaming
+    """
+    filters = _company_filters(current_user, search, tipo_suministro, is_active)
+    query = _company_export_query(filters, None if current_user.is_superadmin else current_user.tenant_id)
+    return export_response(query, EXPORT_COLUMNS, tuple, fmt, "empresas")
+
+
 @router.get("/{company_id}", response_model=CompanyResponse)
 async def get_company(
     company_id: int,
@@ -186,6 +257,85 @@ async def create_company(
     return company
 
 
+@router.post("/import", response_model=JobAccepted, status_code=status.HTTP_202_ACCEPTED)
+async def import_companies(
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Importar empresas desde CSV o XLSX (una fila por empresa, encabezados
+    con los nombres de campo de CompanyCreate)
+
+    El archivo se sube a MinIO y se procesa en un job de Celery; el estado,
+    el progreso y el reporte de errores por fila se consultan en /jobs/{job_id}.
+    """
+    if current_user.tenant_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El usuario no pertenece a un tenant"
+        )
+
+    fmt = import_format(file.filename)
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Formato no soportado (use .csv o .xlsx)"
+        )
+    if file.size is not None and file.size > settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"El archivo excede {settings.MAX_UPLOAD_SIZE_MB} MB"
+        )
+
+    # Rechazar de inmediato archivos ilegibles o sin columnas requeridas
+    try:
+        await run_in_threadpool(read_header, file.file, fmt)
+    except ImportFileError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    file.file.seek(0)
+
+    object_name = f"imports/{current_user.tenant_id}/{uuid.uuid4().hex}.{fmt}"
+    await run_in_threadpool(
+        minio_client.upload_stream, "documentos", object_name, file.file,
+        file.content_type or "application/octet-stream"
+    )
+
+    job = import_companies_job.delay(current_user.tenant_id, current_user.id, object_name, fmt)
+    await register_job(job.id, "company_import", current_user.tenant_id, current_user.id)
+    return FastJSONResponse(
+        JobAccepted(job_id=job.id, kind="company_import", status_url=f"{settings.API_V1_PREFIX}/jobs/{job.id}"),
+        status_code=status.HTTP_202_ACCEPTED,
+    )
+
+
+@router.post("/reclassify", response_model=JobAccepted, status_code=status.HTTP_202_ACCEPTED)
+async def reclassify_companies(
+    tenant_id: Optional[int] = Query(None, description="Tenant a recalcular (sólo superadmin)"),
+    regenerate_classifications: bool = Query(False, description="Regenerar también el tipo de centro de carga sugerido"),
+    dry_run: bool = Query(False, description="Sólo reportar diferencias, sin escribir"),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Recalcular la clasificación de todas las empresas del tenant
+
+    Útil cuando cambian los umbrales del motor de clasificación. Se ejecuta
+    en un job de Celery; las diferencias se consultan en /jobs/{job_id}.
+    """
+    target_tenant_id = tenant_id if current_user.is_superadmin and tenant_id else current_user.tenant_id
+    if target_tenant_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Indique el tenant a recalcular"
+        )
+
+    job = reclassify_companies_job.delay(target_tenant_id, current_user.id, regenerate_classifications, dry_run)
+    await register_job(job.id, "company_reclassify", target_tenant_id, current_user.id)
+    return FastJSONResponse(
+        JobAccepted(job_id=job.id, kind="company_reclassify", status_url=f"{settings.API_V1_PREFIX}/jobs/{job.id}"),
+        status_code=status.HTTP_202_ACCEPTED,
+    )
+
+
 @router.put("/{company_id}", response_model=CompanyResponse)
 async def update_company(
     company_id: int,
@@ -257,6 +407,7 @@ async def update_company(
         })
     
     await db.commit()
+    await bump_version(company_resource(company_id))
     await db.refresh(company)
     
     return company
@@ -292,5 +443,6 @@ async def delete_company(
     # Soft delete
     company.is_active = False
     await db.commit()
+    await bump_version(company_resource(company_id))
     
     return None
@@ -1,13 +1,26 @@
 """
 API endpoints for Compliance Matrix (Matriz de Obligaciones)
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, cast, String
 from typing import List
 import json
 
 from app.api.dependencies import get_current_user, get_db
+from app.core.audit_archive import ArchiveQuery, scan_archive
+from app.core.etag import (
+    COMPLIANCE_RESOURCE,
+    bump_version,
+    company_resource,
+    conditional_response,
+    etag_matches,
+    make_etag,
+    not_modified,
+    resource_version,
+)
+from app.core.pagination import encode_cursor
 from app.models.user import User
 from app.models.company import Company
 from app.models.compliance import (
@@ -133,6 +146,7 @@ async def create_company_classification(
     db.add(audit)
     
     await db.commit()
+    await bump_version(company_resource(company_id))
     await db.refresh(db_classification)
     
     return db_classification
@@ -198,6 +212,7 @@ async def update_company_classification(
     db.add(audit)
     
     await db.commit()
+    await bump_version(company_resource(company_id))
     await db.refresh(db_classification)
     
     return db_classification
@@ -239,11 +254,29 @@ async def get_company_classification(
 @router.get("/companies/{company_id}/compliance-matrix", response_model=ComplianceMatrixResponse)
 async def get_company_compliance_matrix(
     company_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Obtener matriz de cumplimiento completa para una empresa"""
     
+    # ETag desde los contadores de requerimientos/reglas y de la empresa:
+    # si coincide basta con verificar el acceso, sin construir la matriz.
+    # Lee del primario: los contadores se incrementan tras su commit
+    version = await resource_version(COMPLIANCE_RESOURCE, company_resource(company_id))
+    etag = make_etag("compliance-matrix", company_id, version) if version else None
+    if etag and etag_matches(request, etag):
+        allowed = await db.execute(
+            select(Company.id).where(
+                and_(
+                    Company.id == company_id,
+                    Company.tenant_id == current_user.tenant_id
+                )
+            )
+        )
+        if allowed.scalar_one_or_none() is not None:
+            return not_modified(etag)
+    
     # Verificar empresa y obtener clasificación
     result = await db.execute(
         select(Company, CompanyClassification).join(
@@ -318,12 +351,12 @@ async def get_company_compliance_matrix(
     
     requerimientos = [await build_requirement_tree(req) for req in requirements]
     
-    return ComplianceMatrixResponse(
+    return conditional_response(request, ComplianceMatrixResponse(
         company_id=company.id,
         razon_social=company.razon_social,
         tipo_centro_carga=classification.tipo_centro_carga,
         requerimientos=requerimientos
-    )
+    ), etag)
 
 
 # === ADMIN ENDPOINTS ===
@@ -387,6 +420,8 @@ async def get_all_rules(
 @router.get("/audit-log", response_model=List[ComplianceAuditLogResponse])
 async def get_audit_log(
     company_id: int = None,
+    include_archive: bool = Query(False, description="Incluir entradas archivadas en MinIO"),
+    archive_limit: int = Query(500, ge=1, le=5000, description="Máximo de entradas archivadas"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -399,10 +434,19 @@ async def get_audit_log(
     if company_id:
         query = query.where(ComplianceAuditLog.company_id == company_id)
     
-    query = query.order_by(ComplianceAuditLog.created_at.desc())
+    query = query.order_by(ComplianceAuditLog.created_at.desc(), ComplianceAuditLog.id.desc())
     
     result = await db.execute(query)
-    logs = result.scalars().all()
+    logs = list(result.scalars().all())
+    
+    # Las entradas archivadas son siempre anteriores a las de la tabla viva
+    if include_archive:
+        archive = ArchiveQuery(tenant_id=current_user.tenant_id, company_id=company_id)
+        cursor = encode_cursor(logs[-1].created_at, logs[-1].id) if logs else None
+        archived = await run_in_threadpool(
+            scan_archive, "compliance_audit_logs", archive, cursor, archive_limit
+        )
+        logs.extend(ComplianceAuditLogResponse.model_validate(row) for row in archived)
     
     return logs
 
@@ -432,6 +476,7 @@ async def create_requirement(
     db_requirement = ComplianceRequirement(**requirement.model_dump())
     db.add(db_requirement)
     await db.commit()
+    await bump_version(COMPLIANCE_RESOURCE)
     await db.refresh(db_requirement)
     
     # Cargar children vacío
@@ -476,6 +521,7 @@ async def update_requirement(
         setattr(db_requirement, field, value)
     
     await db.commit()
+    await bump_version(COMPLIANCE_RESOURCE)
     await db.refresh(db_requirement)
     
     # Cargar children
@@ -523,6 +569,7 @@ async def delete_requirement(
     
     await db.delete(db_requirement)
     await db.commit()
+    await bump_version(COMPLIANCE_RESOURCE)
 
 
 # === ADMIN CRUD ENDPOINTS FOR RULES ===
@@ -565,6 +612,7 @@ async def create_rule(
     db_rule = ComplianceRule(**rule.model_dump())
     db.add(db_rule)
     await db.commit()
+    await bump_version(COMPLIANCE_RESOURCE)
     await db.refresh(db_rule)
     
     return db_rule
@@ -595,6 +643,7 @@ async def update_rule(
         setattr(db_rule, field, value)
     
     await db.commit()
+    await bump_version(COMPLIANCE_RESOURCE)
     await db.refresh(db_rule)
     
     return db_rule
@@ -620,3 +669,4 @@ async def delete_rule(
     
     await db.delete(db_rule)
     await db.commit()
+    await bump_version(COMPLIANCE_RESOURCE)
@@ -1,37 +1,8 @@
-"""API Dependencies"""
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+"""API Dependencies
 
-from app.core.security import decode_token
-from app.db.session import get_db
-from app.models.user import User
+Se mantiene por compatibilidad de imports (rbac): la autenticación vive en
+app.api.dependencies y reutiliza el principal de AuthenticationMiddleware.
+"""
+from app.api.dependencies import get_current_user, security
 
-security = HTTPBearer()
-
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db)
-) -> User:
-    """Get current authenticated user"""
-    token = credentials.credentials
-    payload = decode_token(token)
-    
-    if not payload or payload.get("type") != "access":
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials"
-        )
-    
-    user_id = payload.get("sub")
-    result = await db.execute(select(User).where(User.id == user_id, User.is_active == True))
-    user = result.scalar_one_or_none()
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found or inactive"
-        )
-    
-    return user
+__all__ = ["get_current_user", "security"]
@@ -0,0 +1,23 @@
+"""
+Jobs API - Estado de tareas en segundo plano (clonación, importaciones...)
+"""
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.api.dependencies import get_current_user
+from app.core.jobs import get_job_status
+from app.models.user import User
+from app.schemas.job import JobStatus
+
+router = APIRouter()
+
+
+@router.get("/{job_id}", response_model=JobStatus)
+async def read_job_status(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    """Consultar estado y progreso de un job del tenant"""
+    status = await get_job_status(job_id, current_user.tenant_id, current_user.is_superadmin)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return status
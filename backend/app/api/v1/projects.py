@@ -1,30 +1,52 @@
 """
 API endpoints for Projects (Proyectos)
 """
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status, UploadFile, File
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func, cast, String
+from sqlalchemy import select, insert, update, and_, func, cast, collate, literal, null, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY
 from typing import List, Optional
-import json
 from datetime import datetime
 
 from app.api.dependencies import get_current_user, get_db
+from app.db.project_tasks import clone_project, count_project_tasks, insert_custom_tasks, insert_obligation_tasks
+from app.db.session import ReadOnlySessionLocal, get_read_db
 from app.models.user import User
 from app.models.company import Company
 from app.models.compliance import CompanyClassification, ComplianceRequirement, ComplianceRule
 from app.models.project import (
     Project, ProjectTask, TaskEvidence, TaskComment, TaskActivityLog,
-    ProjectStatus, TaskStatus, TaskType
+    ProjectStatus, TaskStatus
 )
 from app.schemas.project import (
     ProjectCreate, ProjectUpdate, ProjectResponse, ProjectListItem, ProjectDetail,
+    ProjectCloneRequest,
     TaskCreate, TaskUpdate, TaskResponse, TaskSummary,
+    TaskBulkUpdate, TaskReorder, TaskReorderResult,
     EvidenceCreate, EvidenceResponse,
-    CommentCreate, CommentResponse,
-    ActivityLogResponse,
+    CommentCreate, CommentResponse, CommentPage,
+    ActivityLogResponse, ActivityLogPage,
+    ActivityFeedItem, ActivityFeedPage,
     ProjectMetrics, TaskMetrics
 )
+from app.core.activity_stream import (
+    REPLAY_LIMIT,
+    activity_broker,
+    activity_event,
+    publish_activity,
+    stream_project_activity,
+)
+from app.core.authentication import get_request_principal
+from app.core.config import settings
+from app.core.etag import conditional_response
+from app.core.exports import export_response
+from app.core.jobs import register_job
+from app.core.pagination import keyset_before, next_cursor_from
+from app.core.responses import FastJSONResponse
 from app.core.minio_client import minio_client
+from app.schemas.job import JobAccepted
+from app.workers.tasks import clone_project_job
 
 router = APIRouter()
 
@@ -83,78 +105,26 @@ async def create_project(
     db.add(db_project)
     await db.flush()  # Para obtener el ID
     
-    # Obtener obligaciones aplicables según clasificación
-    tipo_carga_str = classification.tipo_centro_carga.value if hasattr(classification.tipo_centro_carga, 'value') else str(classification.tipo_centro_carga)
+    # Tareas de obligaciones aplicables: un INSERT ... SELECT desde el catálogo
+    task_count = 0
+    if project_data.include_all_obligations or project_data.selected_requirement_ids:
+        task_count = await insert_obligation_tasks(
+            db,
+            project_id=db_project.id,
+            tipo_centro_carga=classification.tipo_centro_carga,
+            created_by=current_user.id,
+            requirement_ids=None if project_data.include_all_obligations else project_data.selected_requirement_ids,
+        )
     
-    result = await db.execute(
-        select(ComplianceRule, ComplianceRequirement).join(
-            ComplianceRequirement,
-            ComplianceRule.requirement_id == ComplianceRequirement.id
-        ).where(
-            and_(
-                cast(ComplianceRule.tipo_centro_carga, String) == tipo_carga_str,
-                ComplianceRule.estado_aplicabilidad != 'NO_APLICA',
-                ComplianceRequirement.is_active == True
-            )
-        ).order_by(ComplianceRequirement.orden)
-    )
-    applicable_rules = result.all()
-    
-    # Crear tareas según selección
-    tasks_to_create = []
-    sort_order = 0
-    
-    if project_data.include_all_obligations:
-        # Incluir todas las obligaciones aplicables
-        for rule, requirement in applicable_rules:
-            tasks_to_create.append(ProjectTask(
-                project_id=db_project.id,
-                task_type=TaskType.OBLIGATION,
-                requirement_id=requirement.id,
-                code=requirement.codigo,
-                title=requirement.nombre,
-                description=requirement.descripcion,
-                notes=rule.notas,
-                sort_order=sort_order,
-                created_by=current_user.id
-            ))
-            sort_order += 1
-    else:
-        # Incluir solo obligaciones seleccionadas
-        if project_data.selected_requirement_ids:
-            applicable_ids = {req.id for _, req in applicable_rules}
-            for rule, requirement in applicable_rules:
-                if requirement.id in project_data.selected_requirement_ids:
-                    tasks_to_create.append(ProjectTask(
-                        project_id=db_project.id,
-                        task_type=TaskType.OBLIGATION,
-                        requirement_id=requirement.id,
-                        code=requirement.codigo,
-                        title=requirement.nombre,
-                        description=requirement.descripcion,
-                        notes=rule.notas,
-                        sort_order=sort_order,
-                        created_by=current_user.id
-                    ))
-                    sort_order += 1
-    
-    # Agregar tareas custom
+    # Agregar tareas custom (un INSERT en lote)
     if project_data.custom_tasks:
-        for custom_task in project_data.custom_tasks:
-            tasks_to_create.append(ProjectTask(
-                project_id=db_project.id,
-                task_type=TaskType.CUSTOM,
-                code=custom_task.code,
-                title=custom_task.title,
-                description=custom_task.description,
-                sort_order=sort_order,
-                created_by=current_user.id
-            ))
-            sort_order += 1
-    
-    # Guardar tareas
-    for task in tasks_to_create:
-        db.add(task)
+        await insert_custom_tasks(
+            db,
+            project_id=db_project.id,
+            custom_tasks=project_data.custom_tasks,
+            created_by=current_user.id,
+            start_sort_order=task_count,
+        )
     
     await db.commit()
     await db.refresh(db_project)
@@ -168,7 +138,7 @@ async def list_projects(
     status: Optional[str] = None,
     project_type: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Listar proyectos del tenant con filtros opcionales"""
     
@@ -245,6 +215,175 @@ async def list_projects(
     return response
 
 
+PROJECT_EXPORT_COLUMNS = [
+    "id", "nombre", "empresa", "rfc", "tipo", "estado", "prioridad",
+    "fecha_inicio", "fecha_compromiso", "completado_en", "cerrado_en",
+    "tareas", "tareas_completadas", "tareas_en_progreso", "evidencias", "avance_porcentaje",
+]
+
+
+@router.get("/export")
+async def export_projects(
+    fmt: str = Query("csv", alias="format", pattern="^(csv|xlsx)$"),
+    company_id: Optional[int] = None,
+    status: Optional[str] = None,
+    project_type: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Exportar proyectos del tenant (CSV o XLSX) con su avance, en streaming
+
+    Las métricas salen de agregados por proyecto unidos a la consulta
+    principal (sin consultas por proyecto como en el listado).
+    """
+    task_metrics = (
+        select(
+            ProjectTask.project_id,
+            func.count(ProjectTask.id).label("total"),
+            func.count().filter(ProjectTask.status == TaskStatus.COMPLETADO).label("completed"),
+            func.count().filter(ProjectTask.status == TaskStatus.EN_PROGRESO).label("in_progress"),
+        )
+        .join(Project, ProjectTask.project_id == Project.id)
+        .where(Project.tenant_id == current_user.tenant_id)
+        .group_by(ProjectTask.project_id)
+        .subquery()
+    )
+    evidence_counts = (
+        select(ProjectTask.project_id, func.count(TaskEvidence.id).label("evidences"))
+        .join(TaskEvidence, TaskEvidence.task_id == ProjectTask.id)
+        .join(Project, ProjectTask.project_id == Project.id)
+        .where(Project.tenant_id == current_user.tenant_id)
+        .group_by(ProjectTask.project_id)
+        .subquery()
+    )
+
+    query = (
+        select(
+            Project.id, Project.name, Company.razon_social, Company.rfc,
+            Project.project_type, Project.status, Project.priority,
+            Project.start_date, Project.due_date, Project.completed_at, Project.closed_at,
+            func.coalesce(task_metrics.c.total, 0),
+            func.coalesce(task_metrics.c.completed, 0),
+            func.coalesce(task_metrics.c.in_progress, 0),
+            func.coalesce(evidence_counts.c.evidences, 0),
+            func.round(100.0 * task_metrics.c.completed / func.nullif(task_metrics.c.total, 0), 2),
+        )
+        .join(Company, Project.company_id == Company.id)
+        .outerjoin(task_metrics, task_metrics.c.project_id == Project.id)
+        .outerjoin(evidence_counts, evidence_counts.c.project_id == Project.id)
+        .where(Project.tenant_id == current_user.tenant_id)
+        .order_by(Project.created_at.desc(), Project.id.desc())
+    )
+    if company_id:
+        query = query.where(Project.company_id == company_id)
+    if status:
+        query = query.where(cast(Project.status, String) == status)
+    if project_type:
+        query = query.where(cast(Project.project_type, String) == project_type)
+
+    return export_response(query, PROJECT_EXPORT_COLUMNS, tuple, fmt, "proyectos")
+
+
+# =======================
+# ACTIVITY FEED
+# =======================
+
+async def _fetch_activity_feed(
+    db: AsyncSession,
+    scope,
+    cursor: Optional[str],
+    page_size: int,
+    event_type: Optional[List[str]],
+    user_id: Optional[int],
+) -> ActivityFeedPage:
+    """
+    Página del feed de actividad para un proyecto o un tenant
+
+    Una sola consulta keyset sobre los project_id/tenant_id desnormalizados en
+    task_activity_logs (índices (scope, created_at, id)); la tarea y el
+    usuario se resuelven por PK sólo para las filas de la página.
+    """
+    query = (
+        select(TaskActivityLog, ProjectTask.code, ProjectTask.title, User.full_name)
+        .join(ProjectTask, ProjectTask.id == TaskActivityLog.task_id)
+        .outerjoin(User, User.id == TaskActivityLog.created_by)
+        .where(scope)
+        .order_by(TaskActivityLog.created_at.desc(), TaskActivityLog.id.desc())
+        .limit(page_size + 1)
+    )
+    if event_type:
+        query = query.where(TaskActivityLog.event_type.in_(event_type))
+    if user_id is not None:
+        query = query.where(TaskActivityLog.created_by == user_id)
+    if cursor:
+        query = query.where(keyset_before(TaskActivityLog.created_at, TaskActivityLog.id, cursor))
+
+    rows = (await db.execute(query)).all()
+    next_cursor = next_cursor_from([row.TaskActivityLog for row in rows], page_size)
+
+    items = []
+    for log, task_code, task_title, user_name in rows[:page_size]:
+        items.append(ActivityFeedItem(
+            id=log.id,
+            task_id=log.task_id,
+            project_id=log.project_id,
+            task_code=task_code,
+            task_title=task_title,
+            user_id=log.created_by,
+            user_name=user_name,
+            action=log.event_type,
+            details=log.payload_json,
+            created_at=log.created_at,
+        ))
+    return ActivityFeedPage(items=items, next_cursor=next_cursor)
+
+
+@router.get("/activity", response_model=ActivityFeedPage)
+async def get_tenant_activity(
+    cursor: Optional[str] = Query(None, description="next_cursor de la página anterior"),
+    page_size: int = Query(50, ge=1, le=200),
+    event_type: Optional[List[str]] = Query(None, description="Filtrar por tipo(s) de evento"),
+    user_id: Optional[int] = Query(None, description="Filtrar por usuario que generó el evento"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Actividad reciente de todos los proyectos del tenant"""
+    page = await _fetch_activity_feed(
+        db, TaskActivityLog.tenant_id == current_user.tenant_id,
+        cursor, page_size, event_type, user_id,
+    )
+    return FastJSONResponse(page)
+
+
+@router.get("/{project_id}/activity", response_model=ActivityFeedPage)
+async def get_project_activity(
+    project_id: int,
+    cursor: Optional[str] = Query(None, description="next_cursor de la página anterior"),
+    page_size: int = Query(50, ge=1, le=200),
+    event_type: Optional[List[str]] = Query(None, description="Filtrar por tipo(s) de evento"),
+    user_id: Optional[int] = Query(None, description="Filtrar por usuario que generó el evento"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Actividad reciente de todas las tareas de un proyecto"""
+    result = await db.execute(
+        select(Project.id).where(
+            and_(
+                Project.id == project_id,
+                Project.tenant_id == current_user.tenant_id
+            )
+        )
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    page = await _fetch_activity_feed(
+        db, TaskActivityLog.project_id == project_id,
+        cursor, page_size, event_type, user_id,
+    )
+    return FastJSONResponse(page)
+
+
 @router.get("/{project_id}/available-obligations")
 async def get_available_obligations(
     project_id: int,
@@ -255,72 +394,71 @@ async def get_available_obligations(
     Listar obligaciones disponibles para agregar a un proyecto.
     Retorna las que aplican a la empresa del proyecto, excluyendo las ya agregadas.
     """
-    # Obtener proyecto y su empresa
+    # Proyecto y clasificación de su empresa en una consulta
     result = await db.execute(
-        select(Project).where(
+        select(Project.id, CompanyClassification.tipo_centro_carga).outerjoin(
+            CompanyClassification, CompanyClassification.company_id == Project.company_id
+        ).where(
             and_(Project.id == project_id, Project.tenant_id == current_user.tenant_id)
         )
     )
-    project = result.scalars().first()
-    if not project:
+    row = result.first()
+    if not row:
         raise HTTPException(status_code=404, detail="Project not found")
+    tipo_centro_carga = row.tipo_centro_carga
 
-    # Obtener clasificación de la empresa
-    classif_result = await db.execute(
-        select(CompanyClassification).where(CompanyClassification.company_id == project.company_id)
-    )
-    classification = classif_result.scalars().first()
-
-    # Obtener IDs de obligaciones ya en el proyecto
-    existing_result = await db.execute(
-        select(ProjectTask.requirement_id).where(
-            and_(
-                ProjectTask.project_id == project_id,
-                ProjectTask.requirement_id.isnot(None)
-            )
+    # Anti-join: requerimientos que aún no son tarea del proyecto
+    already_added = select(ProjectTask.id).where(
+        and_(
+            ProjectTask.project_id == project_id,
+            ProjectTask.requirement_id == ComplianceRequirement.id
         )
-    )
-    existing_ids = {row[0] for row in existing_result.all()}
-
-    # Buscar obligaciones aplicables (join correcto: ComplianceRule referencia a ComplianceRequirement)
-    req_query = (
-        select(ComplianceRequirement, ComplianceRule)
-        .join(ComplianceRule, ComplianceRule.requirement_id == ComplianceRequirement.id)
-        .where(ComplianceRequirement.is_active == True)
-    )
+    ).exists()
 
-    if classification:
-        req_query = req_query.where(
+    if tipo_centro_carga is not None:
+        req_query = select(
+            ComplianceRequirement, ComplianceRule.estado_aplicabilidad, ComplianceRule.notas
+        ).join(
+            ComplianceRule,
             and_(
-                ComplianceRule.tipo_centro_carga == classification.tipo_centro_carga,
+                ComplianceRule.requirement_id == ComplianceRequirement.id,
+                ComplianceRule.tipo_centro_carga == tipo_centro_carga,
                 ComplianceRule.estado_aplicabilidad != "NO_APLICA"
             )
         )
+    else:
+        # Sin clasificación no hay regla aplicable: un renglón por requerimiento
+        req_query = select(ComplianceRequirement, null(), null())
 
-    req_result = await db.execute(req_query)
-    rows = req_result.all()
-
-    obligations = []
-    for req, rule in rows:
-        if req.id not in existing_ids:
-            obligations.append({
-                "id": req.id,
-                "codigo": req.codigo,
-                "nombre": req.nombre,
-                "descripcion": req.descripcion or "",
-                "estado_aplicabilidad": rule.estado_aplicabilidad,
-                "notas": rule.notas or "",
-            })
+    req_result = await db.execute(
+        req_query.where(
+            and_(ComplianceRequirement.is_active == True, ~already_added)
+        ).order_by(
+            # Orden natural por código ("2.10" después de "2.9"), byte a byte
+            collate(ComplianceRequirement.codigo_sort_key, "C"),
+            ComplianceRequirement.id
+        )
+    )
 
-    # Ordenar por código
-    obligations.sort(key=lambda x: x["codigo"])
+    obligations = [
+        {
+            "id": req.id,
+            "codigo": req.codigo,
+            "nombre": req.nombre,
+            "descripcion": req.descripcion or "",
+            "estado_aplicabilidad": estado_aplicabilidad,
+            "notas": notas or "",
+        }
+        for req, estado_aplicabilidad, notas in req_result.all()
+    ]
 
-    return {"obligations": obligations, "total": len(obligations), "classified": classification is not None}
+    return {"obligations": obligations, "total": len(obligations), "classified": tipo_centro_carga is not None}
 
 
 @router.get("/{project_id}", response_model=ProjectDetail)
 async def get_project(
     project_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -408,7 +546,8 @@ async def get_project(
             evidence_count=task_evidence_count
         ))
     
-    return ProjectDetail(
+    # ETag por hash del cuerpo: ahorra la transferencia en los polls del dashboard
+    return conditional_response(request, ProjectDetail(
         id=project.id,
         tenant_id=project.tenant_id,
         company_id=project.company_id,
@@ -428,6 +567,74 @@ async def get_project(
         total_tasks=metrics.total_tasks,
         completed_tasks=metrics.completed_tasks,
         progress_percentage=int(metrics.completion_percentage)
+    ))
+
+
+@router.get("/{project_id}/events")
+async def stream_project_events(
+    project_id: int,
+    request: Request,
+    last_event_id: Optional[int] = Header(None),
+):
+    """
+    Actividad del proyecto en vivo (Server-Sent Events)
+    
+    Emite un evento `activity` por cada TaskActivityLog (comentarios,
+    cambios de estado, evidencias...). Con Last-Event-ID se reenvían los
+    eventos perdidos durante la desconexión.
+    
+    No usa get_db: la sesión se cierra tras verificar el acceso para no
+    retener una conexión del pool mientras el stream sigue abierto.
+    """
+    principal = get_request_principal(request)
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="No se pudo validar las credenciales",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    # Suscribirse antes de leer el backlog: lo publicado entretanto no se pierde
+    subscription = activity_broker.subscribe(project_id)
+    try:
+        async with ReadOnlySessionLocal() as db:
+            allowed = await db.execute(
+                select(Project.id).join(
+                    User, and_(User.id == principal.user_id, User.is_active == True)
+                ).where(
+                    and_(
+                        Project.id == project_id,
+                        Project.tenant_id == principal.tenant_id
+                    )
+                )
+            )
+            if allowed.scalar_one_or_none() is None:
+                raise HTTPException(status_code=404, detail="Project not found")
+            
+            backlog = []
+            if last_event_id is not None:
+                result = await db.execute(
+                    select(TaskActivityLog).where(
+                        and_(
+                            TaskActivityLog.project_id == project_id,
+                            TaskActivityLog.id > last_event_id
+                        )
+                    ).order_by(TaskActivityLog.id).limit(REPLAY_LIMIT + 1)
+                )
+                backlog = [activity_event(project_id, log) for log in result.scalars()]
+    except BaseException:
+        activity_broker.unsubscribe(project_id, subscription)
+        raise
+    
+    return StreamingResponse(
+        stream_project_activity(
+            project_id,
+            subscription,
+            backlog[:REPLAY_LIMIT],
+            backlog_truncated=len(backlog) > REPLAY_LIMIT,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -495,6 +702,67 @@ async def close_project(
     return project
 
 
+@router.post(
+    "/{project_id}/clone",
+    response_model=ProjectResponse,
+    status_code=201,
+    responses={202: {"model": JobAccepted}},
+)
+async def clone_project_endpoint(
+    project_id: int,
+    clone_data: ProjectCloneRequest,
+    background: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Clonar un proyecto (plantilla) con sus tareas, notas, asignados y,
+    opcionalmente, referencias a sus evidencias.
+    
+    Proyectos con más de PROJECT_CLONE_SYNC_MAX_TASKS tareas (o con
+    background=true) se clonan en Celery: responde 202 con el job a
+    consultar en /jobs/{job_id}.
+    """
+    result = await db.execute(
+        select(Project).where(
+            and_(
+                Project.id == project_id,
+                Project.tenant_id == current_user.tenant_id
+            )
+        )
+    )
+    source = result.scalars().first()
+    if not source:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    if clone_data.company_id and clone_data.company_id != source.company_id:
+        result = await db.execute(
+            select(Company.id).where(
+                and_(
+                    Company.id == clone_data.company_id,
+                    Company.tenant_id == current_user.tenant_id
+                )
+            )
+        )
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(status_code=404, detail="Company not found")
+    
+    task_count = await count_project_tasks(db, project_id)
+    if background or task_count > settings.PROJECT_CLONE_SYNC_MAX_TASKS:
+        job = clone_project_job.delay(project_id, current_user.id, clone_data.model_dump(mode="json"))
+        await register_job(job.id, "project_clone", current_user.tenant_id, current_user.id)
+        return FastJSONResponse(
+            JobAccepted(job_id=job.id, kind="project_clone", status_url=f"{settings.API_V1_PREFIX}/jobs/{job.id}"),
+            status_code=202,
+        )
+    
+    project, _ = await clone_project(db, source, clone_data, current_user.id)
+    await db.commit()
+    await db.refresh(project)
+    
+    return project
+
+
 # =======================
 # TASK ENDPOINTS
 # =======================
@@ -546,13 +814,16 @@ async def create_task(
     # Log de actividad
     activity_log = TaskActivityLog(
         task_id=db_task.id,
+        project_id=project_id,
+        tenant_id=current_user.tenant_id,
         event_type="TASK_CREATED",
-        payload_json=json.dumps({"title": task_data.title}),
+        payload_json={"title": task_data.title},
         created_by=current_user.id
     )
     db.add(activity_log)
     
     await db.commit()
+    await publish_activity(project_id, [activity_log])
     await db.refresh(db_task)
     
     return db_task
@@ -615,38 +886,211 @@ async def update_task(
         setattr(task, field, value)
     
     task.updated_by = current_user.id
+    activity_logs = []
     
     # Log si cambió el status
     if 'status' in update_data and update_data['status'] != old_status:
         activity_log = TaskActivityLog(
             task_id=task.id,
+            project_id=task.project_id,
+            tenant_id=current_user.tenant_id,
             event_type="STATUS_CHANGED",
-            payload_json=json.dumps({
+            payload_json={
                 "old_status": str(old_status),
                 "new_status": str(task.status)
-            }),
+            },
             created_by=current_user.id
         )
-        db.add(activity_log)
+        activity_logs.append(activity_log)
 
     # Log si se asignó
     if 'assignee_user_id' in update_data:
         activity_log = TaskActivityLog(
             task_id=task.id,
+            project_id=task.project_id,
+            tenant_id=current_user.tenant_id,
             event_type="ASSIGNED",
-            payload_json=json.dumps({
+            payload_json={
                 "assignee_user_id": task.assignee_user_id
-            }),
+            },
             created_by=current_user.id
         )
-        db.add(activity_log)
+        activity_logs.append(activity_log)
     
+    db.add_all(activity_logs)
     await db.commit()
+    await publish_activity(task.project_id, activity_logs)
     await db.refresh(task)
     
     return task
 
 
+@router.patch("/{project_id}/tasks/bulk", response_model=List[TaskResponse])
+async def bulk_update_tasks(
+    project_id: int,
+    bulk_data: TaskBulkUpdate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Aplicar status / asignado / fecha límite a varias tareas en una transacción
+    
+    Un SELECT ... FOR UPDATE de los valores previos, un UPDATE para todas las
+    tareas y un INSERT en lote de la actividad, sin importar cuántas sean.
+    """
+    changes = bulk_data.model_dump(exclude_unset=True, exclude={"task_ids"})
+    if not changes:
+        raise HTTPException(status_code=400, detail="No hay cambios que aplicar")
+    
+    # Verificar proyecto
+    result = await db.execute(
+        select(Project.id).where(
+            and_(
+                Project.id == project_id,
+                Project.tenant_id == current_user.tenant_id
+            )
+        )
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    if changes.get("assignee_user_id") is not None:
+        result = await db.execute(
+            select(User.id).where(
+                and_(
+                    User.id == changes["assignee_user_id"],
+                    User.tenant_id == current_user.tenant_id
+                )
+            )
+        )
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(status_code=400, detail="Assignee not found")
+    
+    # Valores previos (para la actividad), bloqueando las filas
+    result = await db.execute(
+        select(ProjectTask.id, ProjectTask.status, ProjectTask.assignee_user_id).where(
+            and_(
+                ProjectTask.id.in_(bulk_data.task_ids),
+                ProjectTask.project_id == project_id
+            )
+        ).with_for_update()
+    )
+    previous = {row.id: row for row in result}
+    missing = [task_id for task_id in bulk_data.task_ids if task_id not in previous]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Tasks not found: {missing}")
+    
+    result = await db.execute(
+        update(ProjectTask).where(
+            and_(
+                ProjectTask.id.in_(bulk_data.task_ids),
+                ProjectTask.project_id == project_id
+            )
+        ).values(
+            **changes,
+            updated_by=current_user.id
+        ).returning(ProjectTask).execution_options(synchronize_session=False)
+    )
+    tasks = result.scalars().all()
+    
+    # Actividad en un solo INSERT
+    activity_rows = []
+    for task_id, before in previous.items():
+        if "status" in changes and changes["status"] != before.status:
+            activity_rows.append({
+                "task_id": task_id,
+                "project_id": project_id,
+                "tenant_id": current_user.tenant_id,
+                "event_type": "STATUS_CHANGED",
+                "payload_json": {
+                    "old_status": str(before.status),
+                    "new_status": str(changes["status"])
+                },
+                "created_by": current_user.id,
+            })
+        if "assignee_user_id" in changes and changes["assignee_user_id"] != before.assignee_user_id:
+            activity_rows.append({
+                "task_id": task_id,
+                "project_id": project_id,
+                "tenant_id": current_user.tenant_id,
+                "event_type": "ASSIGNED",
+                "payload_json": {"assignee_user_id": changes["assignee_user_id"]},
+                "created_by": current_user.id,
+            })
+    activity_logs = []
+    if activity_rows:
+        result = await db.execute(insert(TaskActivityLog).returning(TaskActivityLog), activity_rows)
+        activity_logs = result.scalars().all()
+    
+    await db.commit()
+    await publish_activity(project_id, activity_logs)
+    
+    tasks.sort(key=lambda task: task.sort_order)
+    return tasks
+
+
+@router.put("/{project_id}/tasks/order", response_model=TaskReorderResult)
+async def reorder_tasks(
+    project_id: int,
+    order_data: TaskReorder,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Reordenar tareas con un único UPDATE
+    
+    Las tareas recibidas toman sort_order 1..n en ese orden; el resto del
+    proyecto queda a continuación conservando su orden relativo. Sólo se
+    escriben las filas cuyo sort_order cambia.
+    """
+    result = await db.execute(
+        select(Project.id).where(
+            and_(
+                Project.id == project_id,
+                Project.tenant_id == current_user.tenant_id
+            )
+        )
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    result = await db.execute(
+        select(ProjectTask.id).where(
+            and_(
+                ProjectTask.id.in_(order_data.task_ids),
+                ProjectTask.project_id == project_id
+            )
+        )
+    )
+    found = set(result.scalars().all())
+    missing = [task_id for task_id in order_data.task_ids if task_id not in found]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Tasks not found: {missing}")
+    
+    position = func.array_position(literal(order_data.task_ids, ARRAY(Integer)), ProjectTask.id)
+    new_order = select(
+        ProjectTask.id.label("id"),
+        func.row_number().over(
+            order_by=(position.asc().nulls_last(), ProjectTask.sort_order, ProjectTask.id)
+        ).label("sort_order"),
+    ).where(ProjectTask.project_id == project_id).subquery()
+    
+    result = await db.execute(
+        update(ProjectTask).where(
+            and_(
+                ProjectTask.id == new_order.c.id,
+                ProjectTask.sort_order != new_order.c.sort_order
+            )
+        ).values(
+            sort_order=new_order.c.sort_order,
+            updated_by=current_user.id
+        ).execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    
+    return TaskReorderResult(updated=result.rowcount)
+
+
 # =======================
 # EVIDENCE ENDPOINTS
 # =======================
@@ -723,16 +1167,19 @@ async def upload_evidence(
     # Log de actividad
     activity_log = TaskActivityLog(
         task_id=task_id,
+        project_id=task.project_id,
+        tenant_id=current_user.tenant_id,
         event_type="EVIDENCE_ADDED",
-        payload_json=json.dumps({
+        payload_json={
             "filename": file.filename,
             "evidence_type": evidence_type
-        }),
+        },
         created_by=current_user.id
     )
     db.add(activity_log)
     
     await db.commit()
+    await publish_activity(task.project_id, [activity_log])
     await db.refresh(db_evidence)
     
     # Obtener nombre del uploader
@@ -824,7 +1271,7 @@ async def delete_evidence(
     
     # Obtener evidencia
     result = await db.execute(
-        select(TaskEvidence).join(
+        select(TaskEvidence, ProjectTask.project_id).join(
             ProjectTask, TaskEvidence.task_id == ProjectTask.id
         ).join(
             Project, ProjectTask.project_id == Project.id
@@ -835,26 +1282,31 @@ async def delete_evidence(
             )
         )
     )
-    evidence = result.scalars().first()
-    if not evidence:
+    row = result.first()
+    if not row:
         raise HTTPException(status_code=404, detail="Evidence not found")
+    evidence, project_id = row
     
-    # Eliminar de storage
-    try:
-        await minio_client.delete_file(
-            bucket="evidences",
-            key=evidence.storage_key
+    # Proyectos clonados comparten el objeto de storage: sólo se borra el último
+    shared_result = await db.execute(
+        select(func.count(TaskEvidence.id)).where(
+            and_(
+                TaskEvidence.storage_key == evidence.storage_key,
+                TaskEvidence.id != evidence.id
+            )
         )
-    except:
-        pass  # Si falla, continuar
+    )
+    storage_shared = shared_result.scalar() > 0
     
     # Log de actividad
     activity_log = TaskActivityLog(
         task_id=evidence.task_id,
+        project_id=project_id,
+        tenant_id=current_user.tenant_id,
         event_type="EVIDENCE_DELETED",
-        payload_json=json.dumps({
+        payload_json={
             "filename": evidence.filename
-        }),
+        },
         created_by=current_user.id
     )
     db.add(activity_log)
@@ -862,6 +1314,14 @@ async def delete_evidence(
     # Eliminar registro
     await db.delete(evidence)
     await db.commit()
+    await publish_activity(project_id, [activity_log])
+    
+    # Eliminar de storage (después del commit)
+    if not storage_shared:
+        try:
+            minio_client.delete_file("evidencias", evidence.storage_key)
+        except Exception:
+            pass  # Si falla, continuar
     
     return None
 
@@ -870,6 +1330,45 @@ async def delete_evidence(
 # COMMENT & ACTIVITY ENDPOINTS
 # =======================
 
+async def _verify_task_access(db: AsyncSession, task_id: int, tenant_id: Optional[int]) -> None:
+    """404 si la tarea no existe o no es del tenant"""
+    result = await db.execute(
+        select(ProjectTask.id).join(
+            Project, ProjectTask.project_id == Project.id
+        ).where(
+            and_(
+                ProjectTask.id == task_id,
+                Project.tenant_id == tenant_id
+            )
+        )
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+
+def _comment_response(comment: TaskComment, user_name: Optional[str]) -> CommentResponse:
+    return CommentResponse(
+        id=comment.id,
+        task_id=comment.task_id,
+        user_id=comment.created_by,
+        user_name=user_name,
+        comment=comment.comment,
+        created_at=comment.created_at,
+    )
+
+
+def _activity_response(log: TaskActivityLog, user_name: Optional[str]) -> ActivityLogResponse:
+    return ActivityLogResponse(
+        id=log.id,
+        task_id=log.task_id,
+        user_id=log.created_by,
+        user_name=user_name,
+        action=log.event_type,
+        details=log.payload_json,
+        created_at=log.created_at,
+    )
+
+
 @router.post("/tasks/{task_id}/comments", response_model=CommentResponse, status_code=201)
 async def add_comment(
     task_id: int,
@@ -905,77 +1404,79 @@ async def add_comment(
     # Log de actividad
     activity_log = TaskActivityLog(
         task_id=task_id,
+        project_id=task.project_id,
+        tenant_id=current_user.tenant_id,
         event_type="COMMENT_ADDED",
-        payload_json=json.dumps({"comment_preview": comment_data.comment[:100]}),
+        payload_json={"comment_preview": comment_data.comment[:100]},
         created_by=current_user.id
     )
     db.add(activity_log)
     
     await db.commit()
+    await publish_activity(task.project_id, [activity_log])
     await db.refresh(db_comment)
     
-    return db_comment
+    return _comment_response(db_comment, current_user.full_name)
 
 
-@router.get("/tasks/{task_id}/comments", response_model=List[CommentResponse])
+@router.get("/tasks/{task_id}/comments", response_model=CommentPage)
 async def list_comments(
     task_id: int,
+    cursor: Optional[str] = Query(None, description="next_cursor de la página anterior"),
+    page_size: int = Query(50, ge=1, le=200),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Listar comentarios de una tarea"""
-    
-    # Verificar tarea
-    result = await db.execute(
-        select(ProjectTask).join(
-            Project, ProjectTask.project_id == Project.id
-        ).where(
-            and_(
-                ProjectTask.id == task_id,
-                Project.tenant_id == current_user.tenant_id
-            )
-        )
-    )
-    task = result.scalars().first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    
-    # Obtener comentarios
-    result = await db.execute(
-        select(TaskComment).where(
-            TaskComment.task_id == task_id
-        ).order_by(TaskComment.created_at.desc())
+    """Listar comentarios de una tarea (más recientes primero, paginado por cursor)"""
+    await _verify_task_access(db, task_id, current_user.tenant_id)
+
+    # Keyset sobre ix_task_comments_task_created_at
+    query = (
+        select(TaskComment, User.full_name)
+        .outerjoin(User, User.id == TaskComment.created_by)
+        .where(TaskComment.task_id == task_id)
+        .order_by(TaskComment.created_at.desc(), TaskComment.id.desc())
+        .limit(page_size + 1)
     )
-    return result.scalars().all()
+    if cursor:
+        query = query.where(keyset_before(TaskComment.created_at, TaskComment.id, cursor))
 
+    rows = (await db.execute(query)).all()
+    next_cursor = next_cursor_from([row.TaskComment for row in rows], page_size)
+    return FastJSONResponse(CommentPage(
+        items=[_comment_response(row.TaskComment, row.full_name) for row in rows[:page_size]],
+        next_cursor=next_cursor,
+    ))
 
-@router.get("/tasks/{task_id}/activity", response_model=List[ActivityLogResponse])
+
+@router.get("/tasks/{task_id}/activity", response_model=ActivityLogPage)
 async def get_task_activity(
     task_id: int,
+    cursor: Optional[str] = Query(None, description="next_cursor de la página anterior"),
+    page_size: int = Query(50, ge=1, le=200),
+    event_type: Optional[List[str]] = Query(None, description="Filtrar por tipo(s) de evento"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Obtener timeline de actividad de una tarea"""
-    
-    # Verificar tarea
-    result = await db.execute(
-        select(ProjectTask).join(
-            Project, ProjectTask.project_id == Project.id
-        ).where(
-            and_(
-                ProjectTask.id == task_id,
-                Project.tenant_id == current_user.tenant_id
-            )
-        )
-    )
-    task = result.scalars().first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    
-    # Obtener actividad
-    result = await db.execute(
-        select(TaskActivityLog).where(
-            TaskActivityLog.task_id == task_id
-        ).order_by(TaskActivityLog.created_at.desc())
+    """Obtener timeline de actividad de una tarea (más reciente primero, paginado por cursor)"""
+    await _verify_task_access(db, task_id, current_user.tenant_id)
+
+    # Keyset sobre ix_task_activity_logs_task_created_at
+    query = (
+        select(TaskActivityLog, User.full_name)
+        .outerjoin(User, User.id == TaskActivityLog.created_by)
+        .where(TaskActivityLog.task_id == task_id)
+        .order_by(TaskActivityLog.created_at.desc(), TaskActivityLog.id.desc())
+        .limit(page_size + 1)
     )
-    return result.scalars().all()
+    if event_type:
+        query = query.where(TaskActivityLog.event_type.in_(event_type))
+    if cursor:
+        query = query.where(keyset_before(TaskActivityLog.created_at, TaskActivityLog.id, cursor))
+
+    rows = (await db.execute(query)).all()
+    next_cursor = next_cursor_from([row.TaskActivityLog for row in rows], page_size)
+    return FastJSONResponse(ActivityLogPage(
+        items=[_activity_response(row.TaskActivityLog, row.full_name) for row in rows[:page_size]],
+        next_cursor=next_cursor,
+    ))
@@ -1,7 +1,7 @@
 """
 Quotes API - Cotizaciones para Tenants
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, or_, delete
 from sqlalchemy.orm import selectinload
@@ -9,8 +9,18 @@ from typing import Optional
 from decimal import Decimal
 
 from app.api.dependencies import get_current_user, get_db
+from app.core.etag import (
+    CATALOG_RESOURCE,
+    conditional_response,
+    etag_matches,
+    make_etag,
+    not_modified,
+    resource_version,
+)
+from app.core.responses import FastJSONResponse
+from app.db.session import get_read_db
 from app.models.user import User
-from app.models.tenant import Tenant
+from app.core.tenant_cache import tenant_cache
 from app.models.quote import Quote, QuoteLine
 from app.models.company import Company
 from app.models.compliance import CompanyClassification
@@ -54,10 +64,7 @@ async def get_quote_branding(
     if not current_user.tenant_id:
         return None
 
-    result = await db.execute(
-        select(Tenant).where(Tenant.id == current_user.tenant_id)
-    )
-    tenant = result.scalar_one_or_none()
+    tenant = await tenant_cache.get(current_user.tenant_id, db)
 
     if not tenant or not tenant.superadmin_id:
         return None
@@ -166,7 +173,7 @@ async def list_quotes(
     status: Optional[str] = None,
     company_id: Optional[int] = None,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Listar cotizaciones del tenant"""
     
@@ -219,16 +226,17 @@ async def list_quotes(
         quote_resp.razon_social = quote.company.razon_social
         quotes_response.append(quote_resp)
     
-    return QuoteListResponse(
+    return FastJSONResponse(QuoteListResponse(
         quotes=quotes_response,
         total=total,
         page=page,
         page_size=page_size
-    )
+    ))
 
 
 @router.get("/catalog", response_model=QuoteItemListResponse)
 async def list_catalog_items(
+    request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(100, ge=1, le=200),
     search: Optional[str] = None,
@@ -238,6 +246,13 @@ async def list_catalog_items(
 ):
     """Listar conceptos del catálogo disponibles para cotizar (solo activos)"""
     
+    # El catálogo es global: el ETag sale del contador de versión sin consultar la BD.
+    # Lee del primario: el contador se incrementa tras su commit
+    version = await resource_version(CATALOG_RESOURCE)
+    etag = make_etag("catalog", version, page, page_size, search, category) if version else None
+    if etag and etag_matches(request, etag):
+        return not_modified(etag)
+    
     # Base query - solo items activos
     query = select(QuoteItem).where(QuoteItem.is_active == True)
     count_query = select(func.count(QuoteItem.id)).where(QuoteItem.is_active == True)
@@ -268,12 +283,12 @@ async def list_catalog_items(
     result = await db.execute(query)
     items = result.scalars().all()
     
-    return QuoteItemListResponse(
+    return conditional_response(request, QuoteItemListResponse(
         items=[QuoteItemResponse.model_validate(item) for item in items],
         total=total,
         page=page,
         page_size=page_size
-    )
+    ), etag)
 
 
 @router.get("/{quote_id}", response_model=QuoteResponse)
@@ -1,7 +1,9 @@
 """API V1 Router"""
-from fastapi import APIRouter
-from app.api.v1 import auth, companies, users, documents, compliance, projects, quotes, audit_logs
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+from app.api.v1 import auth, companies, users, documents, compliance, projects, quotes, audit_logs, jobs
 from app.api.v1.admin import router as admin_router
+from app.core.health import readiness_checker
 
 api_router = APIRouter()
 
@@ -25,10 +27,21 @@ api_router.include_router(projects.router, prefix="/projects", tags=["Projects"]
 # Quotes (Cotizaciones para tenants)
 api_router.include_router(quotes.router, prefix="/quotes", tags=["Quotes"])
 
+# Jobs en segundo plano (estado / progreso)
+api_router.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
+
 # Admin (solo superadmin)
 api_router.include_router(admin_router, prefix="/admin", tags=["Admin"])
 
 @api_router.get("/health")
 async def health():
-    """Health check endpoint"""
-    return {"status": "healthy", "service": "api"}
+    """Health check endpoint (readiness de las dependencias)"""
+    result = await readiness_checker.check()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if result["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "status": "healthy" if result["ready"] else "unhealthy",
+            "service": "api",
+            "checks": result["checks"],
+        }
+    )
@@ -0,0 +1,187 @@
+"""
+Activity Stream
+Eventos de TaskActivityLog en vivo por proyecto (Server-Sent Events),
+distribuidos entre workers vía Redis pub/sub
+"""
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, Iterable, List, Set
+
+from app.core.redis_client import create_pubsub_client, redis_client
+from app.core.responses import dumps
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "project-activity:"
+HEARTBEAT_SECONDS = 15
+RETRY_MS = 3000
+
+# Eventos pendientes por cliente; si se llena el cliente va atrasado y se
+# cierra su stream en lugar de acumular memoria
+_QUEUE_SIZE = 256
+
+# Máximo de eventos reenviados por reconexión (Last-Event-ID)
+REPLAY_LIMIT = 500
+
+
+def activity_event(project_id: int, log: Any) -> Dict[str, Any]:
+    """
+    Evento publicable a partir de un TaskActivityLog ya insertado (con id)
+
+    Args:
+        project_id: Proyecto de la tarea
+        log: TaskActivityLog
+
+    Returns:
+        Dict serializable a JSON
+    """
+    return {
+        "id": log.id,
+        "project_id": project_id,
+        "task_id": log.task_id,
+        "event_type": log.event_type,
+        "payload": log.payload_json,
+        "created_by": log.created_by,
+        "created_at": log.created_at,
+    }
+
+
+async def publish_activity(project_id: int, logs: Iterable[Any]) -> None:
+    """
+    Publicar actividad de un proyecto a los clientes conectados
+
+    Llamar después del commit. Si Redis falla sólo se pierde el aviso en
+    vivo: los clientes recuperan los eventos al reconectar (Last-Event-ID).
+    """
+    channel = f"{CHANNEL_PREFIX}{project_id}"
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for log in logs:
+                pipe.publish(channel, dumps(activity_event(project_id, log)))
+            await pipe.execute()
+    except Exception as exc:
+        logger.warning(f"[ActivityStream] No se pudo publicar actividad del proyecto {project_id}: {exc}")
+
+
+class _Subscription:
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_SIZE)
+        self.lagged = False
+
+
+class ActivityBroker:
+    """
+    Reparte los eventos de Redis a los clientes SSE de este worker
+
+    Una sola suscripción Redis por proceso (patrón project-activity:*); los
+    clientes sólo consumen una asyncio.Queue, sin conexiones ni consultas
+    mientras no hay actividad.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[int, Set[_Subscription]] = defaultdict(set)
+
+    def subscribe(self, project_id: int) -> _Subscription:
+        subscription = _Subscription()
+        self._subscribers[project_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, project_id: int, subscription: _Subscription) -> None:
+        subscribers = self._subscribers.get(project_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[project_id]
+
+    def dispatch(self, project_id: int, data: str) -> None:
+        for subscription in self._subscribers.get(project_id, ()):
+            if subscription.lagged:
+                continue
+            try:
+                subscription.queue.put_nowait(data)
+            except asyncio.QueueFull:
+                subscription.lagged = True
+                logger.info(f"[ActivityStream] Cliente atrasado en proyecto {project_id}")
+
+    async def listen(self) -> None:
+        """Recibir eventos publicados por cualquier worker (tarea de fondo)"""
+        client = create_pubsub_client()
+        try:
+            while True:
+                try:
+                    async with client.pubsub() as pubsub:
+                        await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                        async for message in pubsub.listen():
+                            if message["type"] != "pmessage":
+                                continue
+                            project_id = int(message["channel"][len(CHANNEL_PREFIX):])
+                            if project_id in self._subscribers:
+                                self.dispatch(project_id, message["data"])
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    logger.warning(f"[ActivityStream] Suscripción interrumpida: {exc}")
+                    await asyncio.sleep(1)
+        finally:
+            await client.aclose()
+
+
+activity_broker = ActivityBroker()
+
+
+def _sse(data: str, event_id: int) -> str:
+    return f"id: {event_id}\nevent: activity\ndata: {data}\n\n"
+
+
+async def stream_project_activity(
+    project_id: int,
+    subscription: _Subscription,
+    backlog: List[Dict[str, Any]],
+    backlog_truncated: bool = False,
+) -> AsyncIterator[str]:
+    """
+    Generador SSE de la actividad de un proyecto
+
+    Cuando el cliente no alcanza a recibir (cola llena) o el backlog venía
+    truncado, se cierra el stream: EventSource reconecta con Last-Event-ID y
+    el resto se recupera de la BD, sin huecos.
+
+    Args:
+        project_id: Proyecto suscrito
+        subscription: Suscripción creada antes de leer `backlog` (sin huecos)
+        backlog: Eventos posteriores a Last-Event-ID, en orden de id
+        backlog_truncated: Si quedaron eventos pendientes después de `backlog`
+
+    Yields:
+        Mensajes SSE (eventos `activity` y comentarios de heartbeat)
+    """
+    # Ids enviados en el backlog: sólo éstos se descartan del stream en vivo.
+    # Los commits no terminan en orden de id (B con id 101 puede publicar
+    # antes que A con id 100), así que no se usa un corte monótono por id
+    backlog_ids: Set[int] = set()
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        for event in backlog:
+            backlog_ids.add(event["id"])
+            yield _sse(dumps(event).decode(), event_id=event["id"])
+        if backlog_truncated:
+            return
+
+        while not subscription.lagged:
+            try:
+                data = await asyncio.wait_for(subscription.queue.get(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+
+            event_id = json.loads(data)["id"]
+            # Ya enviado en el backlog (publicado entre la suscripción y la consulta)
+            if event_id in backlog_ids:
+                backlog_ids.discard(event_id)
+                continue
+            yield _sse(data, event_id=event_id)
+    finally:
+        activity_broker.unsubscribe(project_id, subscription)
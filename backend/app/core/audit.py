@@ -11,6 +11,8 @@ from typing import Any, Dict, Optional, Tuple
 from fastapi import Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.authentication import get_request_principal
+from app.core.metrics import AUDIT_WRITE_FAILURES, AUDIT_WRITES_IN_FLIGHT
 from app.core.tenant import TenantContext
 from app.db.session import AsyncSessionLocal
 
@@ -46,7 +48,8 @@ _METHOD_ACTION = {
 
 # Paths that never need to be logged
 _SKIP_PATHS = {
-    '/', '/health', '/docs', '/redoc', '/openapi.json',
+    '/', '/health', '/health/live', '/health/ready', '/metrics',
+    '/docs', '/redoc', '/openapi.json',
     '/api/v1/health', '/api/v1/auth/me', '/api/v1/auth/refresh',
 }
 
@@ -85,16 +88,6 @@ def _extract_module_action(method: str, path: str) -> Tuple[str, str, str, Optio
     return module, action, entity_type, entity_id
 
 
-def _decode_token_safe(token: str) -> Optional[Dict]:
-    """Decodifica un JWT sin lanzar excepciones."""
-    try:
-        from jose import jwt, JWTError
-        from app.core.config import settings
-        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-    except Exception:
-        return None
-
-
 async def log_audit_event(
     db: AsyncSession,
     tenant_id: Optional[int],
@@ -337,23 +330,16 @@ class AuditMiddleware:
         if status_code[0] >= 400:
             return
 
-        # Decodificar JWT para obtener user_id y tenant_id
-        user_id: Optional[int] = None
-        tenant_id: Optional[int] = None
-        auth_header = request.headers.get("Authorization", "")
-        if auth_header.startswith("Bearer "):
-            payload = _decode_token_safe(auth_header[7:])
-            if payload:
-                try:
-                    user_id = int(payload["sub"])
-                    tenant_id = payload.get("tenant_id")
-                except (KeyError, TypeError, ValueError):
-                    pass
+        # Principal verificado por AuthenticationMiddleware (sin re-decodificar)
+        principal = get_request_principal(request)
+        user_id = principal.user_id if principal else None
+        tenant_id = principal.tenant_id if principal else None
 
         # Mapear path → módulo / acción
         module_key, action, entity_type, entity_id = _extract_module_action(method, path)
 
         # Escribir en audit_logs de forma asíncrona con su propia sesión
+        AUDIT_WRITES_IN_FLIGHT.inc()
         try:
             async with AsyncSessionLocal() as db:
                 await log_audit_event(
@@ -371,7 +357,10 @@ class AuditMiddleware:
                 )
                 await db.commit()
         except Exception as exc:
+            AUDIT_WRITE_FAILURES.inc()
             logger.warning(f"[AuditMiddleware] No se pudo registrar evento: {exc}")
+        finally:
+            AUDIT_WRITES_IN_FLIGHT.dec()
 
 
 def get_audit_context(request: Request) -> Dict[str, str]:
@@ -0,0 +1,364 @@
+"""
+Audit Archive Core
+Archivado en frío de bitácoras a NDJSON comprimido (zstd) en MinIO
+
+Layout de objetos en el bucket `bitacora`:
+    {tabla}/tenant_{id|global}/{YYYY-MM}/{desde}-{hasta}.ndjson.zst
+
+`desde` y `hasta` son la posición (created_at, id) de la primera y la última
+fila del segmento, ej: 20260301T000000000000_000000000123. El nombre es
+determinista: re-archivar las mismas filas sobrescribe el objeto, y la
+lectura descarta segmentos completos sin descargarlos.
+"""
+import heapq
+import io
+import json
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import zstandard
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.minio_client import minio_client
+from app.core.pagination import decode_cursor
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_BUCKET = "bitacora"
+ARCHIVED_TABLES = ("audit_logs", "compliance_audit_logs")
+SEGMENT_MAX_ROWS = 50_000
+DELETE_BATCH_SIZE = 5_000
+_READ_CHUNK_SIZE = 256 * 1024
+_SEGMENT_SUFFIX = ".ndjson.zst"
+_POSITION_FORMAT = "%Y%m%dT%H%M%S%f"
+
+# Posición de una fila en el orden de la bitácora: (created_at, id)
+Position = Tuple[datetime, int]
+
+
+def _tenant_segment(tenant_id: Optional[int]) -> str:
+    return f"tenant_{tenant_id}" if tenant_id is not None else "tenant_global"
+
+
+def _format_position(position: Position) -> str:
+    return f"{position[0].strftime(_POSITION_FORMAT)}_{position[1]:012d}"
+
+
+def _parse_position(value: str) -> Position:
+    created_at, row_id = value.split("_")
+    return datetime.strptime(created_at, _POSITION_FORMAT), int(row_id)
+
+
+def segment_object_name(
+    table: str,
+    tenant_id: Optional[int],
+    month: date,
+    first: Position,
+    last: Position,
+) -> str:
+    """Nombre del objeto para un segmento archivado"""
+    return (
+        f"{table}/{_tenant_segment(tenant_id)}/{month.year:04d}-{month.month:02d}/"
+        f"{_format_position(first)}-{_format_position(last)}{_SEGMENT_SUFFIX}"
+    )
+
+
+def segment_bounds(object_name: str) -> Optional[Tuple[Position, Position]]:
+    """Posiciones (primera, última) de un segmento a partir de su nombre"""
+    filename = object_name.rsplit("/", 1)[-1]
+    if not filename.endswith(_SEGMENT_SUFFIX):
+        return None
+    try:
+        first, last = filename[:-len(_SEGMENT_SUFFIX)].split("-")
+        return _parse_position(first), _parse_position(last)
+    except ValueError:
+        return None
+
+
+class _SegmentWriter:
+    """Acumula filas de un (tenant, mes) en un stream zstd en memoria"""
+
+    def __init__(self, table: str, tenant_id: Optional[int], month: date):
+        self.table = table
+        self.tenant_id = tenant_id
+        self.month = month
+        self.ids: List[int] = []
+        self.first: Optional[Position] = None
+        self.last: Optional[Position] = None
+        self._buffer = io.BytesIO()
+        self._compressor = zstandard.ZstdCompressor(level=10).compressobj()
+
+    @property
+    def key(self) -> Tuple[Optional[int], date]:
+        return self.tenant_id, self.month
+
+    def add(self, row: Dict[str, Any]) -> None:
+        # Las filas llegan ordenadas por (created_at, id)
+        line = json.dumps(row, default=str, separators=(",", ":")) + "\n"
+        self._buffer.write(self._compressor.compress(line.encode()))
+        self.ids.append(row["id"])
+        self.last = (row["created_at"], row["id"])
+        if self.first is None:
+            self.first = self.last
+
+    def finish(self) -> Tuple[str, bytes]:
+        self._buffer.write(self._compressor.flush())
+        name = segment_object_name(self.table, self.tenant_id, self.month, self.first, self.last)
+        return name, self._buffer.getvalue()
+
+
+async def _flush_segment(
+    writer: _SegmentWriter,
+    write_conn: AsyncConnection,
+    source: str,
+    cutoff: Optional[datetime],
+    delete_rows: bool,
+) -> int:
+    """
+    Subir un segmento y, si corresponde, borrar sus filas
+
+    Las filas se borran en lotes dentro de una sola transacción: si el proceso
+    se interrumpe tras la subida, ninguna fila del segmento se borró y la
+    siguiente corrida vuelve a cortar exactamente el mismo segmento, que
+    sobrescribe el objeto en lugar de duplicarlo.
+    """
+    object_name, payload = writer.finish()
+    minio_client.upload_file(
+        bucket_name=ARCHIVE_BUCKET,
+        object_name=object_name,
+        data=payload,
+        content_type="application/zstd"
+    )
+
+    if delete_rows:
+        for start in range(0, len(writer.ids), DELETE_BATCH_SIZE):
+            await write_conn.execute(
+                text(f'DELETE FROM "{source}" WHERE id = ANY(:ids) AND created_at < :cutoff'),
+                {"ids": writer.ids[start:start + DELETE_BATCH_SIZE], "cutoff": cutoff}
+            )
+        await write_conn.commit()
+
+    logger.info(f"[Archive] {object_name}: {len(writer.ids)} filas")
+    return len(writer.ids)
+
+
+async def archive_rows(
+    engine: AsyncEngine,
+    source: str,
+    archive_as: str,
+    cutoff: Optional[datetime] = None,
+    delete_rows: bool = True,
+    batch_size: int = 2_000,
+) -> Dict[str, int]:
+    """
+    Archivar filas de `source` anteriores a `cutoff` en MinIO
+
+    Lee con un cursor del lado del servidor (memoria constante) ordenado por
+    tenant y fecha, corta un segmento por (tenant, mes) o cada SEGMENT_MAX_ROWS
+    filas y sube cada segmento. Con delete_rows (tablas no particionadas) borra
+    después las filas del segmento; las particiones se archivan completas y se
+    eliminan con DROP TABLE.
+
+    Args:
+        engine: Engine async
+        source: Tabla a leer (tabla viva, partición o partición desadjuntada)
+        archive_as: Nombre lógico usado en el layout de objetos
+        cutoff: Archivar filas con created_at < cutoff (None = todas)
+        delete_rows: Borrar las filas archivadas de `source`
+        batch_size: Filas por fetch del cursor
+
+    Returns:
+        Dict con filas y segmentos archivados
+    """
+    where = "WHERE created_at < :cutoff" if cutoff else ""
+    query = text(f'SELECT * FROM "{source}" {where} ORDER BY tenant_id NULLS FIRST, created_at, id')
+    params = {"cutoff": cutoff} if cutoff else {}
+
+    rows = 0
+    segments = 0
+    async with engine.connect() as read_conn, engine.connect() as write_conn:
+        result = await read_conn.stream(
+            query.execution_options(yield_per=batch_size), params
+        )
+        writer: Optional[_SegmentWriter] = None
+        async for row in result.mappings():
+            created_at: datetime = row["created_at"]
+            key = (row["tenant_id"], date(created_at.year, created_at.month, 1))
+            if writer and (writer.key != key or len(writer.ids) >= SEGMENT_MAX_ROWS):
+                rows += await _flush_segment(writer, write_conn, source, cutoff, delete_rows)
+                segments += 1
+                writer = None
+            if writer is None:
+                writer = _SegmentWriter(archive_as, *key)
+            writer.add(dict(row))
+        if writer:
+            rows += await _flush_segment(writer, write_conn, source, cutoff, delete_rows)
+            segments += 1
+
+    return {"rows": rows, "segments": segments}
+
+
+# ---------------------------------------------------------------------------
+# Lectura de segmentos archivados
+# ---------------------------------------------------------------------------
+
+@dataclass
+class ArchiveQuery:
+    """
+    Filtros de la bitácora aplicables a segmentos archivados
+
+    tenant_id None sin all_tenants lee sólo el segmento tenant_global; recorrer
+    todos los tenants requiere all_tenants=True (sólo superadmin).
+    """
+    tenant_id: Optional[int] = None
+    all_tenants: bool = False
+    user_id: Optional[int] = None
+    module_key: Optional[str] = None
+    action: Optional[str] = None
+    entity_type: Optional[str] = None
+    company_id: Optional[int] = None
+    action_type: Optional[str] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+
+    def matches(self, row: Dict[str, Any]) -> bool:
+        for field in ("user_id", "module_key", "action", "entity_type", "company_id", "action_type"):
+            expected = getattr(self, field)
+            if expected is not None and row.get(field) != expected:
+                return False
+        created = row["created_at"].date()
+        if self.date_from and created < self.date_from:
+            return False
+        if self.date_to and created > self.date_to:
+            return False
+        return True
+
+
+def _decode_row(line: bytes) -> Dict[str, Any]:
+    row = json.loads(line)
+    row["created_at"] = datetime.fromisoformat(row["created_at"])
+    return row
+
+
+def iter_segment(object_name: str) -> Iterator[Dict[str, Any]]:
+    """Filas de un segmento archivado, descomprimidas en streaming"""
+    with minio_client.open_object(ARCHIVE_BUCKET, object_name) as response:
+        reader = zstandard.ZstdDecompressor().stream_reader(response)
+        pending = b""
+        while True:
+            chunk = reader.read(_READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            *lines, pending = (pending + chunk).split(b"\n")
+            for line in lines:
+                if line:
+                    yield _decode_row(line)
+        if pending.strip():
+            yield _decode_row(pending)
+
+
+def _month_of(prefix: str) -> Optional[date]:
+    try:
+        year, month = prefix.rstrip("/").rsplit("/", 1)[-1].split("-")
+        return date(int(year), int(month), 1)
+    except ValueError:
+        return None
+
+
+def _month_segments(
+    month_prefixes: List[str],
+    query: ArchiveQuery,
+    after: Optional[Position],
+) -> List[Tuple[Position, Position, str]]:
+    """Segmentos de un mes que pueden tener filas de la página, por última posición DESC"""
+    segments = []
+    for month_prefix in month_prefixes:
+        for object_name in minio_client.list_object_names(ARCHIVE_BUCKET, month_prefix):
+            bounds = segment_bounds(object_name)
+            if bounds is None:
+                continue
+            first, last = bounds
+            # Segmento ya entregado en páginas anteriores o fuera del rango de fechas
+            if after is not None and first >= after:
+                continue
+            if query.date_to and first[0].date() > query.date_to:
+                continue
+            if query.date_from and last[0].date() < query.date_from:
+                continue
+            segments.append((first, last, object_name))
+    segments.sort(key=lambda segment: segment[1], reverse=True)
+    return segments
+
+
+def scan_archive(
+    table: str,
+    query: ArchiveQuery,
+    cursor: Optional[str],
+    limit: int,
+) -> List[Dict[str, Any]]:
+    """
+    Leer filas archivadas en orden (created_at DESC, id DESC)
+
+    Recorre los meses archivados del más reciente al más antiguo y, dentro de
+    cada mes, los segmentos por su última posición; descarta sin descargar los
+    segmentos que quedan antes del cursor o fuera de [date_from, date_to] y se
+    detiene en cuanto ningún segmento restante puede mejorar las `limit` filas
+    juntadas. La memoria está acotada a `limit` filas. Operación bloqueante:
+    llamar desde un threadpool.
+
+    Args:
+        table: Tabla lógica archivada (ARCHIVED_TABLES)
+        query: Filtros
+        cursor: Cursor keyset (created_at, id) de la página anterior
+        limit: Máximo de filas a devolver
+
+    Returns:
+        Filas como dicts, ordenadas descendentemente
+    """
+    if table not in ARCHIVED_TABLES:
+        raise ValueError(f"Tabla sin archivo: {table}")
+    after = decode_cursor(cursor) if cursor else None
+
+    if query.all_tenants and query.tenant_id is None:
+        tenant_prefixes = minio_client.list_object_names(ARCHIVE_BUCKET, f"{table}/", recursive=False)
+    else:
+        tenant_prefixes = [f"{table}/{_tenant_segment(query.tenant_id)}/"]
+
+    months: Dict[date, List[str]] = {}
+    for tenant_prefix in tenant_prefixes:
+        for month_prefix in minio_client.list_object_names(ARCHIVE_BUCKET, tenant_prefix, recursive=False):
+            month = _month_of(month_prefix)
+            if month is None:
+                continue
+            if query.date_to and month > query.date_to:
+                continue
+            if query.date_from and month < date(query.date_from.year, query.date_from.month, 1):
+                continue
+            if after and month > after[0].date():
+                continue
+            months.setdefault(month, []).append(month_prefix)
+
+    # Min-heap con las `limit` mejores filas: heap[0] es la peor conservada
+    best: List[Tuple[Position, Dict[str, Any]]] = []
+    for month in sorted(months, reverse=True):
+        for _, last, object_name in _month_segments(months[month], query, after):
+            if len(best) >= limit and last < best[0][0]:
+                break
+            for row in iter_segment(object_name):
+                position = (row["created_at"], row["id"])
+                if after is not None and position >= after:
+                    continue
+                if not query.matches(row):
+                    continue
+                if len(best) < limit:
+                    heapq.heappush(best, (position, row))
+                elif position > best[0][0]:
+                    heapq.heapreplace(best, (position, row))
+        # Los meses siguientes son más antiguos que todo lo juntado
+        if len(best) >= limit:
+            break
+
+    return [row for _, row in sorted(best, key=lambda item: item[0], reverse=True)]
@@ -0,0 +1,102 @@
+"""
+Authentication Core
+Middleware que verifica el JWT una sola vez por request y publica el
+principal en el scope ASGI y en context variables
+"""
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from starlette.requests import HTTPConnection
+
+from app.core.security import decode_token
+from app.core.tenant import TenantContext
+
+# Clave del principal dentro del scope ASGI
+PRINCIPAL_SCOPE_KEY = "principal"
+
+_principal_context: ContextVar[Optional["Principal"]] = ContextVar("principal", default=None)
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Identidad autenticada extraída de un access token"""
+    user_id: int
+    tenant_id: Optional[int]
+    is_superadmin: bool
+    claims: Dict[str, Any] = field(default_factory=dict, compare=False, repr=False)
+
+
+def principal_from_token(token: str) -> Optional[Principal]:
+    """
+    Construir el principal desde un access token
+
+    Args:
+        token: JWT recibido en el header Authorization
+
+    Returns:
+        Principal o None si el token es inválido, expiró o no es de acceso
+    """
+    payload = decode_token(token)
+    if not payload or payload.get("type") != "access":
+        return None
+    try:
+        user_id = int(payload["sub"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return Principal(
+        user_id=user_id,
+        tenant_id=payload.get("tenant_id"),
+        is_superadmin=bool(payload.get("is_superadmin", False)),
+        claims=payload,
+    )
+
+
+def _bearer_token(scope) -> Optional[str]:
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                return token.strip()
+            return None
+    return None
+
+
+def get_request_principal(connection: HTTPConnection) -> Optional[Principal]:
+    """Principal publicado por AuthenticationMiddleware para este request"""
+    return connection.scope.get(PRINCIPAL_SCOPE_KEY)
+
+
+def get_current_principal() -> Optional[Principal]:
+    """Principal del contexto actual (utilizable fuera de endpoints)"""
+    return _principal_context.get()
+
+
+class AuthenticationMiddleware:
+    """
+    Verifica el Bearer token una vez por request
+
+    No rechaza requests: sólo publica el principal (o None) en
+    scope["principal"], en la context variable del principal y en
+    TenantContext. Las dependencias deciden si exigir autenticación.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        token = _bearer_token(scope)
+        principal = principal_from_token(token) if token else None
+        scope[PRINCIPAL_SCOPE_KEY] = principal
+
+        context_token = _principal_context.set(principal)
+        TenantContext.set_tenant_id(principal.tenant_id if principal else None)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            TenantContext.clear()
+            _principal_context.reset(context_token)
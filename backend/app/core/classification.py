@@ -0,0 +1,123 @@
+"""
+Classification Engine
+Clasificación automática de empresas (tarifa y demanda contratada) y
+sugerencia de tipo de centro de carga. Cada regla se evalúa por fila
+(Python) o en bloque (expresión SQL CASE equivalente)
+"""
+import re
+from typing import Any, Mapping, Optional
+
+from sqlalchemy import and_, case, func
+
+from app.models.company import Company
+from app.models.compliance import TipoCentroCarga
+
+# Umbrales de demanda contratada (kW) para Company.clasificacion
+GDMTH_ALTO_KW = 1000
+GDMTH_MEDIO_KW = 500
+GDMTO_ALTO_KW = 500
+
+# Tipo de centro de carga
+MEDIA_TENSION_TARIFAS = ("GDMTH", "GDMTO")
+TIPO_B_MIN_KW = 1000  # Media tensión con demanda >= 1 MW
+MEDIA_TENSION_MIN_KV = 1.0
+ALTA_TENSION_MIN_KV = 35.0  # Por encima: alta tensión (TIPO_C)
+
+# Justificación de las clasificaciones generadas por el motor; sólo éstas se
+# regeneran, las capturadas por un usuario no se sobrescriben
+AUTO_JUSTIFICACION = "Sugerida automáticamente por tarifa, tensión y demanda contratada"
+
+_TENSION_RE = re.compile(r"(\d+(?:[.,]\d+)?)\s*(kv|v)?", re.IGNORECASE)
+
+
+def _plain(value: Any) -> Any:
+    return value.value if hasattr(value, "value") else value
+
+
+def _demanda_kw(data: Mapping[str, Any]) -> float:
+    try:
+        return float(data.get("demanda_contratada_kw") or 0)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def calcular_clasificacion(data: Mapping[str, Any]) -> Optional[str]:
+    """
+    Clasificación automática basada en tipo de suministro y demanda
+
+    Args:
+        data: Dict con tipo_suministro y demanda_contratada_kw
+
+    Returns:
+        Clasificación (ej. "GDMTH-ALTO") o el tipo de suministro sin subnivel
+    """
+    tipo = _plain(data.get("tipo_suministro"))
+    demanda = _demanda_kw(data)
+
+    if tipo == "GDMTH":
+        if demanda >= GDMTH_ALTO_KW:
+            return "GDMTH-ALTO"
+        if demanda >= GDMTH_MEDIO_KW:
+            return "GDMTH-MEDIO"
+        return "GDMTH-BAJO"
+    if tipo == "GDMTO":
+        if demanda >= GDMTO_ALTO_KW:
+            return "GDMTO-ALTO"
+        return "GDMTO-MEDIO"
+    return tipo
+
+
+def clasificacion_sql():
+    """Expresión CASE sobre Company equivalente a calcular_clasificacion"""
+    tipo = Company.tipo_suministro
+    demanda = func.coalesce(Company.demanda_contratada_kw, 0)
+    return case(
+        (and_(tipo == "GDMTH", demanda >= GDMTH_ALTO_KW), "GDMTH-ALTO"),
+        (and_(tipo == "GDMTH", demanda >= GDMTH_MEDIO_KW), "GDMTH-MEDIO"),
+        (tipo == "GDMTH", "GDMTH-BAJO"),
+        (and_(tipo == "GDMTO", demanda >= GDMTO_ALTO_KW), "GDMTO-ALTO"),
+        (tipo == "GDMTO", "GDMTO-MEDIO"),
+        else_=tipo,
+    )
+
+
+def tension_kv(value: Any) -> Optional[float]:
+    """
+    Tensión de suministro en kV a partir del texto capturado
+
+    Acepta "13.8 kV", "115kV", "440 V" o "13800" (sin unidad, >= 1000 se
+    interpreta en volts). None si no hay un número reconocible.
+    """
+    if value is None:
+        return None
+    match = _TENSION_RE.search(str(value))
+    if not match:
+        return None
+    number = float(match.group(1).replace(",", "."))
+    unit = (match.group(2) or "").lower()
+    if unit == "v" or (not unit and number >= 1000):
+        number /= 1000
+    return number
+
+
+def sugerir_tipo_centro_carga(data: Mapping[str, Any]) -> Optional[TipoCentroCarga]:
+    """
+    Tipo de centro de carga sugerido por tensión, tarifa y demanda
+
+    Args:
+        data: Dict con tipo_suministro, tension_suministro y demanda_contratada_kw
+
+    Returns:
+        TIPO_C en alta tensión; TIPO_A/TIPO_B en media tensión según la
+        demanda; None si no hay datos suficientes (p. ej. baja tensión)
+    """
+    kv = tension_kv(data.get("tension_suministro"))
+    if kv is not None and kv > ALTA_TENSION_MIN_KV:
+        return TipoCentroCarga.TIPO_C
+
+    media_tension = _plain(data.get("tipo_suministro")) in MEDIA_TENSION_TARIFAS or (
+        kv is not None and kv >= MEDIA_TENSION_MIN_KV
+    )
+    if not media_tension:
+        return None
+    return TipoCentroCarga.TIPO_B if _demanda_kw(data) >= TIPO_B_MIN_KW else TipoCentroCarga.TIPO_A
@@ -0,0 +1,301 @@
+"""
+Company Import
+Importación masiva de empresas desde CSV/XLSX: lectura en streaming,
+validación con CompanyCreate, unicidad por lotes e inserción por chunks
+"""
+import csv
+import io
+import logging
+from itertools import islice
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.classification import calcular_clasificacion
+from app.core.config import settings
+from app.models.company import Company
+from app.schemas.company import CompanyCreate
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("csv", "xlsx")
+REQUIRED_COLUMNS = ("razon_social", "rfc")
+KNOWN_COLUMNS = frozenset(CompanyCreate.model_fields)
+
+ProgressCallback = Callable[[int, int], Any]
+Row = Tuple[int, Dict[str, Any]]
+
+
+class ImportFileError(ValueError):
+    """Archivo de importación ilegible o sin las columnas requeridas"""
+
+
+def import_format(filename: Optional[str]) -> Optional[str]:
+    """Formato a partir de la extensión ("csv", "xlsx") o None si no se soporta"""
+    extension = (filename or "").rsplit(".", 1)[-1].lower()
+    return extension if extension in IMPORT_FORMATS else None
+
+
+def _normalize_header(value: Any) -> str:
+    return str(value or "").strip().lower().replace(" ", "_")
+
+
+def _check_header(header: List[str]) -> None:
+    missing = [column for column in REQUIRED_COLUMNS if column not in header]
+    if missing:
+        raise ImportFileError(f"Faltan columnas requeridas: {', '.join(missing)}")
+
+
+def _cell(value: Any) -> Any:
+    # Celdas vacías -> None; números de Excel como texto (RFC, CP, teléfono)
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    value = str(value).strip()
+    return value or None
+
+
+def _csv_rows(fileobj: IO[bytes]) -> Iterator[list]:
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    try:
+        sample = text.read(4096)
+        text.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        yield from csv.reader(text, dialect)
+    finally:
+        # Soltar el archivo sin cerrarlo (se relee en otra pasada)
+        text.detach()
+
+
+def _xlsx_rows(fileobj: IO[bytes]) -> Iterator[tuple]:
+    from openpyxl import load_workbook
+
+    # read_only: las filas se leen del zip bajo demanda, sin cargar la hoja
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _raw_rows(fileobj: IO[bytes], fmt: str) -> Iterator[tuple]:
+    if fmt == "csv":
+        return _csv_rows(fileobj)
+    return _xlsx_rows(fileobj)
+
+
+def read_header(fileobj: IO[bytes], fmt: str) -> List[str]:
+    """
+    Leer y validar el encabezado sin recorrer el archivo
+
+    Raises:
+        ImportFileError si el archivo no se puede leer o faltan columnas
+    """
+    raw = _raw_rows(fileobj, fmt)
+    try:
+        header = [_normalize_header(value) for value in next(raw, ())]
+    except Exception as exc:
+        raise ImportFileError(f"No se pudo leer el archivo: {exc}")
+    finally:
+        raw.close()
+    _check_header(header)
+    return header
+
+
+def iter_rows(fileobj: IO[bytes], fmt: str) -> Iterator[Row]:
+    """
+    Filas del archivo como dicts con las columnas conocidas de CompanyCreate
+
+    Args:
+        fileobj: Archivo binario posicionado al inicio
+        fmt: "csv" o "xlsx"
+
+    Yields:
+        Tuple (número de fila en el archivo, dict columna -> valor)
+    """
+    raw = _raw_rows(fileobj, fmt)
+    try:
+        header = [_normalize_header(value) for value in next(raw, ())]
+    except Exception as exc:
+        raise ImportFileError(f"No se pudo leer el archivo: {exc}")
+    _check_header(header)
+    columns = [(index, name) for index, name in enumerate(header) if name in KNOWN_COLUMNS]
+
+    for row_number, values in enumerate(raw, start=2):
+        row = {
+            name: _cell(values[index]) if index < len(values) else None
+            for index, name in columns
+        }
+        # Filas en blanco (comunes al final de hojas de Excel)
+        if not any(value is not None for value in row.values()):
+            continue
+        yield row_number, {name: value for name, value in row.items() if value is not None}
+
+
+def count_rows(fileobj: IO[bytes], fmt: str) -> int:
+    """Filas de datos (estimado para XLSX: dimensión declarada de la hoja)"""
+    if fmt == "xlsx":
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(fileobj, read_only=True)
+        try:
+            max_row = workbook.active.max_row
+        finally:
+            workbook.close()
+        return max(max_row - 1, 0) if max_row else 0
+    return max(sum(1 for _ in _csv_rows(fileobj)) - 1, 0)
+
+
+class ImportReport:
+    """Resultado acumulado de una importación"""
+
+    def __init__(self, max_errors: int):
+        self.max_errors = max_errors
+        self.processed = 0
+        self.created = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.truncated = False
+
+    def _add(self, row: int, message: str, field: Optional[str]) -> None:
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row, "field": field, "message": message})
+        else:
+            self.truncated = True
+
+    def error(self, row: int, message: str, field: Optional[str] = None) -> None:
+        """Fila rechazada por un motivo"""
+        self.failed += 1
+        self._add(row, message, field)
+
+    def invalid(self, row: int, exc: ValidationError) -> None:
+        """Fila rechazada por CompanyCreate (un error por campo inválido)"""
+        self.failed += 1
+        for error in exc.errors():
+            self._add(row, error["msg"], str(error["loc"][0]) if error["loc"] else None)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "processed": self.processed,
+            "created": self.created,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.truncated,
+        }
+
+
+async def _existing_values(db: AsyncSession, column, values: set) -> set:
+    if not values:
+        return set()
+    result = await db.execute(select(column).where(column.in_(values)))
+    return set(result.scalars().all())
+
+
+async def _import_chunk(
+    db: AsyncSession,
+    chunk: List[Row],
+    tenant_id: int,
+    report: ImportReport,
+    seen_rfcs: set,
+    seen_rpus: set,
+) -> None:
+    valid: List[Tuple[int, CompanyCreate]] = []
+    for row_number, data in chunk:
+        try:
+            valid.append((row_number, CompanyCreate(**data)))
+        except ValidationError as exc:
+            report.invalid(row_number, exc)
+
+    # Unicidad contra la BD: dos consultas IN por lote en lugar de dos por fila
+    existing_rfcs = await _existing_values(db, Company.rfc, {company.rfc for _, company in valid})
+    existing_rpus = await _existing_values(
+        db, Company.rpu, {company.rpu for _, company in valid if company.rpu}
+    )
+
+    rows = []
+    row_numbers = {}
+    for row_number, company in valid:
+        if company.rfc in existing_rfcs:
+            report.error(row_number, "El RFC ya está registrado", "rfc")
+            continue
+        if company.rfc in seen_rfcs:
+            report.error(row_number, "RFC duplicado en el archivo", "rfc")
+            continue
+        if company.rpu and company.rpu in existing_rpus:
+            report.error(row_number, "El RPU ya está registrado", "rpu")
+            continue
+        if company.rpu and company.rpu in seen_rpus:
+            report.error(row_number, "RPU duplicado en el archivo", "rpu")
+            continue
+
+        seen_rfcs.add(company.rfc)
+        if company.rpu:
+            seen_rpus.add(company.rpu)
+        data = company.model_dump(mode="json")
+        rows.append({**data, "tenant_id": tenant_id, "clasificacion": calcular_clasificacion(data)})
+        row_numbers[company.rfc] = row_number
+
+    if not rows:
+        return
+
+    # ON CONFLICT: altas concurrentes entre la verificación y el INSERT
+    result = await db.execute(
+        pg_insert(Company).on_conflict_do_nothing().returning(Company.rfc),
+        rows,
+    )
+    inserted = set(result.scalars().all())
+    report.created += len(inserted)
+    for rfc, row_number in row_numbers.items():
+        if rfc not in inserted:
+            report.error(row_number, "El RFC o RPU ya está registrado", "rfc")
+
+
+async def import_companies(
+    db: AsyncSession,
+    rows: Iterator[Row],
+    tenant_id: int,
+    total: int = 0,
+    progress: Optional[ProgressCallback] = None,
+) -> Dict[str, Any]:
+    """
+    Importar empresas por lotes de JOB_CHUNK_SIZE filas
+
+    Cada lote se valida, se verifica contra la BD con consultas IN y se
+    inserta en un solo INSERT multi-fila; se hace commit por lote, de modo
+    que un error en una fila sólo la excluye a ella.
+
+    Args:
+        db: Sesión
+        rows: Filas de iter_rows()
+        tenant_id: Tenant dueño de las empresas
+        total: Filas esperadas (sólo para el progreso)
+        progress: Callback (filas procesadas, total) tras cada lote
+
+    Returns:
+        Reporte con processed, created, failed y errores por fila
+    """
+    report = ImportReport(settings.COMPANY_IMPORT_MAX_ERRORS)
+    seen_rfcs: set = set()
+    seen_rpus: set = set()
+
+    while True:
+        chunk = list(islice(rows, settings.JOB_CHUNK_SIZE))
+        if not chunk:
+            break
+        await _import_chunk(db, chunk, tenant_id, report, seen_rfcs, seen_rpus)
+        await db.commit()
+        report.processed += len(chunk)
+        if progress:
+            progress(report.processed, max(total, report.processed))
+
+    logger.info(
+        f"[CompanyImport] Tenant {tenant_id}: {report.created} creadas, {report.failed} con error"
+    )
+    return report.as_dict()
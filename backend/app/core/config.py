@@ -25,10 +25,24 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     DATABASE_POOL_SIZE: int = 20
     DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: int = 30  # Segundos esperando una conexión libre
+    DATABASE_POOL_RECYCLE: int = 1800  # Reciclar conexiones más viejas (s), -1 desactiva
+    DATABASE_STATEMENT_CACHE_SIZE: int = 100  # Cache de prepared statements de asyncpg
+    DATABASE_PGBOUNCER: bool = False  # PgBouncer en modo transaction (sin prepared statements)
+    DATABASE_ECHO: bool = False  # Log de SQL (sólo para depurar)
+    
+    # Read replica (opcional; sin URL todo va al primario)
+    DATABASE_REPLICA_URL: str | None = None
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = 5.0  # Lag tolerado antes de volver al primario
+    DATABASE_REPLICA_LAG_CHECK_SECONDS: float = 5.0  # Cada cuánto medir el lag
+    DATABASE_READ_YOUR_WRITES_SECONDS: int = 30  # Lecturas al primario tras una escritura
     
     # Redis
     REDIS_URL: str
     
+    # Cache de tenants (descriptor tenant + licencia)
+    TENANT_CACHE_TTL_SECONDS: int = 300
+    
     # Celery
     CELERY_BROKER_URL: str
     CELERY_RESULT_BACKEND: str
@@ -75,8 +89,15 @@ class Settings(BaseSettings):
         
         return unique_origins
     
-    # Rate Limiting
-    RATE_LIMIT_PER_MINUTE: int = 100
+    # Rate Limiting (token bucket en Redis)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_PER_MINUTE: int = 100  # Por usuario autenticado (o por IP si es anónimo)
+    RATE_LIMIT_TENANT_PER_MINUTE: int = 1000  # Cuota por tenant si su licencia no define otra
+    RATE_LIMIT_LOGIN_PER_MINUTE: int = 10  # Intentos de /auth/login por IP
+    # Proxies de confianza (IPs o CIDR, separados por coma): sólo de ellos se
+    # toma X-Forwarded-For / X-Real-IP para la IP del cliente. Default: la red
+    # bridge de Docker donde corre infra/nginx
+    TRUSTED_PROXY_IPS: str = "127.0.0.1,172.16.0.0/12"
     
     # Password Policy
     PASSWORD_MIN_LENGTH: int = 8
@@ -96,9 +117,27 @@ class Settings(BaseSettings):
     # Pagination
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
+    AUDIT_LOG_COUNT_CAP: int = 10000  # Tope para count=capped en la bitácora
+    
+    # Audit log partitioning / retention
+    AUDIT_LOG_PARTITION_MONTHS_AHEAD: int = 3  # Particiones mensuales pre-creadas
+    AUDIT_LOG_RETENTION_MONTHS: int = 24  # Tope para desadjuntar si el archivado no corre
+    AUDIT_LOG_HOT_MONTHS: int = 12  # Ventana caliente; los meses anteriores se archivan en MinIO y se eliminan
+    
+    # Background jobs (Celery)
+    JOB_CHUNK_SIZE: int = 500  # Filas por lote en jobs set-based (clonación, importación)
+    PROJECT_CLONE_SYNC_MAX_TASKS: int = 300  # Clonaciones más grandes se encolan en Celery
+    COMPANY_IMPORT_MAX_ERRORS: int = 1000  # Errores por fila incluidos en el reporte de importación
+    RECLASSIFY_MAX_DIFFS: int = 1000  # Diferencias incluidas en el reporte de reclasificación
     
     # Observability
     SENTRY_DSN: str | None = None
+    DB_QUERY_WARN_THRESHOLD: int = 50  # Queries por request antes de registrar warning
+    DB_QUERY_REPEAT_THRESHOLD: int = 10  # Repeticiones de una sentencia (N+1) antes de warning
+    METRICS_ENABLED: bool = True  # Exponer /metrics (Prometheus)
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 2.0  # Timeout por dependencia en readiness
+    HEALTH_CACHE_SECONDS: float = 5.0  # Reutilizar el último resultado de readiness
+    METRICS_CELERY_QUEUES: List[str] = ["celery"]  # Colas del broker a reportar
     
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -0,0 +1,144 @@
+"""
+Conditional GET
+ETags (If-None-Match -> 304) calculados desde el cuerpo serializado o desde
+contadores de versión en Redis, para responder sin ejecutar la consulta
+"""
+import hashlib
+import logging
+import time
+from typing import Any, Optional
+
+from fastapi import Request, Response
+from redis.asyncio import Redis
+
+from app.core.redis_client import redis_client
+from app.core.responses import dumps
+
+logger = logging.getLogger(__name__)
+
+_VERSION_PREFIX = "etag:v:"
+
+# El cliente debe revalidar siempre; la respuesta depende del usuario
+CACHE_CONTROL = "private, no-cache"
+
+# Recursos con contador de versión
+CATALOG_RESOURCE = "quote-catalog"
+COMPLIANCE_RESOURCE = "compliance"
+
+
+def company_resource(company_id: int) -> str:
+    """Recurso de versión de una empresa (datos y clasificación)"""
+    return f"company:{company_id}"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    ETag débil a partir de valores (versiones, updated_at, ids) o del cuerpo
+
+    Args:
+        parts: Valores que identifican el estado del recurso
+
+    Returns:
+        ETag entre comillas, ej: W/"3f2a..."
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\x1f")
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Si el ETag coincide con If-None-Match (comparación débil, RFC 9110)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in header.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    """Respuesta 304 sin cuerpo"""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def conditional_response(request: Request, content: Any, etag: Optional[str] = None) -> Response:
+    """
+    Serializar `content` y responder 304 si el cliente ya tiene esa versión
+
+    Args:
+        request: Request actual (If-None-Match)
+        content: Modelo Pydantic o estructura JSON
+        etag: ETag precalculado; si es None se usa un hash del cuerpo
+
+    Returns:
+        304 o respuesta JSON con cabecera ETag
+    """
+    body = dumps(content)
+    etag = etag or make_etag(body)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
+
+# ----------------------------------------------------------------------------
+# Contadores de versión
+# ----------------------------------------------------------------------------
+
+async def resource_version(*resources: str) -> Optional[str]:
+    """
+    Versión combinada de uno o más recursos
+
+    Un contador inexistente se inicializa con el reloj, de modo que si Redis
+    pierde los datos las versiones cambian y no se sirven 304 obsoletos.
+
+    El contador se incrementa tras el commit en el primario: los endpoints
+    que lo usan deben leer el cuerpo del primario (get_db), no de la réplica.
+    Una réplica atrasada guardaría un cuerpo viejo bajo el ETag nuevo.
+
+    Returns:
+        Versión (str) o None si Redis no está disponible
+    """
+    keys = [f"{_VERSION_PREFIX}{resource}" for resource in resources]
+    try:
+        values = await redis_client.mget(keys)
+        missing = [key for key, value in zip(keys, values) if value is None]
+        if missing:
+            seed = time.time_ns()
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for key in missing:
+                    pipe.set(key, seed, nx=True)
+                await pipe.execute()
+            values = await redis_client.mget(keys)
+    except Exception as exc:
+        logger.warning(f"[ETag] Sin contadores de versión: {exc}")
+        return None
+    return ".".join(values)
+
+
+async def bump_version(*resources: str, client: Optional[Redis] = None) -> None:
+    """
+    Invalidar los ETags de los recursos (llamar después del commit)
+
+    Args:
+        resources: Recursos modificados
+        client: Cliente Redis a usar (los workers de Celery pasan uno propio
+            del event loop del job); por defecto el compartido de la API
+    """
+    try:
+        async with (client or redis_client).pipeline(transaction=False) as pipe:
+            for resource in resources:
+                pipe.incr(f"{_VERSION_PREFIX}{resource}")
+            await pipe.execute()
+    except Exception as exc:
+        # Los clientes pueden recibir 304 obsoletos hasta el siguiente cambio
+        logger.warning(f"[ETag] No se pudo incrementar versión de {resources}: {exc}")
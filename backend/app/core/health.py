@@ -0,0 +1,99 @@
+"""
+Health Checks
+Sondas de readiness contra Postgres, Redis y MinIO, ejecutadas en paralelo
+con timeout y cacheadas unos segundos para no amplificar la carga
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+
+
+async def _probe_database() -> None:
+    from app.db.session import engine
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def _probe_redis() -> None:
+    from app.core.redis_client import redis_client
+
+    await redis_client.ping()
+
+
+async def _probe_minio() -> None:
+    from app.core.minio_client import minio_client
+
+    # Cliente síncrono: se ejecuta en un hilo para no bloquear el event loop
+    await asyncio.to_thread(minio_client.client.bucket_exists, settings.MINIO_BUCKET_NAME)
+
+
+PROBES: Dict[str, Callable[[], Awaitable[None]]] = {
+    "database": _probe_database,
+    "redis": _probe_redis,
+    "minio": _probe_minio,
+}
+
+
+async def _run_probe(probe: Callable[[], Awaitable[None]], timeout: float) -> Dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(probe(), timeout=timeout)
+        status = {"status": "ok"}
+    except asyncio.TimeoutError:
+        status = {"status": "timeout"}
+    except Exception as exc:
+        status = {"status": "error", "error": type(exc).__name__}
+    status["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return status
+
+
+class ReadinessChecker:
+    """
+    Ejecuta las sondas como máximo una vez cada HEALTH_CACHE_SECONDS
+
+    Los requests concurrentes durante una ejecución esperan el mismo
+    resultado en lugar de lanzar sondas propias.
+    """
+
+    def __init__(self):
+        self._result: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> bool:
+        return (
+            self._result is not None
+            and time.monotonic() - self._checked_at < settings.HEALTH_CACHE_SECONDS
+        )
+
+    async def check(self) -> Dict[str, Any]:
+        """
+        Estado de las dependencias
+
+        Returns:
+            Dict con `ready` (bool), `checks` por dependencia y `cached`
+        """
+        if self._fresh():
+            return {**self._result, "cached": True}
+        async with self._lock:
+            if self._fresh():
+                return {**self._result, "cached": True}
+            names = list(PROBES)
+            results = await asyncio.gather(*(
+                _run_probe(PROBES[name], settings.HEALTH_CHECK_TIMEOUT_SECONDS) for name in names
+            ))
+            checks = dict(zip(names, results))
+            self._result = {
+                "ready": all(check["status"] == "ok" for check in checks.values()),
+                "checks": checks,
+            }
+            self._checked_at = time.monotonic()
+            return {**self._result, "cached": False}
+
+
+readiness_checker = ReadinessChecker()
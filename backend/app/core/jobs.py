@@ -0,0 +1,71 @@
+"""
+Background Jobs
+Registro de jobs Celery por tenant y consulta de su estado/progreso
+"""
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+_JOB_PREFIX = "job:"
+JOB_TTL_SECONDS = 7 * 24 * 3600
+
+
+async def register_job(job_id: str, kind: str, tenant_id: Optional[int], user_id: int) -> None:
+    """
+    Registrar el dueño de un job recién encolado
+
+    El backend de resultados de Celery no guarda quién lanzó el job; este
+    registro permite que sólo el tenant dueño consulte su estado.
+    """
+    await redis_client.set(
+        f"{_JOB_PREFIX}{job_id}",
+        json.dumps({"kind": kind, "tenant_id": tenant_id, "user_id": user_id}),
+        ex=JOB_TTL_SECONDS,
+    )
+
+
+def _celery_state(job_id: str) -> Dict[str, Any]:
+    from app.workers.celery_app import celery_app
+
+    result = celery_app.AsyncResult(job_id)
+    state = result.state
+    info = result.info
+    status: Dict[str, Any] = {"state": state, "progress": None, "result": None, "error": None}
+    if state == "PROGRESS" and isinstance(info, dict):
+        status["progress"] = info
+    elif state == "SUCCESS":
+        status["result"] = info
+    elif state == "FAILURE":
+        status["error"] = str(info)
+    return status
+
+
+async def get_job_status(job_id: str, tenant_id: Optional[int], is_superadmin: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Estado de un job si pertenece al tenant
+
+    Args:
+        job_id: ID del job (task id de Celery)
+        tenant_id: Tenant del usuario que consulta
+        is_superadmin: Los superadmin ven cualquier job
+
+    Returns:
+        Dict con kind, state (PENDING/STARTED/PROGRESS/SUCCESS/FAILURE),
+        progress, result y error; None si no existe o no es del tenant
+    """
+    raw = await redis_client.get(f"{_JOB_PREFIX}{job_id}")
+    if raw is None:
+        return None
+    owner = json.loads(raw)
+    if not is_superadmin and owner["tenant_id"] != tenant_id:
+        return None
+
+    # AsyncResult es síncrono (cliente Redis de Celery)
+    status = await run_in_threadpool(_celery_state, job_id)
+    return {"job_id": job_id, "kind": owner["kind"], **status}
@@ -0,0 +1,224 @@
+"""
+Metrics Core
+Métricas Prometheus del API, pool de BD, MinIO, bitácora y colas de Celery
+
+Con varios workers (gunicorn) definir PROMETHEUS_MULTIPROC_DIR antes de
+arrancar: cada proceso escribe sus valores en archivos mmap y /metrics los
+agrega con MultiProcessCollector (ver gunicorn.conf.py).
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+# Rutas sin template (404) se agrupan para no disparar la cardinalidad
+UNMATCHED_ROUTE = "unmatched"
+
+
+# ==============================================
+# HTTP
+# ==============================================
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Latencia de requests HTTP por template de ruta",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests HTTP en curso",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+
+# ==============================================
+# Base de datos (pool)
+# ==============================================
+# role: "primary" o "replica" (engine de réplica de lectura)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_connections_checked_out",
+    "Conexiones del pool en uso",
+    ["role"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Tiempo esperando una conexión del pool",
+    ["role"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+DB_POOL_OVERFLOW_EVENTS = Counter(
+    "db_pool_overflow_events",
+    "Conexiones abiertas por encima de DATABASE_POOL_SIZE",
+    ["role"],
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts",
+    "Checkouts que agotaron DATABASE_POOL_TIMEOUT",
+    ["role"],
+)
+DB_POOL_INVALIDATIONS = Counter(
+    "db_pool_invalidations",
+    "Conexiones invalidadas (desconexión o error del driver)",
+    ["role"],
+)
+
+
+# ==============================================
+# MinIO
+# ==============================================
+MINIO_OPERATION_DURATION = Histogram(
+    "minio_operation_duration_seconds",
+    "Latencia de operaciones contra MinIO",
+    ["operation", "bucket"],
+)
+MINIO_BYTES = Counter(
+    "minio_bytes",
+    "Bytes transferidos con MinIO",
+    ["operation", "bucket"],
+)
+
+
+@contextmanager
+def track_minio(operation: str, bucket: str) -> Iterator[None]:
+    """Medir la latencia de una operación contra MinIO"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        MINIO_OPERATION_DURATION.labels(operation, bucket).observe(time.perf_counter() - started)
+
+
+# ==============================================
+# Bitácora
+# ==============================================
+AUDIT_WRITES_IN_FLIGHT = Gauge(
+    "audit_log_writes_in_flight",
+    "Eventos de bitácora pendientes de escribir",
+    multiprocess_mode="livesum",
+)
+AUDIT_WRITE_FAILURES = Counter(
+    "audit_log_write_failures",
+    "Eventos de bitácora que no se pudieron escribir",
+)
+
+
+# ==============================================
+# Middleware y exposición
+# ==============================================
+class MetricsMiddleware:
+    """
+    Latencia por template de ruta y requests en curso
+
+    El template (ej: /api/v1/projects/{project_id}) se toma de scope["route"],
+    que FastAPI asigna al resolver la ruta; no se usa el path crudo.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def capture_send(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, capture_send)
+        finally:
+            in_flight.dec()
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.labels(
+                method,
+                getattr(route, "path_format", UNMATCHED_ROUTE),
+                str(status_code),
+            ).observe(time.perf_counter() - started)
+
+
+class _CeleryQueueCollector:
+    """
+    Largo de las colas de Celery leído al scrapear
+
+    Se expone como GaugeMetricFamily de un collector propio y no como Gauge:
+    con PROMETHEUS_MULTIPROC_DIR un Gauge del cliente también escribe en los
+    archivos mmap y MultiProcessCollector duplicaría la familia.
+    """
+
+    def __init__(self, lengths: Dict[str, int]):
+        self.lengths = lengths
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        family = GaugeMetricFamily(
+            "celery_queue_length",
+            "Mensajes pendientes en la cola de Celery",
+            labels=["queue"],
+        )
+        for queue, length in self.lengths.items():
+            family.add_metric([queue], length)
+        yield family
+
+
+async def _celery_queue_lengths() -> Dict[str, int]:
+    """Largo de cada cola de METRICS_CELERY_QUEUES en el broker (Redis)"""
+    from redis.asyncio import Redis
+
+    lengths: Dict[str, int] = {}
+    broker = Redis.from_url(settings.CELERY_BROKER_URL, socket_timeout=1, socket_connect_timeout=1)
+    try:
+        for queue in settings.METRICS_CELERY_QUEUES:
+            lengths[queue] = await broker.llen(queue)
+    except Exception as exc:
+        logger.warning(f"[Metrics] No se pudo leer colas de Celery: {exc}")
+    finally:
+        await broker.aclose()
+    return lengths
+
+
+async def render_metrics() -> tuple[bytes, str]:
+    """
+    Serializar todas las métricas en formato de texto Prometheus
+
+    Returns:
+        Tuple (payload, content_type)
+    """
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    scrape_registry = CollectorRegistry()
+    scrape_registry.register(_CeleryQueueCollector(await _celery_queue_lengths()))
+
+    return generate_latest(registry) + generate_latest(scrape_registry), CONTENT_TYPE_LATEST
@@ -2,12 +2,15 @@
 from minio import Minio
 from minio.error import S3Error
 from app.core.config import settings
+from app.core.metrics import MINIO_BYTES, track_minio
+from contextlib import contextmanager
 from datetime import timedelta
+from typing import Any, Iterator
 import io
 import json
 
 
-KNOWN_BUCKETS = ["documentos", "evidencias", "reportes", "avatars"]
+KNOWN_BUCKETS = ["documentos", "evidencias", "reportes", "avatars", "bitacora"]
 
 # Política de lectura pública para el bucket avatars
 _PUBLIC_READ_POLICY = json.dumps({
@@ -46,7 +49,7 @@ class MinIOClient:
     
     def _ensure_buckets(self):
         """Crear buckets necesarios si no existen"""
-        buckets = ["documentos", "evidencias", "reportes"]
+        buckets = ["documentos", "evidencias", "reportes", "bitacora"]
         for bucket in buckets:
             try:
                 if not self.client.bucket_exists(bucket):
@@ -71,7 +74,9 @@ class MinIOClient:
         ext = ext_map.get(content_type, "jpg")
         object_name = f"avatar_{user_id}.{ext}"
         data_stream = io.BytesIO(data)
-        self.client.put_object("avatars", object_name, data_stream, length=len(data), content_type=content_type)
+        with track_minio("put", "avatars"):
+            self.client.put_object("avatars", object_name, data_stream, length=len(data), content_type=content_type)
+        MINIO_BYTES.labels("put", "avatars").inc(len(data))
         # URL directa pública: http(s)://<external_endpoint>/avatars/<object>
         scheme = "https" if settings.MINIO_USE_SSL else "http"
         return f"{scheme}://{settings.MINIO_EXTERNAL_ENDPOINT}/avatars/{object_name}"
@@ -81,18 +86,33 @@ class MinIOClient:
         """Subir un archivo a MinIO"""
         try:
             data_stream = io.BytesIO(data)
-            self.client.put_object(
-                bucket_name,
-                object_name,
-                data_stream,
-                length=len(data),
-                content_type=content_type
-            )
+            with track_minio("put", bucket_name):
+                self.client.put_object(
+                    bucket_name,
+                    object_name,
+                    data_stream,
+                    length=len(data),
+                    content_type=content_type
+                )
+            MINIO_BYTES.labels("put", bucket_name).inc(len(data))
             return True
         except S3Error as e:
             print(f"Error al subir archivo: {e}")
             raise
     
+    def upload_stream(self, bucket_name: str, object_name: str, stream, content_type: str = "application/octet-stream"):
+        """Subir un archivo desde un stream sin cargarlo completo en memoria (multipart)"""
+        with track_minio("put", bucket_name):
+            result = self.client.put_object(
+                bucket_name,
+                object_name,
+                stream,
+                length=-1,
+                part_size=10 * 1024 * 1024,
+                content_type=content_type
+            )
+        return result
+    
     def get_presigned_url(self, bucket_name: str, object_name: str, expires: int = 3600):
         """Generar URL pre-firmada para descargar un archivo"""
         try:
@@ -107,10 +127,58 @@ class MinIOClient:
             print(f"Error al generar URL: {e}")
             raise
     
+    def get_file(self, bucket_name: str, object_name: str) -> bytes:
+        """Descargar el contenido completo de un objeto"""
+        with track_minio("get", bucket_name):
+            response = self.client.get_object(bucket_name, object_name)
+            try:
+                data = response.read()
+            finally:
+                response.close()
+                response.release_conn()
+        MINIO_BYTES.labels("get", bucket_name).inc(len(data))
+        return data
+    
+    @contextmanager
+    def open_object(self, bucket_name: str, object_name: str) -> Iterator[Any]:
+        """Abrir un objeto para leerlo en streaming (response con .read(n))"""
+        with track_minio("get", bucket_name):
+            response = self.client.get_object(bucket_name, object_name)
+        try:
+            yield response
+        finally:
+            response.close()
+            response.release_conn()
+        MINIO_BYTES.labels("get", bucket_name).inc(int(response.headers.get("content-length") or 0))
+
+    def download_to(self, bucket_name: str, object_name: str, fileobj, chunk_size: int = 1024 * 1024) -> int:
+        """Copiar un objeto a un archivo abierto por bloques; devuelve los bytes copiados"""
+        size = 0
+        with track_minio("get", bucket_name):
+            response = self.client.get_object(bucket_name, object_name)
+            try:
+                for chunk in response.stream(chunk_size):
+                    fileobj.write(chunk)
+                    size += len(chunk)
+            finally:
+                response.close()
+                response.release_conn()
+        MINIO_BYTES.labels("get", bucket_name).inc(size)
+        return size
+    
+    def list_object_names(self, bucket_name: str, prefix: str, recursive: bool = True) -> list:
+        """Listar nombres de objetos bajo un prefijo"""
+        with track_minio("list", bucket_name):
+            return [
+                obj.object_name
+                for obj in self.client.list_objects(bucket_name, prefix=prefix, recursive=recursive)
+            ]
+    
     def delete_file(self, bucket_name: str, object_name: str):
         """Eliminar un archivo de MinIO"""
         try:
-            self.client.remove_object(bucket_name, object_name)
+            with track_minio("delete", bucket_name):
+                self.client.remove_object(bucket_name, object_name)
             return True
         except S3Error as e:
             print(f"Error al eliminar archivo: {e}")
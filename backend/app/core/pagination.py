@@ -0,0 +1,150 @@
+"""
+Pagination Core
+Utilidades para paginación por cursor (keyset) y conteo de totales
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+# Modos de conteo soportados por los listados paginados
+COUNT_MODES = ("exact", "capped", "estimate", "none")
+# Patrón del parámetro `count` en los endpoints (Query(pattern=...))
+COUNT_MODE_PATTERN = f"^({'|'.join(COUNT_MODES)})$"
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """
+    Codificar cursor opaco a partir de (created_at, id)
+
+    Args:
+        created_at: Timestamp de la última fila entregada
+        row_id: ID de la última fila entregada
+
+    Returns:
+        Cursor en base64 url-safe
+    """
+    raw = json.dumps({"t": created_at.isoformat(), "i": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decodificar cursor generado por encode_cursor
+
+    Args:
+        cursor: Cursor opaco recibido del cliente
+
+    Returns:
+        Tuple (created_at, id)
+
+    Raises:
+        HTTPException 400 si el cursor es inválido
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["t"]), int(data["i"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido"
+        )
+
+
+def keyset_before(created_col, id_col, cursor: str):
+    """
+    Condición keyset para orden (created_at DESC, id DESC)
+
+    Devuelve las filas estrictamente posteriores al cursor en ese orden,
+    usando comparación de tuplas para aprovechar índices compuestos. La cota
+    simple sobre created_at permite además descartar particiones (el planner
+    no poda particiones a partir de comparaciones de tuplas).
+    """
+    created_at, row_id = decode_cursor(cursor)
+    return and_(
+        created_col <= created_at,
+        tuple_(created_col, id_col) < tuple_(created_at, row_id),
+    )
+
+
+def next_cursor_from(rows: list, page_size: int) -> Optional[str]:
+    """
+    Calcular next_cursor a partir de filas obtenidas con limit(page_size + 1)
+
+    Args:
+        rows: Filas obtenidas (objetos con created_at e id)
+        page_size: Tamaño de página solicitado
+
+    Returns:
+        Cursor de la última fila de la página o None si no hay más
+    """
+    if len(rows) <= page_size:
+        return None
+    last = rows[page_size - 1]
+    return encode_cursor(last.created_at, last.id)
+
+
+async def count_rows(
+    db: AsyncSession,
+    model: Any,
+    where: Any,
+    mode: str = "exact",
+    cap: int = 10000,
+    has_filters: bool = True,
+) -> Tuple[Optional[int], bool]:
+    """
+    Contar filas de un listado según el modo solicitado
+
+    Modos:
+        exact: COUNT(*) completo sobre el filtro
+        capped: COUNT(*) limitado a `cap` filas (total = cap si hay más)
+        estimate: estadística del planner (pg_class.reltuples, incluyendo
+            particiones) cuando no hay filtros; con filtros se comporta
+            como capped
+        none: no contar
+
+    Args:
+        db: Database session
+        model: Modelo SQLAlchemy
+        where: Condición WHERE ya construida
+        mode: Modo de conteo
+        cap: Límite para modo capped
+        has_filters: Si la condición WHERE filtra algo
+
+    Returns:
+        Tuple (total, is_exact)
+    """
+    if mode == "none":
+        return None, False
+
+    if mode == "estimate" and not has_filters:
+        # Suma la tabla y sus particiones (el padre particionado no tiene filas)
+        result = await db.execute(
+            text("""
+                SELECT sum(c.reltuples) FILTER (WHERE c.reltuples > 0)
+                FROM pg_class c
+                WHERE c.oid = to_regclass(:name)
+                   OR c.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(:name))
+            """),
+            {"name": model.__tablename__}
+        )
+        estimate = result.scalar_one_or_none() or 0
+        return max(int(estimate), 0), False
+
+    if mode in ("capped", "estimate"):
+        limited = select(model.id).where(where).limit(cap + 1).subquery()
+        result = await db.execute(select(func.count()).select_from(limited))
+        counted = result.scalar_one()
+        if counted > cap:
+            return cap, False
+        return counted, True
+
+    result = await db.execute(select(func.count()).select_from(model).where(where))
+    return result.scalar_one(), True
+
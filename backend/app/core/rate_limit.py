@@ -0,0 +1,219 @@
+"""
+Rate Limiting Core
+Token bucket distribuido en Redis, por usuario y por tenant (cuota de la
+licencia), con límites estrictos por IP para /auth/login
+"""
+import ipaddress
+import json
+import logging
+from typing import List, Optional, Tuple
+
+from app.core.authentication import PRINCIPAL_SCOPE_KEY
+from app.core.config import settings
+from app.core.redis_client import redis_client
+from app.core.tenant_cache import tenant_cache
+
+logger = logging.getLogger(__name__)
+
+# Consume un token de todos los buckets o de ninguno (atómico en Redis).
+# KEYS: buckets; ARGV: capacidad por bucket (mismo orden). La recarga es
+# capacidad/minuto y el reloj es el del servidor Redis (TIME), común a
+# todos los workers.
+_TOKEN_BUCKET_LUA = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local tokens = {}
+local allowed = 1
+local retry_ms = 0
+local remaining = -1
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i])
+    local rate = capacity / 60000
+    local data = redis.call('HMGET', key, 't', 'ts')
+    local t = tonumber(data[1]) or capacity
+    local ts = tonumber(data[2]) or now
+    t = math.min(capacity, t + math.max(0, now - ts) * rate)
+    tokens[i] = t
+    if t < 1 then
+        allowed = 0
+        retry_ms = math.max(retry_ms, math.ceil((1 - t) / rate))
+    end
+end
+for i, key in ipairs(KEYS) do
+    local t = tokens[i]
+    if allowed == 1 then
+        t = t - 1
+    end
+    redis.call('HSET', key, 't', t, 'ts', now)
+    redis.call('PEXPIRE', key, 61000)
+    if remaining < 0 or t < remaining then
+        remaining = math.floor(t)
+    end
+end
+return {allowed, remaining, retry_ms}
+"""
+
+_token_bucket = redis_client.register_script(_TOKEN_BUCKET_LUA)
+
+LOGIN_PATH = f"{settings.API_V1_PREFIX}/auth/login"
+
+# Rutas de sistema sin límite
+_EXEMPT_PATHS = {"/", "/health", "/health/live", "/health/ready", "/metrics", "/docs", "/redoc", "/openapi.json"}
+
+
+async def _tenant_quota(tenant_id: int) -> int:
+    """Requests/minuto permitidos al tenant según su licencia (cache de tenants)"""
+    descriptor = await tenant_cache.get(tenant_id)
+    if descriptor and descriptor.rate_limit_per_minute:
+        return descriptor.rate_limit_per_minute
+    return settings.RATE_LIMIT_TENANT_PER_MINUTE
+
+
+def _parse_networks(value: str) -> List[ipaddress._BaseNetwork]:
+    networks = []
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        try:
+            networks.append(ipaddress.ip_network(item, strict=False))
+        except ValueError:
+            logger.warning(f"[RateLimit] TRUSTED_PROXY_IPS inválido: {item}")
+    return networks
+
+
+_TRUSTED_PROXIES = _parse_networks(settings.TRUSTED_PROXY_IPS)
+
+
+def _is_trusted_proxy(ip: str) -> bool:
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return False
+    return any(address in network for network in _TRUSTED_PROXIES)
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _client_ip(scope) -> str:
+    """
+    IP del cliente para los buckets por IP
+
+    Detrás de infra/nginx la conexión llega desde el proxy: si el par es un
+    proxy de confianza (TRUSTED_PROXY_IPS) se toma la primera IP no confiable
+    de X-Forwarded-For leyendo de derecha a izquierda (las de la izquierda
+    las controla el cliente), o X-Real-IP. Sin proxy de confianza los
+    encabezados se ignoran.
+    """
+    client = scope.get("client")
+    ip = client[0] if client else None
+    if ip is None:
+        return "unknown"
+    if not _is_trusted_proxy(ip):
+        return ip
+
+    forwarded_for = _header(scope, b"x-forwarded-for")
+    if forwarded_for:
+        hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+        for hop in reversed(hops):
+            if not _is_trusted_proxy(hop):
+                return hop
+        if hops:
+            return hops[0]
+    return _header(scope, b"x-real-ip") or ip
+
+
+async def _buckets_for(scope) -> List[Tuple[str, int]]:
+    """Buckets (llave, capacidad por minuto) que aplican al request"""
+    if scope["path"] == LOGIN_PATH:
+        return [(f"rl:login:{_client_ip(scope)}", settings.RATE_LIMIT_LOGIN_PER_MINUTE)]
+
+    principal = scope.get(PRINCIPAL_SCOPE_KEY)
+    if principal is None:
+        return [(f"rl:ip:{_client_ip(scope)}", settings.RATE_LIMIT_PER_MINUTE)]
+
+    buckets = [(f"rl:user:{principal.user_id}", settings.RATE_LIMIT_PER_MINUTE)]
+    if principal.tenant_id is not None:
+        quota = await _tenant_quota(principal.tenant_id)
+        buckets.append((f"rl:tenant:{principal.tenant_id}", quota))
+    return buckets
+
+
+async def consume(buckets: List[Tuple[str, int]]) -> Tuple[bool, int, int]:
+    """
+    Consumir un token de cada bucket
+
+    Args:
+        buckets: Lista de (llave, capacidad por minuto)
+
+    Returns:
+        Tuple (permitido, tokens restantes del bucket más bajo, ms para reintentar)
+    """
+    allowed, remaining, retry_ms = await _token_bucket(
+        keys=[key for key, _ in buckets],
+        args=[limit for _, limit in buckets],
+    )
+    return bool(allowed), int(remaining), int(retry_ms)
+
+
+class RateLimitMiddleware:
+    """
+    Aplica los buckets de rate limiting antes de llegar al router
+
+    Debe quedar dentro de AuthenticationMiddleware (usa scope["principal"]).
+    Si Redis no responde el request pasa (fail-open).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or scope["path"] in _EXEMPT_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            buckets = await _buckets_for(scope)
+            allowed, remaining, retry_ms = await consume(buckets)
+        except Exception as exc:
+            logger.warning(f"[RateLimit] Sin verificación de límite: {exc}")
+            await self.app(scope, receive, send)
+            return
+
+        limit = min(capacity for _, capacity in buckets)
+        rate_headers = [
+            (b"x-ratelimit-limit", str(limit).encode()),
+            (b"x-ratelimit-remaining", str(max(remaining, 0)).encode()),
+        ]
+
+        if not allowed:
+            retry_after = max(1, -(-retry_ms // 1000))
+            body = json.dumps({"detail": "Demasiadas solicitudes. Intente más tarde."}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(retry_after).encode()),
+                    *rate_headers,
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + rate_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
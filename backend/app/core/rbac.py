@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
 from app.core.tenant import get_current_tenant_id
+from app.core.tenant_cache import tenant_cache
 
 
 class PermissionChecker:
@@ -191,23 +192,16 @@ async def check_module_enabled_for_tenant(
     Args:
         module_key: Clave del módulo
         tenant_id: Tenant ID
-        db: Database session
+        db: Database session (sólo se usa si el tenant no está en cache)
         
     Returns:
         True si módulo está habilitado
     """
-    from app.models.license import License
-    
-    result = await db.execute(
-        select(License).where(License.tenant_id == tenant_id)
-    )
-    license = result.scalar_one_or_none()
-    
-    if not license:
+    descriptor = await tenant_cache.get(tenant_id, db)
+    if not descriptor or not descriptor.has_license:
         return False
     
-    # enabled_modules es un JSON array
-    return module_key in (license.enabled_modules or [])
+    return module_key in descriptor.enabled_modules
 
 
 def require_permission(module_key: str, action: str):
@@ -0,0 +1,32 @@
+"""Redis Client Configuration"""
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+
+# Cliente async compartido (el pool de conexiones es interno a redis-py)
+redis_client: Redis = Redis.from_url(
+    settings.REDIS_URL,
+    decode_responses=True,
+    socket_timeout=2,
+    socket_connect_timeout=2,
+    health_check_interval=30,
+)
+
+
+def create_pubsub_client() -> Redis:
+    """
+    Cliente para suscripciones pub/sub (sin socket_timeout: una suscripción
+    puede pasar mucho tiempo sin mensajes)
+    """
+    return Redis.from_url(
+        settings.REDIS_URL,
+        decode_responses=True,
+        socket_connect_timeout=2,
+        health_check_interval=30,
+    )
+
+
+async def close_redis() -> None:
+    """Cerrar conexiones de Redis al shutdown"""
+    await redis_client.aclose()
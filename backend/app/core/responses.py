@@ -0,0 +1,57 @@
+"""
+Responses Core
+Serialización JSON rápida: modelos Pydantic v2 vía model_dump_json
+(pydantic-core) y el resto vía orjson, sin el paso por jsonable_encoder
+"""
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """Tipos que orjson no serializa por sí solo"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True)
+    if isinstance(value, Decimal):
+        # Mismo criterio que jsonable_encoder
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, bytes):
+        return value.decode()
+    raise TypeError(f"Tipo no serializable a JSON: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serializar a JSON (bytes UTF-8)
+
+    Args:
+        content: Modelo Pydantic o estructura de tipos JSON/orjson
+
+    Returns:
+        JSON codificado
+    """
+    if isinstance(content, BaseModel):
+        return content.model_dump_json(by_alias=True).encode()
+    return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Response JSON por defecto del API
+
+    Con response_model FastAPI entrega aquí el contenido ya convertido a
+    tipos JSON y solo se ahorra json.dumps. Los endpoints con respuestas
+    grandes pueden devolver `FastJSONResponse(modelo)` directamente: FastAPI
+    no revalida ni reconvierte un Response y el modelo se serializa en una
+    sola pasada en Rust.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
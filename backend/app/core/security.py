@@ -1,6 +1,7 @@
 """
 Security Core - JWT, Password Hashing, Token Management
 """
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Any, Dict
 from jose import JWTError, jwt
@@ -8,6 +9,7 @@ from passlib.context import CryptContext
 from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError
 import secrets
+import time
 
 from app.core.config import settings
 
@@ -160,26 +162,49 @@ def create_refresh_token(
     return encoded_jwt
 
 
+# Access tokens verificados recientemente (token -> payload). Evita repetir
+# la verificación HMAC para tokens calientes; la expiración se revisa igual.
+# Los refresh tokens (larga vida, un uso por renovación) no se guardan.
+_VERIFIED_TOKENS_MAX = 1024
+_verified_tokens: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+
 def decode_token(token: str) -> Dict[str, Any] | None:
     """
     Decodificar y validar JWT token
     
+    Los access tokens ya verificados se sirven desde un LRU en memoria
+    mientras no expiren; el token completo (incluida la firma) es la llave.
+    
     Args:
         token: JWT token
         
     Returns:
         Payload dict o None si es inválido
     """
+    payload = _verified_tokens.get(token)
+    if payload is not None:
+        if payload.get("exp", 0) > time.time():
+            _verified_tokens.move_to_end(token)
+            return dict(payload)
+        _verified_tokens.pop(token, None)
+        return None
+
     try:
         payload = jwt.decode(
             token,
             settings.SECRET_KEY,
             algorithms=[settings.ALGORITHM]
         )
-        return payload
     except JWTError:
         return None
 
+    if "exp" in payload and payload.get("type") == "access":
+        _verified_tokens[token] = payload
+        if len(_verified_tokens) > _VERIFIED_TOKENS_MAX:
+            _verified_tokens.popitem(last=False)
+    return dict(payload)
+
 
 def validate_password_strength(password: str) -> tuple[bool, str]:
     """
@@ -5,9 +5,10 @@ Middleware y utilities para tenant scoping
 from typing import Optional
 from contextvars import ContextVar
 from fastapi import Request, HTTPException, status
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.tenant_cache import tenant_cache
+
 # Context variable para almacenar tenant_id actual
 _tenant_context: ContextVar[Optional[int]] = ContextVar("tenant_id", default=None)
 
@@ -76,50 +77,36 @@ async def extract_tenant_from_request(request: Request) -> Optional[str]:
 
 async def resolve_tenant_id(
     tenant_identifier: str,
-    db: AsyncSession
+    db: AsyncSession | None = None
 ) -> int | None:
     """
     Resolver tenant_id desde identifier (subdomain o ID)
     
+    Usa el cache de descriptores: sin queries mientras la entrada esté vigente.
+    
     Args:
         tenant_identifier: Subdomain o tenant ID
-        db: Database session
+        db: Database session (sólo se usa si hay que cargar el tenant)
         
     Returns:
-        Tenant ID o None si no existe
+        Tenant ID o None si no existe o no está activo
     """
-    from app.models.tenant import Tenant
-    
     # Si es número, asumir que es ID directo
     if tenant_identifier.isdigit():
-        tenant_id = int(tenant_identifier)
-        result = await db.execute(
-            select(Tenant).where(
-                Tenant.id == tenant_id,
-                Tenant.status == "active"
-            )
-        )
-        tenant = result.scalar_one_or_none()
-        return tenant.id if tenant else None
-    
-    # Si no, buscar por subdomain
-    result = await db.execute(
-        select(Tenant).where(
-            Tenant.subdomain == tenant_identifier,
-            Tenant.status == "active"
-        )
-    )
-    tenant = result.scalar_one_or_none()
-    return tenant.id if tenant else None
+        descriptor = await tenant_cache.get(int(tenant_identifier), db)
+    else:
+        descriptor = await tenant_cache.get_by_subdomain(tenant_identifier, db)
+    
+    return descriptor.id if descriptor and descriptor.is_active else None
 
 
-async def validate_tenant_active(tenant_id: int, db: AsyncSession) -> bool:
+async def validate_tenant_active(tenant_id: int, db: AsyncSession | None = None) -> bool:
     """
     Validar que tenant esté activo y con licencia vigente
     
     Args:
         tenant_id: Tenant ID
-        db: Database session
+        db: Database session (sólo se usa si hay que cargar el tenant)
         
     Returns:
         True si tenant es válido
@@ -127,34 +114,23 @@ async def validate_tenant_active(tenant_id: int, db: AsyncSession) -> bool:
     Raises:
         HTTPException si tenant inactivo o licencia vencida
     """
-    from app.models.tenant import Tenant
-    from app.models.license import License
-    from datetime import datetime
-    
-    result = await db.execute(
-        select(Tenant, License).join(
-            License, Tenant.id == License.tenant_id
-        ).where(Tenant.id == tenant_id)
-    )
-    row = result.first()
-    
-    if not row:
+    descriptor = await tenant_cache.get(tenant_id, db)
+    
+    if not descriptor or not descriptor.has_license:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Tenant no encontrado"
         )
     
-    tenant, license = row
-    
     # Verificar estado del tenant
-    if tenant.status == "suspended":
+    if descriptor.status == "suspended":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Tenant suspendido. Contacte a soporte."
         )
     
     # Verificar licencia
-    if license.expires_at and license.expires_at < datetime.utcnow():
+    if descriptor.license_expired:
         raise HTTPException(
             status_code=status.HTTP_402_PAYMENT_REQUIRED,
             detail="Licencia vencida. Renueve su suscripción."
@@ -0,0 +1,195 @@
+"""
+Tenant Cache
+Descriptor de tenant + licencia cacheado en proceso, con TTL e
+invalidación entre workers vía Redis pub/sub
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.redis_client import create_pubsub_client, redis_client
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "tenant-cache:invalidate"
+_ALL = "*"
+
+
+@dataclass(frozen=True)
+class TenantDescriptor:
+    """Datos del tenant necesarios para resolver y autorizar requests"""
+    id: int
+    name: str
+    subdomain: str
+    status: str
+    superadmin_id: Optional[int]
+    has_license: bool
+    license_expires_at: Optional[datetime]
+    enabled_modules: FrozenSet[str]
+    rate_limit_per_minute: Optional[int]
+
+    @property
+    def is_active(self) -> bool:
+        return self.status == "active"
+
+    @property
+    def license_expired(self) -> bool:
+        return self.license_expires_at is not None and self.license_expires_at < datetime.utcnow()
+
+
+async def _load_descriptor(
+    db: AsyncSession,
+    tenant_id: Optional[int] = None,
+    subdomain: Optional[str] = None,
+) -> Optional[TenantDescriptor]:
+    from app.models.license import License
+    from app.models.tenant import Tenant
+
+    query = select(Tenant, License).outerjoin(License, License.tenant_id == Tenant.id)
+    if tenant_id is not None:
+        query = query.where(Tenant.id == tenant_id)
+    else:
+        query = query.where(Tenant.subdomain == subdomain)
+    row = (await db.execute(query)).first()
+    if row is None:
+        return None
+
+    tenant, license = row
+    return TenantDescriptor(
+        id=tenant.id,
+        name=tenant.name,
+        subdomain=tenant.subdomain,
+        status=tenant.status.value if hasattr(tenant.status, "value") else str(tenant.status),
+        superadmin_id=tenant.superadmin_id,
+        has_license=license is not None,
+        license_expires_at=license.expires_at if license else None,
+        enabled_modules=frozenset(license.enabled_modules or []) if license else frozenset(),
+        rate_limit_per_minute=license.rate_limit_per_minute if license else None,
+    )
+
+
+class TenantCache:
+    """
+    Cache de TenantDescriptor por id y por subdominio
+
+    Las entradas expiran tras TENANT_CACHE_TTL_SECONDS; los cambios hechos
+    desde el admin de tenants las invalidan de inmediato en todos los
+    workers (publish_invalidation + listener).
+    """
+
+    def __init__(self):
+        self._by_id: Dict[int, Tuple[TenantDescriptor, float]] = {}
+        self._subdomains: Dict[str, int] = {}
+
+    def _store(self, descriptor: TenantDescriptor) -> TenantDescriptor:
+        expires = time.monotonic() + settings.TENANT_CACHE_TTL_SECONDS
+        self._by_id[descriptor.id] = (descriptor, expires)
+        self._subdomains[descriptor.subdomain] = descriptor.id
+        return descriptor
+
+    def _cached(self, tenant_id: int) -> Optional[TenantDescriptor]:
+        entry = self._by_id.get(tenant_id)
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+        return None
+
+    async def get(self, tenant_id: int, db: Optional[AsyncSession] = None) -> Optional[TenantDescriptor]:
+        """
+        Descriptor del tenant por id
+
+        Args:
+            tenant_id: Tenant ID
+            db: Sesión a usar si hay que cargarlo (si no, se abre una propia)
+
+        Returns:
+            TenantDescriptor o None si el tenant no existe
+        """
+        descriptor = self._cached(tenant_id)
+        if descriptor is not None:
+            return descriptor
+        descriptor = await self._load(db, tenant_id=tenant_id)
+        return self._store(descriptor) if descriptor else None
+
+    async def get_by_subdomain(
+        self,
+        subdomain: str,
+        db: Optional[AsyncSession] = None,
+    ) -> Optional[TenantDescriptor]:
+        """Descriptor del tenant por subdominio"""
+        tenant_id = self._subdomains.get(subdomain)
+        if tenant_id is not None:
+            descriptor = self._cached(tenant_id)
+            if descriptor is not None and descriptor.subdomain == subdomain:
+                return descriptor
+        descriptor = await self._load(db, subdomain=subdomain)
+        return self._store(descriptor) if descriptor else None
+
+    async def _load(self, db: Optional[AsyncSession], **lookup) -> Optional[TenantDescriptor]:
+        if db is not None:
+            return await _load_descriptor(db, **lookup)
+
+        from app.db.session import AsyncSessionLocal
+
+        async with AsyncSessionLocal() as session:
+            return await _load_descriptor(session, **lookup)
+
+    def invalidate(self, tenant_id: Optional[int] = None) -> None:
+        """Descartar un tenant (o todos si tenant_id es None) de este proceso"""
+        if tenant_id is None:
+            self._by_id.clear()
+            self._subdomains.clear()
+            return
+        entry = self._by_id.pop(tenant_id, None)
+        if entry:
+            self._subdomains.pop(entry[0].subdomain, None)
+
+
+tenant_cache = TenantCache()
+
+
+async def publish_invalidation(tenant_id: Optional[int] = None) -> None:
+    """
+    Invalidar un tenant en este proceso y avisar al resto de workers
+
+    Llamar después del commit que modifica Tenant o License.
+    """
+    tenant_cache.invalidate(tenant_id)
+    try:
+        await redis_client.publish(INVALIDATION_CHANNEL, str(tenant_id) if tenant_id is not None else _ALL)
+    except Exception as exc:
+        logger.warning(f"[TenantCache] No se pudo publicar invalidación: {exc}")
+
+
+async def listen_for_invalidations() -> None:
+    """
+    Escuchar invalidaciones publicadas por otros workers (tarea de fondo)
+
+    Al (re)conectar se vacía el cache local, porque pudieron perderse
+    mensajes mientras la suscripción estaba caída.
+    """
+    client = create_pubsub_client()
+    try:
+        while True:
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(INVALIDATION_CHANNEL)
+                    tenant_cache.invalidate()
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        data = message["data"]
+                        tenant_cache.invalidate(None if data == _ALL else int(data))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(f"[TenantCache] Suscripción interrumpida: {exc}")
+                await asyncio.sleep(1)
+    finally:
+        await client.aclose()
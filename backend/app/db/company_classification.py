@@ -0,0 +1,208 @@
+"""
+Company Reclassification
+Recalcular Company.clasificacion de todo un tenant por lotes con un UPDATE
+set-based (CASE del motor de clasificación) y, opcionalmente, regenerar las
+sugerencias de CompanyClassification
+"""
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.classification import AUTO_JUSTIFICACION, clasificacion_sql, sugerir_tipo_centro_carga
+from app.core.config import settings
+from app.models.company import Company
+from app.models.compliance import CompanyClassification
+
+ProgressCallback = Callable[[int, int], Any]
+
+
+class ReclassifyReport:
+    """Diferencias encontradas (acotadas a RECLASSIFY_MAX_DIFFS en el reporte)"""
+
+    def __init__(self, max_diffs: int):
+        self.max_diffs = max_diffs
+        self.companies = 0
+        self.clasificacion_changed = 0
+        self.classifications_created = 0
+        self.classifications_updated = 0
+        self.classifications_kept = 0
+        self.diffs: List[Dict[str, Any]] = []
+        self.truncated = False
+        self.changed_ids: Set[int] = set()
+
+    def diff(self, company_id: int, field: str, old: Any, new: Any) -> None:
+        self.changed_ids.add(company_id)
+        if len(self.diffs) < self.max_diffs:
+            self.diffs.append({"company_id": company_id, "field": field, "old": old, "new": new})
+        else:
+            self.truncated = True
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "companies": self.companies,
+            "clasificacion_changed": self.clasificacion_changed,
+            "classifications_created": self.classifications_created,
+            "classifications_updated": self.classifications_updated,
+            "classifications_kept": self.classifications_kept,
+            "diffs": self.diffs,
+            "diffs_truncated": self.truncated,
+        }
+
+
+def _plain(value: Any) -> Any:
+    return value.value if hasattr(value, "value") else value
+
+
+async def _reclassify_range(
+    db: AsyncSession,
+    tenant_id: int,
+    after_id: int,
+    last_id: int,
+    dry_run: bool,
+) -> List[Tuple[int, Optional[str], Optional[str]]]:
+    """(id, anterior, nueva) de las empresas del rango cuya clasificación cambia"""
+    new_value = clasificacion_sql()
+    in_range = and_(
+        Company.tenant_id == tenant_id,
+        Company.id > after_id,
+        Company.id <= last_id,
+        Company.clasificacion.is_distinct_from(new_value),
+    )
+    if dry_run:
+        result = await db.execute(select(Company.id, Company.clasificacion, new_value).where(in_range))
+        return [tuple(row) for row in result]
+
+    # El valor anterior sale del snapshot de la propia sentencia (FROM)
+    previous = select(Company.id, Company.clasificacion).where(in_range).subquery()
+    result = await db.execute(
+        update(Company)
+        .where(Company.id == previous.c.id)
+        .values(clasificacion=new_value)
+        .returning(Company.id, previous.c.clasificacion, Company.clasificacion)
+        .execution_options(synchronize_session=False)
+    )
+    return [tuple(row) for row in result]
+
+
+async def _regenerate_classifications(
+    db: AsyncSession,
+    tenant_id: int,
+    company_ids: List[int],
+    created_by: int,
+    dry_run: bool,
+    report: ReclassifyReport,
+) -> None:
+    """Crear o actualizar sugerencias de CompanyClassification de un lote"""
+    result = await db.execute(
+        select(
+            Company.id,
+            Company.tipo_suministro,
+            Company.tension_suministro,
+            Company.demanda_contratada_kw,
+            CompanyClassification.id.label("classification_id"),
+            CompanyClassification.tipo_centro_carga,
+            CompanyClassification.justificacion,
+        )
+        .outerjoin(CompanyClassification, CompanyClassification.company_id == Company.id)
+        .where(Company.id.in_(company_ids))
+    )
+
+    inserts = []
+    updates = []
+    for row in result:
+        suggested = sugerir_tipo_centro_carga(row._mapping)
+        if suggested is None or suggested == row.tipo_centro_carga:
+            continue
+        if row.classification_id is not None and row.justificacion != AUTO_JUSTIFICACION:
+            # Clasificación capturada por un usuario: sólo se reporta
+            report.classifications_kept += 1
+            continue
+
+        report.diff(row.id, "tipo_centro_carga", _plain(row.tipo_centro_carga), suggested.value)
+        if row.classification_id is None:
+            inserts.append({
+                "company_id": row.id,
+                "tenant_id": tenant_id,
+                "tipo_centro_carga": suggested,
+                "justificacion": AUTO_JUSTIFICACION,
+                "created_by": created_by,
+            })
+        else:
+            updates.append({"id": row.classification_id, "tipo_centro_carga": suggested})
+
+    report.classifications_created += len(inserts)
+    report.classifications_updated += len(updates)
+    if dry_run:
+        return
+    if inserts:
+        # Una alta concurrente desde la API gana sobre la sugerencia
+        await db.execute(
+            pg_insert(CompanyClassification).on_conflict_do_nothing(index_elements=["company_id"]),
+            inserts,
+        )
+    if updates:
+        await db.execute(update(CompanyClassification), updates)
+
+
+async def reclassify_companies(
+    db: AsyncSession,
+    tenant_id: int,
+    created_by: int,
+    regenerate_classifications: bool = False,
+    dry_run: bool = False,
+    progress: Optional[ProgressCallback] = None,
+) -> Tuple[Dict[str, Any], Set[int]]:
+    """
+    Recalcular la clasificación de todas las empresas de un tenant
+
+    Recorre las empresas por rangos de id de JOB_CHUNK_SIZE; cada rango es un
+    solo UPDATE con la expresión CASE del motor (sólo filas que cambian) y un
+    commit. Con regenerate_classifications también se crean las
+    CompanyClassification faltantes y se actualizan las generadas por el
+    motor; las capturadas por usuarios no se tocan.
+
+    Args:
+        db: Sesión
+        tenant_id: Tenant a recalcular
+        created_by: Usuario que lanza el recálculo (autor de las sugerencias)
+        regenerate_classifications: Regenerar también CompanyClassification
+        dry_run: Sólo reportar diferencias, sin escribir
+        progress: Callback (empresas procesadas, total) tras cada lote
+
+    Returns:
+        Tuple (reporte con conteos y diferencias, ids de empresas modificadas)
+    """
+    report = ReclassifyReport(settings.RECLASSIFY_MAX_DIFFS)
+    total = (await db.execute(
+        select(func.count()).select_from(Company).where(Company.tenant_id == tenant_id)
+    )).scalar_one()
+
+    after_id = 0
+    while True:
+        result = await db.execute(
+            select(Company.id).where(
+                and_(Company.tenant_id == tenant_id, Company.id > after_id)
+            ).order_by(Company.id).limit(settings.JOB_CHUNK_SIZE)
+        )
+        company_ids = list(result.scalars().all())
+        if not company_ids:
+            break
+
+        changes = await _reclassify_range(db, tenant_id, after_id, company_ids[-1], dry_run)
+        report.clasificacion_changed += len(changes)
+        for company_id, old, new in changes:
+            report.diff(company_id, "clasificacion", old, new)
+
+        if regenerate_classifications:
+            await _regenerate_classifications(db, tenant_id, company_ids, created_by, dry_run, report)
+
+        if not dry_run:
+            await db.commit()
+        report.companies += len(company_ids)
+        after_id = company_ids[-1]
+        if progress:
+            progress(report.companies, max(total, report.companies))
+
+    return report.as_dict(), set() if dry_run else report.changed_ids
@@ -0,0 +1,243 @@
+"""
+Partition Management
+Particionamiento mensual por rango (created_at) para tablas de alto volumen
+"""
+import re
+from datetime import date, datetime
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+def month_start(value: date) -> date:
+    """Primer día del mes de `value`"""
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    """Sumar meses a una fecha normalizada al día 1"""
+    index = value.year * 12 + (value.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Nombre de la partición mensual, ej: audit_logs_p2026_03"""
+    return f"{table}_p{month.year:04d}_{month.month:02d}"
+
+
+def _parse_partition_month(table: str, name: str) -> date | None:
+    match = re.fullmatch(rf"{re.escape(table)}_p(\d{{4}})_(\d{{2}})", name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+async def list_partitions(conn: AsyncConnection, table: str) -> List[str]:
+    """
+    Listar particiones adjuntas a una tabla particionada
+
+    Args:
+        conn: Conexión async
+        table: Nombre de la tabla padre
+
+    Returns:
+        Nombres de las particiones
+    """
+    result = await conn.execute(
+        text("""
+            SELECT child.relname
+            FROM pg_inherits i
+            JOIN pg_class parent ON parent.oid = i.inhparent
+            JOIN pg_class child ON child.oid = i.inhrelid
+            WHERE parent.relname = :table
+        """),
+        {"table": table}
+    )
+    return [row[0] for row in result]
+
+
+def default_partition_name(table: str) -> str:
+    """Nombre de la partición DEFAULT, ej: audit_logs_default"""
+    return f"{table}_default"
+
+
+async def drain_default_partition(conn: AsyncConnection, table: str) -> List[str]:
+    """
+    Mover a particiones mensuales las filas caídas en la partición DEFAULT
+
+    Filas con created_at sin partición (job de Beat atrasado, timestamps
+    futuros o retroactivos) van a DEFAULT, y mientras sigan ahí no se puede
+    crear la partición de su mes. Se desadjunta DEFAULT, se crea la
+    partición de cada mes presente, se mueven sus filas y se vuelve a
+    adjuntar. El DETACH bloquea la tabla padre hasta el commit, así que no
+    entran filas nuevas a DEFAULT a mitad del proceso.
+
+    Args:
+        conn: Conexión async (dentro de una transacción)
+        table: Tabla padre particionada por RANGE (created_at)
+
+    Returns:
+        Nombres de las particiones creadas
+    """
+    default = default_partition_name(table)
+    if default not in await list_partitions(conn, table):
+        return []
+    result = await conn.execute(text(
+        "SELECT DISTINCT date_trunc('month', created_at)::date "
+        f'FROM "{default}"'
+    ))
+    months = sorted(row[0] for row in result)
+    if not months:
+        return []
+
+    await conn.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{default}"'))
+    created = []
+    for start in months:
+        end = add_months(start, 1)
+        name = partition_name(table, start)
+        await conn.execute(text(
+            f'CREATE TABLE "{name}" PARTITION OF "{table}" '
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+        await conn.execute(
+            text(
+                f'WITH moved AS (DELETE FROM "{default}" '
+                f"WHERE created_at >= :start AND created_at < :end RETURNING *) "
+                f'INSERT INTO "{table}" SELECT * FROM moved'
+            ),
+            {
+                "start": datetime.combine(start, datetime.min.time()),
+                "end": datetime.combine(end, datetime.min.time()),
+            }
+        )
+        created.append(name)
+    await conn.execute(text(f'ALTER TABLE "{table}" ATTACH PARTITION "{default}" DEFAULT'))
+    return created
+
+
+async def ensure_monthly_partitions(
+    conn: AsyncConnection,
+    table: str,
+    months_ahead: int,
+    today: date | None = None,
+) -> List[str]:
+    """
+    Crear particiones mensuales faltantes desde el mes actual hasta
+    `months_ahead` meses en el futuro
+
+    Antes vacía la partición DEFAULT (drain_default_partition): con filas
+    del mes en DEFAULT, CREATE TABLE ... PARTITION OF fallaría.
+
+    Args:
+        conn: Conexión async (dentro de una transacción)
+        table: Tabla padre particionada por RANGE (created_at)
+        months_ahead: Meses futuros a pre-crear
+        today: Fecha de referencia (default: hoy)
+
+    Returns:
+        Nombres de las particiones creadas
+    """
+    created = await drain_default_partition(conn, table)
+    existing = set(await list_partitions(conn, table))
+    current = month_start(today or date.today())
+
+    for offset in range(months_ahead + 1):
+        start = add_months(current, offset)
+        name = partition_name(table, start)
+        if name in existing:
+            continue
+        end = add_months(start, 1)
+        await conn.execute(text(
+            f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+        created.append(name)
+    return created
+
+
+async def partitions_before(
+    conn: AsyncConnection,
+    table: str,
+    cutoff: date,
+) -> List[str]:
+    """
+    Particiones adjuntas cuyos meses son completamente anteriores a `cutoff`
+
+    Args:
+        conn: Conexión async
+        table: Tabla padre particionada
+        cutoff: Fecha de corte
+
+    Returns:
+        Nombres de las particiones, ordenadas por mes
+    """
+    cutoff_month = month_start(cutoff)
+    names = []
+    for name in sorted(await list_partitions(conn, table)):
+        month = _parse_partition_month(table, name)
+        if month is not None and add_months(month, 1) <= cutoff_month:
+            names.append(name)
+    return names
+
+
+async def detach_partitions_before(
+    conn: AsyncConnection,
+    table: str,
+    cutoff: date,
+) -> List[str]:
+    """
+    Desadjuntar particiones mensuales que terminan antes de `cutoff`
+
+    Las particiones desadjuntadas quedan como tablas independientes para ser
+    archivadas y eliminadas (DROP TABLE) sin tocar la tabla viva.
+
+    Args:
+        conn: Conexión async (dentro de una transacción)
+        table: Tabla padre particionada
+        cutoff: Fecha de corte; se desadjuntan meses completamente anteriores
+
+    Returns:
+        Nombres de las particiones desadjuntadas
+    """
+    detached = await partitions_before(conn, table, cutoff)
+    for name in detached:
+        await conn.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+    return detached
+
+
+async def drop_partition(conn: AsyncConnection, table: str, name: str) -> None:
+    """
+    Desadjuntar (si sigue adjunta) y eliminar una partición mensual
+
+    Args:
+        conn: Conexión async (dentro de una transacción)
+        table: Tabla padre particionada
+        name: Nombre de la partición
+    """
+    if name in await list_partitions(conn, table):
+        await conn.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+    await conn.execute(text(f'DROP TABLE "{name}"'))
+
+
+async def list_detached_partitions(conn: AsyncConnection, table: str) -> List[str]:
+    """
+    Listar tablas con nombre de partición mensual que ya no están adjuntas
+
+    Args:
+        conn: Conexión async
+        table: Tabla padre particionada
+
+    Returns:
+        Nombres de tablas desadjuntadas, ordenadas por mes
+    """
+    attached = set(await list_partitions(conn, table))
+    result = await conn.execute(
+        text("SELECT tablename FROM pg_tables WHERE tablename LIKE :pattern"),
+        {"pattern": f"{table}\\_p%"}
+    )
+    names = [
+        row[0] for row in result
+        if row[0] not in attached and _parse_partition_month(table, row[0]) is not None
+    ]
+    return sorted(names)
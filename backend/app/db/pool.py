@@ -0,0 +1,181 @@
+"""
+Database Pool
+Configuración del pool de conexiones y telemetría de uso
+"""
+import time
+import uuid
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import settings
+from app.core.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_INVALIDATIONS,
+    DB_POOL_OVERFLOW_EVENTS,
+    DB_POOL_TIMEOUTS,
+    DB_POOL_WAIT,
+)
+
+
+class PoolStats:
+    """Contadores acumulados del pool (por proceso)"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.overflow_events = 0
+        self.timeouts = 0
+        self.invalidations = 0
+        self.connections_created = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += seconds
+        if seconds > self.wait_seconds_max:
+            self.wait_seconds_max = seconds
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Pool async que mide el tiempo de espera por conexión
+
+    Sólo envuelve connect(), la API pública con la que el engine pide una
+    conexión (incluye la espera por DATABASE_POOL_TIMEOUT); el resto de la
+    telemetría sale de los eventos del pool (ver instrument_engine).
+    """
+
+    role = "primary"
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            self.stats.timeouts += 1
+            DB_POOL_TIMEOUTS.labels(self.role).inc()
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.stats.record_wait(waited)
+            DB_POOL_WAIT.labels(self.role).observe(waited)
+
+    def recreate(self):
+        # engine.dispose() recrea el pool; rol y contadores se conservan
+        pool = super().recreate()
+        pool.role = self.role
+        pool.stats = self.stats
+        return pool
+
+
+def instrument_engine(engine: AsyncEngine, role: str) -> None:
+    """
+    Registrar la telemetría del pool de un engine con eventos públicos
+
+    checkout/checkin llevan las conexiones en uso, connect cuenta conexiones
+    nuevas (overflow si el pool ya está por encima de DATABASE_POOL_SIZE) e
+    invalidate las conexiones descartadas. Los eventos se registran en el
+    engine, así que sobreviven a engine.dispose().
+
+    Args:
+        engine: Engine async con InstrumentedQueuePool
+        role: Etiqueta de las métricas ("primary" o "replica")
+    """
+    sync_engine = engine.sync_engine
+    sync_engine.pool.role = role
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKED_OUT.labels(role).inc()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.labels(role).dec()
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        pool = sync_engine.pool
+        pool.stats.connections_created += 1
+        if pool.overflow() > 0:
+            pool.stats.overflow_events += 1
+            DB_POOL_OVERFLOW_EVENTS.labels(role).inc()
+
+    @event.listens_for(sync_engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        sync_engine.pool.stats.invalidations += 1
+        DB_POOL_INVALIDATIONS.labels(role).inc()
+
+
+def asyncpg_connect_args() -> Dict[str, Any]:
+    """
+    Argumentos de conexión para asyncpg
+
+    En modo PgBouncer (pool_mode=transaction) los prepared statements no
+    sobreviven entre transacciones: se desactivan ambos caches y se usan
+    nombres únicos para evitar colisiones entre backends.
+    """
+    if settings.DATABASE_PGBOUNCER:
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    return {
+        "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+    }
+
+
+def engine_options() -> Dict[str, Any]:
+    """Opciones de create_async_engine para el engine del API"""
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+        "pool_pre_ping": True,  # Verificar conexiones antes de usar
+        "echo": settings.DATABASE_ECHO,
+        "connect_args": asyncpg_connect_args(),
+    }
+
+
+def pool_status(pool: Any) -> Dict[str, Any]:
+    """
+    Snapshot del estado del pool
+
+    Args:
+        pool: Pool del engine (engine.pool)
+
+    Returns:
+        Dict con ocupación actual y contadores acumulados
+    """
+    status = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "timeout_seconds": settings.DATABASE_POOL_TIMEOUT,
+    }
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update({
+            "checkouts": stats.checkouts,
+            "overflow_events": stats.overflow_events,
+            "timeouts": stats.timeouts,
+            "invalidations": stats.invalidations,
+            "connections_created": stats.connections_created,
+            "wait_seconds_total": round(stats.wait_seconds_total, 6),
+            "wait_seconds_avg": round(stats.wait_seconds_total / stats.checkouts, 6) if stats.checkouts else 0.0,
+            "wait_seconds_max": round(stats.wait_seconds_max, 6),
+        })
+    return status
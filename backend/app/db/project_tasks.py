@@ -0,0 +1,300 @@
+"""
+Project Task Generation
+Generación y clonación de tareas de proyecto con sentencias set-based
+(INSERT ... SELECT y executemany), sin un objeto ORM por tarea
+"""
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+from sqlalchemy import Integer, String, and_, cast, column, func, insert, literal, null, select, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.compliance import ComplianceRequirement, ComplianceRule
+from app.models.project import Project, ProjectTask, TaskEvidence, TaskStatus, TaskType
+
+
+async def insert_obligation_tasks(
+    db: AsyncSession,
+    project_id: int,
+    tipo_centro_carga: Any,
+    created_by: int,
+    requirement_ids: Optional[Sequence[int]] = None,
+    start_sort_order: int = 0,
+) -> int:
+    """
+    Crear las tareas de obligación aplicables con un solo INSERT ... SELECT
+
+    Args:
+        db: Sesión
+        project_id: Proyecto destino
+        tipo_centro_carga: Clasificación de la empresa (enum o str)
+        created_by: Usuario que crea el proyecto
+        requirement_ids: Limitar a estos requerimientos (None = todos los aplicables)
+        start_sort_order: sort_order de la primera tarea
+
+    Returns:
+        Número de tareas creadas
+    """
+    tipo = tipo_centro_carga.value if hasattr(tipo_centro_carga, "value") else str(tipo_centro_carga)
+
+    conditions = [
+        cast(ComplianceRule.tipo_centro_carga, String) == tipo,
+        ComplianceRule.estado_aplicabilidad != 'NO_APLICA',
+        ComplianceRequirement.is_active == True,
+    ]
+    if requirement_ids is not None:
+        conditions.append(ComplianceRequirement.id.in_(requirement_ids))
+
+    sort_order = func.row_number().over(
+        order_by=(ComplianceRequirement.orden, ComplianceRequirement.id)
+    ) + (start_sort_order - 1)
+
+    source = select(
+        literal(project_id),
+        literal(TaskType.OBLIGATION, ProjectTask.task_type.type),
+        ComplianceRequirement.id,
+        ComplianceRequirement.codigo,
+        ComplianceRequirement.nombre,
+        ComplianceRequirement.descripcion,
+        ComplianceRule.notas,
+        sort_order,
+        literal(created_by),
+    ).join(
+        ComplianceRequirement,
+        ComplianceRule.requirement_id == ComplianceRequirement.id
+    ).where(and_(*conditions))
+
+    # include_defaults: status, progreso y fechas toman los defaults del modelo
+    result = await db.execute(
+        insert(ProjectTask).from_select(
+            [
+                ProjectTask.project_id,
+                ProjectTask.task_type,
+                ProjectTask.requirement_id,
+                ProjectTask.code,
+                ProjectTask.title,
+                ProjectTask.description,
+                ProjectTask.notes,
+                ProjectTask.sort_order,
+                ProjectTask.created_by,
+            ],
+            source,
+        )
+    )
+    return result.rowcount
+
+
+async def insert_custom_tasks(
+    db: AsyncSession,
+    project_id: int,
+    custom_tasks: Iterable[Any],
+    created_by: int,
+    start_sort_order: int = 0,
+) -> int:
+    """
+    Crear tareas custom en lote (un INSERT multi-fila vía executemany)
+
+    Args:
+        custom_tasks: Objetos con code, title y description
+
+    Returns:
+        Número de tareas creadas
+    """
+    rows = [
+        {
+            "project_id": project_id,
+            "task_type": TaskType.CUSTOM,
+            "code": task.code,
+            "title": task.title,
+            "description": task.description,
+            "sort_order": start_sort_order + index,
+            "created_by": created_by,
+        }
+        for index, task in enumerate(custom_tasks)
+    ]
+    if rows:
+        await db.execute(insert(ProjectTask), rows)
+    return len(rows)
+
+
+# ----------------------------------------------------------------------------
+# Clonación de proyectos
+# ----------------------------------------------------------------------------
+
+ProgressCallback = Callable[[int, int], Any]
+
+
+async def _clone_task_chunk(
+    db: AsyncSession,
+    id_pairs: Sequence[Tuple[int, int]],
+    target_project_id: int,
+    created_by: int,
+    options: Any,
+    date_shift_days: Optional[int],
+) -> int:
+    """Copiar un lote de tareas (y sus evidencias) con IDs ya reservados"""
+    task_map = values(
+        column("old_id", Integer),
+        column("new_id", Integer),
+        name="task_map",
+    ).data(list(id_pairs))
+
+    due_date = ProjectTask.due_date
+    if date_shift_days:
+        due_date = ProjectTask.due_date + date_shift_days
+
+    await db.execute(
+        insert(ProjectTask).from_select(
+            [
+                ProjectTask.id,
+                ProjectTask.project_id,
+                ProjectTask.task_type,
+                ProjectTask.requirement_id,
+                ProjectTask.code,
+                ProjectTask.title,
+                ProjectTask.description,
+                ProjectTask.status,
+                ProjectTask.assignee_user_id,
+                ProjectTask.due_date,
+                ProjectTask.progress_percentage,
+                ProjectTask.sort_order,
+                ProjectTask.notes,
+                ProjectTask.created_by,
+            ],
+            select(
+                task_map.c.new_id,
+                literal(target_project_id),
+                ProjectTask.task_type,
+                ProjectTask.requirement_id,
+                ProjectTask.code,
+                ProjectTask.title,
+                ProjectTask.description,
+                literal(TaskStatus.NO_INICIADO, ProjectTask.status.type),
+                ProjectTask.assignee_user_id if options.include_assignees else null(),
+                due_date,
+                literal(0),
+                ProjectTask.sort_order,
+                ProjectTask.notes if options.include_notes else null(),
+                literal(created_by),
+            ).join(task_map, task_map.c.old_id == ProjectTask.id),
+        )
+    )
+
+    if not options.include_evidences:
+        return 0
+
+    # Las evidencias apuntan a los mismos objetos de storage (no se copian bytes)
+    result = await db.execute(
+        insert(TaskEvidence).from_select(
+            [
+                TaskEvidence.task_id,
+                TaskEvidence.storage_key,
+                TaskEvidence.file_url,
+                TaskEvidence.filename,
+                TaskEvidence.mime_type,
+                TaskEvidence.size_bytes,
+                TaskEvidence.evidence_type,
+                TaskEvidence.comment,
+                TaskEvidence.uploaded_by,
+                TaskEvidence.uploaded_at,
+            ],
+            select(
+                task_map.c.new_id,
+                TaskEvidence.storage_key,
+                TaskEvidence.file_url,
+                TaskEvidence.filename,
+                TaskEvidence.mime_type,
+                TaskEvidence.size_bytes,
+                TaskEvidence.evidence_type,
+                TaskEvidence.comment,
+                TaskEvidence.uploaded_by,
+                TaskEvidence.uploaded_at,
+            ).join(task_map, task_map.c.old_id == TaskEvidence.task_id),
+        )
+    )
+    return result.rowcount
+
+
+async def count_project_tasks(db: AsyncSession, project_id: int) -> int:
+    """Número de tareas de un proyecto"""
+    result = await db.execute(
+        select(func.count()).select_from(ProjectTask).where(ProjectTask.project_id == project_id)
+    )
+    return result.scalar_one()
+
+
+async def clone_project(
+    db: AsyncSession,
+    source: Project,
+    options: Any,
+    created_by: int,
+    progress: Optional[ProgressCallback] = None,
+) -> Tuple[Project, Dict[str, int]]:
+    """
+    Clonar un proyecto con sus tareas (y opcionalmente evidencias)
+
+    Las tareas se copian por lotes de JOB_CHUNK_SIZE: se reservan los IDs
+    nuevos con nextval() y cada lote es un INSERT ... SELECT de tareas y otro
+    de evidencias, unidos por el mapeo id viejo -> id nuevo. No hace commit.
+
+    Args:
+        db: Sesión
+        source: Proyecto origen (ya validado contra el tenant)
+        options: ProjectCloneRequest
+        created_by: Usuario que clona
+        progress: Callback (copiadas, total) tras cada lote
+
+    Returns:
+        Tuple (proyecto nuevo, {"tasks": n, "evidences": n})
+    """
+    # Desplazar fechas si se indica un nuevo inicio y el origen tenía uno
+    date_shift_days = None
+    if options.start_date and source.start_date:
+        date_shift_days = (options.start_date - source.start_date).days
+
+    due_date = options.due_date
+    if due_date is None and source.due_date and date_shift_days is not None:
+        due_date = source.due_date + timedelta(days=date_shift_days)
+
+    project = Project(
+        tenant_id=source.tenant_id,
+        company_id=options.company_id or source.company_id,
+        name=options.name or f"{source.name} (copia)"[:200],
+        description=source.description,
+        project_type=source.project_type,
+        priority=source.priority,
+        start_date=options.start_date,
+        due_date=due_date,
+        created_by=created_by,
+    )
+    db.add(project)
+    await db.flush()
+
+    total = await count_project_tasks(db, source.id)
+    next_task_id = func.nextval(func.pg_get_serial_sequence(ProjectTask.__tablename__, "id"))
+
+    copied = 0
+    evidences = 0
+    last_id = 0
+    while True:
+        result = await db.execute(
+            select(ProjectTask.id, next_task_id).where(
+                and_(
+                    ProjectTask.project_id == source.id,
+                    ProjectTask.id > last_id
+                )
+            ).order_by(ProjectTask.id).limit(settings.JOB_CHUNK_SIZE)
+        )
+        id_pairs = [tuple(row) for row in result]
+        if not id_pairs:
+            break
+        evidences += await _clone_task_chunk(
+            db, id_pairs, project.id, created_by, options, date_shift_days
+        )
+        copied += len(id_pairs)
+        last_id = id_pairs[-1][0]
+        if progress:
+            progress(copied, total)
+
+    return project, {"tasks": copied, "evidences": evidences}
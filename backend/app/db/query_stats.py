@@ -0,0 +1,176 @@
+"""
+Query Stats
+Conteo de sentencias SQL y tiempo de base de datos por request, con
+detección de patrones N+1 (misma sentencia repetida)
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_query_stats: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+_START_KEY = "query_stats_start"
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_CAST = re.compile(r"::\w+(?:\[\])?")
+_PARAM = re.compile(r"\$\d+|%\(\w+\)s|(?<!:):\w+")
+_IN_LIST = re.compile(r"\bIN \(\?(?:, \?)*\)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """
+    Normalizar una sentencia SQL para agrupar ejecuciones equivalentes
+
+    Reemplaza literales y parámetros por `?`, quita casts y colapsa listas IN.
+    Cacheado: SQLAlchemy reutiliza el mismo texto para sentencias compiladas.
+    """
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _STRING.sub("?", normalized)
+    normalized = _CAST.sub("", normalized)
+    normalized = _PARAM.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    return _IN_LIST.sub("IN (?)", normalized)
+
+
+class QueryStats:
+    """Acumulador de sentencias ejecutadas dentro de un request"""
+
+    __slots__ = ("count", "seconds", "fingerprints")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.fingerprints: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def most_repeated(self) -> tuple[str, int]:
+        """Sentencia más repetida y cuántas veces se ejecutó"""
+        if not self.fingerprints:
+            return "", 0
+        return self.fingerprints.most_common(1)[0]
+
+
+# ==============================================
+# Instrumentación de engines (todos los Engine del proceso)
+# ==============================================
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _query_stats.get() is not None:
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _query_stats.get()
+    starts = conn.info.get(_START_KEY)
+    if stats is None or not starts:
+        return
+    stats.record(statement, time.perf_counter() - starts.pop())
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Contar las sentencias ejecutadas dentro del bloque
+
+    Usage:
+        with track_queries() as stats:
+            await client.get("/api/v1/projects/")
+        assert stats.count <= 5
+    """
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+@contextmanager
+def query_budget(max_queries: int, max_repeats: Optional[int] = None) -> Iterator[QueryStats]:
+    """
+    Como track_queries, pero falla si el bloque excede el presupuesto
+
+    Raises:
+        AssertionError si se ejecutan más de `max_queries` sentencias o una
+        misma sentencia más de `max_repeats` veces
+    """
+    with track_queries() as stats:
+        yield stats
+    assert stats.count <= max_queries, (
+        f"{stats.count} queries (presupuesto {max_queries})"
+    )
+    if max_repeats is not None:
+        statement, repeats = stats.most_repeated()
+        assert repeats <= max_repeats, (
+            f"Sentencia repetida {repeats} veces (máximo {max_repeats}): {statement}"
+        )
+
+
+class QueryCounterMiddleware:
+    """
+    Publica el conteo de queries y el tiempo de BD en los headers
+    `X-DB-Queries` y `Server-Timing`, y registra un warning cuando el
+    request excede DB_QUERY_WARN_THRESHOLD sentencias o repite la misma
+    sentencia DB_QUERY_REPEAT_THRESHOLD veces (probable N+1)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _query_stats.set(stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-queries", str(stats.count).encode()))
+                headers.append((
+                    b"server-timing",
+                    f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"'.encode(),
+                ))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _query_stats.reset(token)
+            self._warn(scope, stats)
+
+    @staticmethod
+    def _warn(scope, stats: QueryStats) -> None:
+        statement, repeats = stats.most_repeated()
+        too_many = stats.count > settings.DB_QUERY_WARN_THRESHOLD
+        repeated = repeats >= settings.DB_QUERY_REPEAT_THRESHOLD
+        if not (too_many or repeated):
+            return
+        logger.warning(
+            f"[QueryStats] {scope['method']} {scope['path']}: {stats.count} queries, "
+            f"{stats.seconds * 1000:.1f} ms en BD; repetida {repeats}x: {statement[:300]}"
+        )
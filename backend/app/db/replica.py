@@ -0,0 +1,139 @@
+"""
+Read Replica Routing
+Decide si una lectura puede ir a la réplica: lag medido periódicamente y
+stickiness read-your-writes por usuario tras sus propias escrituras
+"""
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.authentication import PRINCIPAL_SCOPE_KEY, get_current_principal
+from app.core.config import settings
+from app.core.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+_WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# Lag 0 si la réplica ya aplicó todo lo recibido (pg_last_xact_replay_timestamp
+# no avanza cuando el primario está ocioso)
+_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+def _sticky_key(user_id: int) -> str:
+    return f"db:ryw:user:{user_id}"
+
+
+class ReplicaLagMonitor:
+    """Cache en proceso del lag de la réplica, medido como máximo cada N segundos"""
+
+    def __init__(self):
+        self.lag_seconds: Optional[float] = None
+        self.checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def current_lag(self, engine: AsyncEngine) -> Optional[float]:
+        """
+        Lag de la réplica en segundos
+
+        Returns:
+            Lag medido o None si la réplica no responde
+        """
+        if time.monotonic() - self.checked_at < settings.DATABASE_REPLICA_LAG_CHECK_SECONDS:
+            return self.lag_seconds
+        async with self._lock:
+            if time.monotonic() - self.checked_at < settings.DATABASE_REPLICA_LAG_CHECK_SECONDS:
+                return self.lag_seconds
+            try:
+                async with engine.connect() as conn:
+                    lag = (await conn.execute(_LAG_QUERY)).scalar()
+                self.lag_seconds = float(lag) if lag is not None else 0.0
+            except Exception as exc:
+                logger.warning(f"[Replica] No se pudo medir el lag: {exc}")
+                self.lag_seconds = None
+            self.checked_at = time.monotonic()
+            return self.lag_seconds
+
+
+lag_monitor = ReplicaLagMonitor()
+
+
+async def mark_recent_write(user_id: int) -> None:
+    """Fijar las lecturas del usuario al primario durante la ventana configurada"""
+    try:
+        await redis_client.set(
+            _sticky_key(user_id), "1", ex=settings.DATABASE_READ_YOUR_WRITES_SECONDS
+        )
+    except Exception as exc:
+        logger.warning(f"[Replica] No se pudo marcar escritura de user={user_id}: {exc}")
+
+
+async def has_recent_write(user_id: int) -> bool:
+    """True si el usuario escribió dentro de la ventana read-your-writes"""
+    try:
+        return bool(await redis_client.exists(_sticky_key(user_id)))
+    except Exception:
+        # Sin Redis no se puede garantizar read-your-writes: ir al primario
+        return True
+
+
+async def use_replica(replica_engine: Optional[AsyncEngine]) -> bool:
+    """
+    Decidir si la lectura del request actual puede ir a la réplica
+
+    Args:
+        replica_engine: Engine de la réplica (None si no hay réplica)
+
+    Returns:
+        True si hay réplica, su lag es aceptable y el usuario no escribió
+        recientemente
+    """
+    if replica_engine is None:
+        return False
+    principal = get_current_principal()
+    if principal is not None and await has_recent_write(principal.user_id):
+        return False
+    lag = await lag_monitor.current_lag(replica_engine)
+    return lag is not None and lag <= settings.DATABASE_REPLICA_MAX_LAG_SECONDS
+
+
+class ReadYourWritesMiddleware:
+    """
+    Marca al usuario autenticado tras una escritura exitosa para que sus
+    siguientes lecturas vayan al primario. Requiere AuthenticationMiddleware
+    por fuera.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not settings.DATABASE_REPLICA_URL
+            or scope["method"] not in _WRITE_METHODS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        principal = scope.get(PRINCIPAL_SCOPE_KEY)
+        if principal is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def mark_send(message):
+            # Marcar antes de que el cliente reciba la respuesta
+            if message["type"] == "http.response.start" and message.get("status", 200) < 400:
+                await mark_recent_write(principal.user_id)
+            await send(message)
+
+        await self.app(scope, receive, mark_send)
@@ -3,39 +3,115 @@ Database Session Configuration
 SQLAlchemy 2.0 async setup
 """
 from typing import AsyncGenerator
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     async_sessionmaker,
     AsyncSession,
     AsyncEngine
 )
-from sqlalchemy.pool import NullPool, AsyncAdaptedQueuePool
 
 from app.core.config import settings
+from app.db.pool import engine_options, instrument_engine
+from app.db.replica import use_replica
 
 
-# Create async engine
+# Create async engine (pool configurado por DATABASE_POOL_* / DATABASE_PGBOUNCER)
 engine: AsyncEngine = create_async_engine(
     settings.DATABASE_URL,
-    echo=settings.is_development,  # Log SQL en desarrollo
-    future=True,
-    pool_pre_ping=True,  # Verificar conexiones antes de usar
+    **engine_options(),
 )
 
-# Create async session factory
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,  # No expire objects después de commit
-    autocommit=False,
-    autoflush=False,
+# Engine de réplica de lectura (None si DATABASE_REPLICA_URL no está configurada)
+read_engine: AsyncEngine | None = (
+    create_async_engine(settings.DATABASE_REPLICA_URL, **engine_options())
+    if settings.DATABASE_REPLICA_URL else None
 )
 
+# Métricas del pool etiquetadas por engine
+instrument_engine(engine, "primary")
+if read_engine is not None:
+    instrument_engine(read_engine, "replica")
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+# Transacciones READ ONLY: asyncpg las abre con BEGIN READ ONLY, sin
+# round-trip adicional (postgresql_readonly es una característica de conexión)
+read_only_engine: AsyncEngine = engine.execution_options(postgresql_readonly=True)
+
+
+# ==============================================
+# Seguimiento de escrituras por sesión
+# ==============================================
+_WRITES_KEY = "has_writes"
+
+
+class WriteTrackingSession(Session):
+    """Session que registra en info si hubo flush o DML explícito"""
+
+
+@event.listens_for(WriteTrackingSession, "after_flush")
+def _mark_flush(session, flush_context):
+    session.info[_WRITES_KEY] = True
+
+
+@event.listens_for(WriteTrackingSession, "do_orm_execute")
+def _mark_dml(orm_execute_state):
+    # update()/insert()/delete()/text() ejecutados vía session.execute
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[_WRITES_KEY] = True
+
+
+@event.listens_for(WriteTrackingSession, "after_commit")
+@event.listens_for(WriteTrackingSession, "after_rollback")
+def _reset_writes(session):
+    session.info.pop(_WRITES_KEY, None)
+
+
+def session_has_writes(session: AsyncSession) -> bool:
+    """True si la transacción actual escribió o tiene cambios pendientes de flush"""
+    return bool(
+        session.info.get(_WRITES_KEY)
+        or session.new
+        or session.dirty
+        or session.deleted
+    )
+
+
+def _session_factory(bind: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(
+        bind,
+        class_=AsyncSession,
+        sync_session_class=WriteTrackingSession,
+        expire_on_commit=False,  # No expire objects después de commit
+        autocommit=False,
+        autoflush=False,
+    )
+
+
+# Create async session factories
+AsyncSessionLocal = _session_factory(engine)
+ReadOnlySessionLocal = _session_factory(read_only_engine)
+ReadSessionLocal = _session_factory(read_engine) if read_engine is not None else ReadOnlySessionLocal
+
+_READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+async def read_session_factory() -> async_sessionmaker:
+    """Factory de sesiones para lecturas: réplica si está disponible, si no primario READ ONLY"""
+    return ReadSessionLocal if await use_replica(read_engine) else ReadOnlySessionLocal
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency para obtener database session
     
+    La transacción se abre de forma perezosa con la primera consulta (no se
+    toma conexión del pool si el handler no usa la sesión). En GET/HEAD la
+    transacción es READ ONLY. Al final sólo se hace commit si la transacción
+    sigue abierta y hubo escrituras: los handlers que ya hicieron commit, o
+    que sólo leyeron, no pagan un segundo round-trip de COMMIT.
+    
     Usage:
         @router.get("/")
         async def endpoint(db: AsyncSession = Depends(get_db)):
@@ -44,15 +120,31 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     Yields:
         AsyncSession
     """
-    async with AsyncSessionLocal() as session:
+    session_factory = ReadOnlySessionLocal if request.method in _READ_METHODS else AsyncSessionLocal
+    async with session_factory() as session:
         try:
             yield session
-            await session.commit()
+            if session.in_transaction() and session_has_writes(session):
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
-        finally:
-            await session.close()
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency de sólo lectura, enrutada a la réplica cuando es seguro
+
+    Va al primario si no hay réplica, si su lag supera
+    DATABASE_REPLICA_MAX_LAG_SECONDS o si el usuario escribió hace menos de
+    DATABASE_READ_YOUR_WRITES_SECONDS. Nunca hace commit.
+    
+    Yields:
+        AsyncSession
+    """
+    session_factory = await read_session_factory()
+    async with session_factory() as session:
+        yield session
 
 
 async def init_db() -> None:
@@ -72,3 +164,5 @@ async def close_db() -> None:
     Cerrar conexiones de database al shutdown
     """
     await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
@@ -5,15 +5,23 @@ Punto de entrada de la API
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-from contextlib import asynccontextmanager
+from fastapi.responses import JSONResponse, Response
+from contextlib import asynccontextmanager, suppress
+import asyncio
 import logging
 
 from app.core.config import settings
 from app.core.audit import AuditMiddleware
+from app.core.health import readiness_checker
+from app.core.authentication import AuthenticationMiddleware
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.responses import FastJSONResponse
+from app.core.activity_stream import activity_broker
+from app.core.tenant_cache import listen_for_invalidations
+from app.core.redis_client import close_redis
+from app.db.query_stats import QueryCounterMiddleware
+from app.db.replica import ReadYourWritesMiddleware
 from app.db.session import close_db
 from app.api.v1.router import api_router
 
@@ -25,10 +33,6 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-# Rate limiter
-limiter = Limiter(key_func=get_remote_address)
-
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -39,12 +43,22 @@ async def lifespan(app: FastAPI):
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     logger.info(f"Database: {settings.DATABASE_URL.split('@')[-1]}")  # Hide credentials
     
+    # Invalidaciones del cache de tenants publicadas por otros workers
+    tenant_cache_listener = asyncio.create_task(listen_for_invalidations())
+    # Actividad de proyectos publicada por cualquier worker -> clientes SSE locales
+    activity_listener = asyncio.create_task(activity_broker.listen())
+    
     yield
     
     # Shutdown
     logger.info("Shutting down API...")
+    for listener in (tenant_cache_listener, activity_listener):
+        listener.cancel()
+        with suppress(asyncio.CancelledError):
+            await listener
     await close_db()
     logger.info("✓ Database connections closed")
+    await close_redis()
 
 
 # Create FastAPI app
@@ -55,13 +69,10 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=FastJSONResponse,
     lifespan=lifespan
 )
 
-# Add rate limiting state
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
 # ============================================
 # Middleware
 # ============================================
@@ -69,6 +80,24 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 # Audit Middleware (se ejecuta último)
 app.add_middleware(AuditMiddleware)
 
+# Read-your-writes: tras una escritura, las lecturas del usuario van al primario
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Conteo de queries por request (X-DB-Queries / Server-Timing, warnings N+1)
+app.add_middleware(QueryCounterMiddleware)
+
+# Rate limiting por usuario/tenant/IP (necesita el principal: va dentro de Authentication)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
+# Autenticación: verifica el JWT una vez y publica el principal
+# (debe envolver a AuditMiddleware, por eso se agrega después)
+app.add_middleware(AuthenticationMiddleware)
+
+# Métricas Prometheus (latencia por template de ruta, requests en curso)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Trusted Host (seguridad adicional en producción)
 if settings.is_production:
     app.add_middleware(
@@ -100,7 +129,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-Total-Count", "X-Page", "X-Page-Size"]
+    expose_headers=["X-Total-Count", "X-Page", "X-Page-Size", "X-DB-Queries", "Server-Timing", "ETag"]
 )
 
 
@@ -141,17 +170,50 @@ async def root():
     }
 
 
+@app.get("/health/live", tags=["Health"])
+async def liveness():
+    """
+    Liveness: el proceso responde (no consulta dependencias)
+    """
+    return {"status": "alive"}
+
+
+@app.get("/health/ready", tags=["Health"])
+async def readiness():
+    """
+    Readiness: Postgres, Redis y MinIO responden dentro del timeout
+    Devuelve 503 si alguna dependencia falla (resultado cacheado unos segundos)
+    """
+    result = await readiness_checker.check()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if result["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "status": "healthy" if result["ready"] else "unhealthy",
+            "version": settings.VERSION,
+            "environment": settings.ENVIRONMENT,
+            "checks": result["checks"],
+            "cached": result["cached"],
+        }
+    )
+
+
 @app.get("/health", tags=["Health"])
 async def health_check():
     """
-    Health check endpoint para monitoring/load balancers
+    Health check endpoint para monitoring/load balancers (equivale a readiness)
     """
-    # TODO: Agregar checks de database, redis, minio
-    return {
-        "status": "healthy",
-        "version": settings.VERSION,
-        "environment": settings.ENVIRONMENT
-    }
+    return await readiness()
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", tags=["Health"], include_in_schema=False)
+    async def metrics():
+        """
+        Métricas en formato Prometheus (agregadas entre workers si
+        PROMETHEUS_MULTIPROC_DIR está definido)
+        """
+        payload, content_type = await render_metrics()
+        return Response(content=payload, media_type=content_type)
 
 
 # Include API router
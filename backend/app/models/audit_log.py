@@ -1,5 +1,5 @@
 """Audit Log Model"""
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base
@@ -7,7 +7,8 @@ from app.db.base import Base
 class AuditLog(Base):
     __tablename__ = "audit_logs"
     
-    id = Column(Integer, primary_key=True)
+    # PK compuesta: la tabla está particionada por mes sobre created_at
+    id = Column(Integer, primary_key=True, autoincrement=True)
     tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
     module_key = Column(String(50), index=True)
@@ -19,7 +20,16 @@ class AuditLog(Base):
     ip_address = Column(String(50))
     user_agent = Column(Text)
     request_id = Column(String(50), index=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, primary_key=True, index=True)
     
     tenant = relationship("Tenant", back_populates="audit_logs")
     user = relationship("User", back_populates="audit_logs")
+    
+    # Índices compuestos para paginación keyset (created_at, id) por filtro
+    __table_args__ = (
+        Index("ix_audit_logs_created_at_id", "created_at", "id"),
+        Index("ix_audit_logs_tenant_created_at", "tenant_id", "created_at", "id"),
+        Index("ix_audit_logs_tenant_module_created_at", "tenant_id", "module_key", "created_at", "id"),
+        Index("ix_audit_logs_tenant_action_created_at", "tenant_id", "action", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
@@ -1,5 +1,5 @@
 """Modelos para Matriz de Obligaciones"""
-from sqlalchemy import Column, Integer, String, Boolean, Enum as SQLEnum, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Integer, String, Boolean, Enum as SQLEnum, ForeignKey, DateTime, Text, Index, Computed
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -46,6 +46,12 @@ class CompanyClassification(Base):
     creator = relationship("User", foreign_keys=[created_by])
 
 
+# Expresión de la columna generada codigo_sort_key (ver migración 20260308_0600)
+CODIGO_SORT_KEY_SQL = (
+    r"regexp_replace(regexp_replace(codigo, '(\d+)', '00000\1', 'g'), '0*(\d{6})', '\1', 'g')"
+)
+
+
 class ComplianceRequirement(Base):
     """Catálogo de requerimientos de la Tabla 1.1.A"""
     __tablename__ = "compliance_requirements"
@@ -54,6 +60,14 @@ class ComplianceRequirement(Base):
     
     # Código del requerimiento (ej: "2.1", "2.8.1")
     codigo = Column(String(20), nullable=False, unique=True, index=True)
+
+    # Clave de orden natural ("2.10" después de "2.9"): cada grupo de dígitos
+    # rellenado a 6 posiciones. La calcula Postgres (columna generada)
+    codigo_sort_key = Column(
+        String(120),
+        Computed(CODIGO_SORT_KEY_SQL, persisted=True),
+        nullable=True,
+    )
     
     # Nombre del requerimiento
     nombre = Column(String(200), nullable=False)
@@ -132,3 +146,8 @@ class ComplianceAuditLog(Base):
     company = relationship("Company")
     tenant = relationship("Tenant")
     user = relationship("User")
+    
+    # Consulta por tenant ordenada por fecha y barrido del job de archivado
+    __table_args__ = (
+        Index("ix_compliance_audit_logs_tenant_created_at", "tenant_id", "created_at"),
+    )
@@ -14,6 +14,7 @@ class License(Base):
     current_storage_gb = Column(Float, default=0.0, nullable=False)
     enabled_modules = Column(JSON, nullable=False)
     expires_at = Column(DateTime, nullable=True)
+    rate_limit_per_minute = Column(Integer, nullable=True)  # None = RATE_LIMIT_TENANT_PER_MINUTE
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -1,5 +1,6 @@
 """Modelos para Proyectos y Tareas"""
-from sqlalchemy import Column, Integer, String, Boolean, Enum as SQLEnum, ForeignKey, DateTime, Text, Float, Date
+from sqlalchemy import Column, Integer, String, Boolean, Enum as SQLEnum, ForeignKey, DateTime, Text, Float, Date, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -180,6 +181,11 @@ class TaskComment(Base):
     task = relationship("ProjectTask", back_populates="comments")
     creator = relationship("User")
 
+    __table_args__ = (
+        # Paginación keyset por tarea (created_at DESC, id DESC)
+        Index("ix_task_comments_task_created_at", "task_id", "created_at", "id"),
+    )
+
 
 class TaskActivityLog(Base):
     """Log de actividad/cambios en una tarea"""
@@ -187,10 +193,13 @@ class TaskActivityLog(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     task_id = Column(Integer, ForeignKey("project_tasks.id"), nullable=False, index=True)
+    # Desnormalizados desde la tarea para los feeds de proyecto/tenant sin JOIN
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False)
     
     # Tipo de evento
     event_type = Column(String(50), nullable=False)  # STATUS_CHANGED, ASSIGNED, EVIDENCE_ADDED, etc.
-    payload_json = Column(Text, nullable=True)  # JSON con detalles del cambio
+    payload_json = Column(JSONB, nullable=True)  # Detalles del cambio
     
     # Auditoría
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -199,3 +208,11 @@ class TaskActivityLog(Base):
     # Relaciones
     task = relationship("ProjectTask", back_populates="activity_logs")
     creator = relationship("User")
+
+    __table_args__ = (
+        # Paginación keyset por tarea (created_at DESC, id DESC)
+        Index("ix_task_activity_logs_task_created_at", "task_id", "created_at", "id"),
+        # Feeds de actividad (proyecto y tenant)
+        Index("ix_task_activity_logs_project_created_at", "project_id", "created_at", "id"),
+        Index("ix_task_activity_logs_tenant_created_at", "tenant_id", "created_at", "id"),
+    )
@@ -0,0 +1,27 @@
+"""Background Job Schemas"""
+from pydantic import BaseModel
+from typing import Any, Optional
+
+
+class JobProgress(BaseModel):
+    """Avance reportado por el worker"""
+    done: int
+    total: int
+    stage: Optional[str] = None
+
+
+class JobStatus(BaseModel):
+    """Estado de un job en segundo plano"""
+    job_id: str
+    kind: str
+    state: str  # PENDING, STARTED, PROGRESS, SUCCESS, FAILURE
+    progress: Optional[JobProgress] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+
+
+class JobAccepted(BaseModel):
+    """Respuesta 202 al encolar un job"""
+    job_id: str
+    kind: str
+    status_url: str
@@ -1,7 +1,7 @@
 """
 Pydantic schemas for Projects module
 """
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 from typing import Optional, List
 from datetime import datetime, date
 from app.models.project import ProjectStatus, TaskStatus, TaskType
@@ -65,6 +65,17 @@ class ProjectResponse(BaseModel):
     updated_at: Optional[datetime]
 
 
+class ProjectCloneRequest(BaseModel):
+    """Opciones para clonar un proyecto o usarlo como plantilla"""
+    name: Optional[str] = Field(None, min_length=1, max_length=200)  # Default: "<nombre> (copia)"
+    company_id: Optional[int] = None  # Otra empresa del tenant; default: la del origen
+    start_date: Optional[date] = None  # Si el origen tiene inicio, desplaza las fechas límite
+    due_date: Optional[date] = None
+    include_assignees: bool = True
+    include_notes: bool = True
+    include_evidences: bool = False  # Referencias a los mismos archivos (no se copian bytes)
+
+
 class ProjectListItem(BaseModel):
     """Schema para listado de proyectos"""
     model_config = ConfigDict(from_attributes=True)
@@ -193,6 +204,44 @@ class TaskResponse(BaseModel):
     updated_at: datetime
 
 
+class TaskBulkUpdate(BaseModel):
+    """Cambios comunes a aplicar a varias tareas de un proyecto"""
+    task_ids: List[int] = Field(..., min_length=1, max_length=1000)
+    status: Optional[TaskStatus] = None
+    assignee_user_id: Optional[int] = None  # null explícito = desasignar
+    due_date: Optional[date] = None
+
+    @field_validator('task_ids')
+    @classmethod
+    def dedupe_ids(cls, v: List[int]) -> List[int]:
+        return list(dict.fromkeys(v))
+
+    @field_validator('status')
+    @classmethod
+    def status_not_null(cls, v: Optional[TaskStatus]) -> TaskStatus:
+        # Sólo se valida si viene en el cuerpo: omitirlo = no cambiar
+        if v is None:
+            raise ValueError('status no puede ser null')
+        return v
+
+
+class TaskReorder(BaseModel):
+    """Nuevo orden de tareas (las no incluidas quedan después, en su orden actual)"""
+    task_ids: List[int] = Field(..., min_length=1, max_length=5000)
+
+    @field_validator('task_ids')
+    @classmethod
+    def unique_ids(cls, v: List[int]) -> List[int]:
+        if len(set(v)) != len(v):
+            raise ValueError('task_ids contiene IDs repetidos')
+        return v
+
+
+class TaskReorderResult(BaseModel):
+    """Resultado del reordenamiento"""
+    updated: int
+
+
 # ==================
 # EVIDENCE SCHEMAS
 # ==================
@@ -242,6 +291,12 @@ class CommentResponse(BaseModel):
     created_at: datetime
 
 
+class CommentPage(BaseModel):
+    """Página de comentarios (más recientes primero)"""
+    items: List[CommentResponse]
+    next_cursor: Optional[str] = None
+
+
 # ==================
 # ACTIVITY LOG SCHEMAS
 # ==================
@@ -257,3 +312,22 @@ class ActivityLogResponse(BaseModel):
     action: str
     details: Optional[dict]
     created_at: datetime
+
+
+class ActivityLogPage(BaseModel):
+    """Página del timeline de actividad (más reciente primero)"""
+    items: List[ActivityLogResponse]
+    next_cursor: Optional[str] = None
+
+
+class ActivityFeedItem(ActivityLogResponse):
+    """Evento del feed de actividad de proyecto/tenant"""
+    project_id: int
+    task_code: Optional[str] = None
+    task_title: Optional[str] = None
+
+
+class ActivityFeedPage(BaseModel):
+    """Página del feed de actividad (más reciente primero)"""
+    items: List[ActivityFeedItem]
+    next_cursor: Optional[str] = None
@@ -5,7 +5,8 @@ from celery.schedules import crontab
 celery_app = Celery(
     "codigo_red_worker",
     broker="redis://redis:6379/0",
-    backend="redis://redis:6379/1"
+    backend="redis://redis:6379/1",
+    include=["app.workers.tasks"]
 )
 
 celery_app.conf.update(
@@ -15,3 +16,15 @@ celery_app.conf.update(
     timezone="UTC",
     enable_utc=True,
 )
+
+# Periodic tasks (Celery Beat)
+celery_app.conf.beat_schedule = {
+    "maintain-audit-log-partitions": {
+        "task": "app.workers.tasks.maintain_audit_log_partitions",
+        "schedule": crontab(hour=2, minute=0),  # Diario 02:00 UTC
+    },
+    "archive-audit-logs": {
+        "task": "app.workers.tasks.archive_audit_logs",
+        "schedule": crontab(hour=3, minute=0),  # Diario 03:00 UTC
+    },
+}
@@ -0,0 +1,46 @@
+"""
+Database helpers para tareas Celery
+Las tareas son síncronas; cada ejecución corre su corrutina con un engine propio
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+
+@asynccontextmanager
+async def worker_engine() -> AsyncIterator[AsyncEngine]:
+    """
+    Engine sin pool para una ejecución de tarea
+
+    El pool del API está ligado a su event loop; en el worker cada tarea usa
+    asyncio.run() con un loop nuevo, por eso se crea y desecha un engine aquí.
+    """
+    from app.core.config import settings
+    from app.db.pool import asyncpg_connect_args
+
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        poolclass=NullPool,
+        connect_args=asyncpg_connect_args(),
+    )
+    try:
+        yield engine
+    finally:
+        await engine.dispose()
+
+
+@asynccontextmanager
+async def worker_session() -> AsyncIterator[AsyncSession]:
+    """Sesión async para una ejecución de tarea"""
+    async with worker_engine() as engine:
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with session_factory() as session:
+            yield session
+
+
+def run_async(func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+    """Ejecutar una corrutina desde una tarea Celery síncrona"""
+    return asyncio.run(func(*args, **kwargs))
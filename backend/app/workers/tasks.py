@@ -18,3 +18,204 @@ def generate_compliance_report_pdf(company_id: int, user_id: int):
 def check_expiring_obligations():
     logger.info("Checking for expiring obligations...")
     return {"checked": True, "notifications_sent": 0}
+
+
+async def _maintain_audit_log_partitions() -> dict:
+    from datetime import date
+    from app.core.config import settings
+    from app.db.partitions import add_months, detach_partitions_before, ensure_monthly_partitions, month_start
+    from app.workers.db import worker_engine
+
+    cutoff = add_months(month_start(date.today()), -settings.AUDIT_LOG_RETENTION_MONTHS)
+    async with worker_engine() as engine:
+        async with engine.begin() as conn:
+            created = await ensure_monthly_partitions(
+                conn, "audit_logs", settings.AUDIT_LOG_PARTITION_MONTHS_AHEAD
+            )
+            detached = await detach_partitions_before(conn, "audit_logs", cutoff)
+    return {"created": created, "detached": detached}
+
+
+@celery_app.task
+def maintain_audit_log_partitions():
+    """
+    Pre-crear particiones mensuales futuras de audit_logs (moviendo antes a su
+    mes las filas caídas en la partición DEFAULT) y desadjuntar las que
+    superan la retención. Las desadjuntadas quedan como tablas independientes
+    listas para archivar y eliminar con DROP TABLE.
+    """
+    from app.workers.db import run_async
+
+    result = run_async(_maintain_audit_log_partitions)
+    logger.info(
+        f"Audit log partitions: created={result['created']} detached={result['detached']}"
+    )
+    return result
+
+
+async def _archive_audit_logs() -> dict:
+    from datetime import date, datetime
+    from app.core.audit_archive import archive_rows
+    from app.core.config import settings
+    from app.db.partitions import (
+        add_months,
+        drain_default_partition,
+        drop_partition,
+        list_detached_partitions,
+        month_start,
+        partitions_before,
+    )
+    from app.workers.db import worker_engine
+
+    cutoff_month = add_months(month_start(date.today()), -settings.AUDIT_LOG_HOT_MONTHS)
+    cutoff = datetime.combine(cutoff_month, datetime.min.time())
+
+    summary = {}
+    async with worker_engine() as engine:
+        # audit_logs: meses completos fuera de la ventana caliente (adjuntos o ya
+        # desadjuntados por maintain_audit_log_partitions) se archivan enteros y
+        # se eliminan con DETACH + DROP, sin DELETE fila a fila
+        # Filas caídas en DEFAULT pasan primero a su partición mensual
+        async with engine.begin() as conn:
+            await drain_default_partition(conn, "audit_logs")
+        async with engine.connect() as conn:
+            partitions = await list_detached_partitions(conn, "audit_logs")
+            partitions += await partitions_before(conn, "audit_logs", cutoff_month)
+        for name in sorted(partitions):
+            summary[name] = await archive_rows(engine, name, "audit_logs", delete_rows=False)
+            async with engine.begin() as conn:
+                await drop_partition(conn, "audit_logs", name)
+
+        # compliance_audit_logs no está particionada: DELETE por segmento
+        summary["compliance_audit_logs"] = await archive_rows(
+            engine, "compliance_audit_logs", "compliance_audit_logs", cutoff
+        )
+    return summary
+
+
+@celery_app.task
+def archive_audit_logs():
+    """
+    Archivar en MinIO (NDJSON + zstd, por tenant/mes) lo que queda fuera de la
+    ventana caliente: particiones completas de audit_logs (luego DETACH y DROP)
+    y filas de compliance_audit_logs (borradas tras subir cada segmento).
+    """
+    from app.workers.db import run_async
+
+    summary = run_async(_archive_audit_logs)
+    logger.info(f"Audit log archive: {summary}")
+    return summary
+
+
+async def _clone_project(job, source_project_id: int, user_id: int, options: dict) -> dict:
+    from sqlalchemy import select
+    from app.db.project_tasks import clone_project
+    from app.models.project import Project
+    from app.schemas.project import ProjectCloneRequest
+    from app.workers.db import worker_session
+
+    def report(done: int, total: int) -> None:
+        job.update_state(state="PROGRESS", meta={"done": done, "total": total, "stage": "tasks"})
+
+    async with worker_session() as db:
+        source = (await db.execute(select(Project).where(Project.id == source_project_id))).scalar_one()
+        project, summary = await clone_project(
+            db, source, ProjectCloneRequest(**options), user_id, progress=report
+        )
+        await db.commit()
+    return {"project_id": project.id, **summary}
+
+
+@celery_app.task(bind=True)
+def clone_project_job(self, source_project_id: int, user_id: int, options: dict):
+    """
+    Clonar un proyecto grande en segundo plano, reportando progreso
+    (estado PROGRESS con done/total) por cada lote de tareas copiado.
+    """
+    from app.workers.db import run_async
+
+    result = run_async(_clone_project, self, source_project_id, user_id, options)
+    logger.info(f"Project {source_project_id} cloned: {result}")
+    return result
+
+
+async def _import_companies(job, fileobj, fmt: str, tenant_id: int) -> dict:
+    from app.core.company_import import count_rows, import_companies, iter_rows
+    from app.workers.db import worker_session
+
+    total = count_rows(fileobj, fmt)
+    fileobj.seek(0)
+
+    def report(done: int, total: int) -> None:
+        job.update_state(state="PROGRESS", meta={"done": done, "total": total, "stage": "companies"})
+
+    report(0, total)
+    async with worker_session() as db:
+        return await import_companies(db, iter_rows(fileobj, fmt), tenant_id, total=total, progress=report)
+
+
+@celery_app.task(bind=True)
+def import_companies_job(self, tenant_id: int, user_id: int, object_name: str, fmt: str):
+    """
+    Importar empresas desde un CSV/XLSX subido a MinIO (bucket documentos),
+    reportando progreso por lote y devolviendo los errores por fila.
+    """
+    import tempfile
+    from app.core.minio_client import minio_client
+    from app.workers.db import run_async
+
+    try:
+        # Copia local por bloques: XLSX necesita un archivo con seek
+        with tempfile.TemporaryFile() as fileobj:
+            minio_client.download_to("documentos", object_name, fileobj)
+            fileobj.seek(0)
+            result = run_async(_import_companies, self, fileobj, fmt, tenant_id)
+    finally:
+        minio_client.delete_file("documentos", object_name)
+    logger.info(f"Company import by user {user_id} (tenant {tenant_id}): {result['created']} created, {result['failed']} failed")
+    return result
+
+
+async def _reclassify_companies(job, tenant_id: int, user_id: int, regenerate_classifications: bool, dry_run: bool) -> dict:
+    from redis.asyncio import Redis
+    from app.core.config import settings
+    from app.core.etag import bump_version, company_resource
+    from app.db.company_classification import reclassify_companies
+    from app.workers.db import worker_session
+
+    def report(done: int, total: int) -> None:
+        job.update_state(state="PROGRESS", meta={"done": done, "total": total, "stage": "companies"})
+
+    async with worker_session() as db:
+        result, changed_ids = await reclassify_companies(
+            db, tenant_id, user_id,
+            regenerate_classifications=regenerate_classifications,
+            dry_run=dry_run,
+            progress=report,
+        )
+
+    if changed_ids:
+        # Cliente propio: el compartido de la API pertenece a otro event loop
+        client = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+        try:
+            await bump_version(*(company_resource(company_id) for company_id in changed_ids), client=client)
+        finally:
+            await client.aclose()
+    return result
+
+
+@celery_app.task(bind=True)
+def reclassify_companies_job(self, tenant_id: int, user_id: int, regenerate_classifications: bool = False, dry_run: bool = False):
+    """
+    Recalcular la clasificación de todas las empresas de un tenant por lotes,
+    reportando progreso y devolviendo las diferencias encontradas.
+    """
+    from app.workers.db import run_async
+
+    result = run_async(_reclassify_companies, self, tenant_id, user_id, regenerate_classifications, dry_run)
+    logger.info(
+        f"Companies of tenant {tenant_id} reclassified (dry_run={dry_run}): "
+        f"{result['clasificacion_changed']} clasificacion, "
+        f"{result['classifications_created'] + result['classifications_updated']} classifications"
+    )
+    return result
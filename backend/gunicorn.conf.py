@@ -0,0 +1,23 @@
+"""
+Gunicorn Configuration
+Hooks para métricas Prometheus en modo multiproceso
+(gunicorn carga ./gunicorn.conf.py automáticamente; las opciones de la
+línea de comandos del Dockerfile siguen aplicando)
+"""
+import os
+import shutil
+
+
+def on_starting(server):
+    """Limpiar métricas de ejecuciones anteriores"""
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """Descartar los gauges live* del worker que terminó"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
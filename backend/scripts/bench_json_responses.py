@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Benchmark de serialización de respuestas JSON
+Compara el camino por defecto de FastAPI (response_model -> validación ->
+dump a tipos JSON -> json.dumps) con FastJSONResponse(modelo), sobre las
+respuestas más grandes del API: bitácora, matriz de obligaciones y
+listado de cotizaciones con líneas.
+
+Run: python scripts/bench_json_responses.py [--iterations 200]
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.api.v1.admin.audit_logs import AuditLogItem, AuditLogListResponse
+from app.core.responses import FastJSONResponse
+from app.schemas.compliance import (
+    ComplianceMatrixItem,
+    ComplianceMatrixResponse,
+    EstadoAplicabilidadEnum,
+    TipoCentroCargaEnum,
+)
+from app.schemas.quote import QuoteLineResponse, QuoteListResponse, QuoteResponse
+
+NOW = datetime(2026, 3, 1, 12, 0, 0)
+
+
+def build_audit_logs(n: int = 200) -> AuditLogListResponse:
+    items = [
+        AuditLogItem(
+            id=i,
+            tenant_id=1,
+            user_id=i % 20,
+            user_email=f"usuario{i % 20}@empresa.mx",
+            module_key="projects",
+            action="update",
+            entity_type="project_task",
+            entity_id=i,
+            ip_address="10.0.0.1",
+            before_data={"status": "pendiente", "assignee_id": None, "notes": "x" * 80},
+            after_data={"status": "en_progreso", "assignee_id": 7, "notes": "y" * 80},
+            request_id=f"req-{i:08d}",
+            created_at=NOW - timedelta(minutes=i),
+        )
+        for i in range(n)
+    ]
+    return AuditLogListResponse(items=items, total=10_000, page=1, page_size=n, pages=50)
+
+
+def build_compliance_matrix(roots: int = 40, children: int = 6, depth: int = 2) -> ComplianceMatrixResponse:
+    counter = iter(range(1, 1_000_000))
+
+    def node(level: int, parent_id, orden: int) -> ComplianceMatrixItem:
+        req_id = next(counter)
+        return ComplianceMatrixItem(
+            requerimiento_id=req_id,
+            codigo=f"R{req_id}",
+            nombre=f"Requerimiento {req_id}",
+            descripcion="Descripción del requerimiento aplicable al centro de carga " * 2,
+            parent_id=parent_id,
+            orden=orden,
+            estado_aplicabilidad=EstadoAplicabilidadEnum.APLICA,
+            notas=None,
+            children=[node(level + 1, req_id, j) for j in range(children)] if level < depth else [],
+        )
+
+    return ComplianceMatrixResponse(
+        company_id=1,
+        razon_social="Empresa de Prueba SA de CV",
+        tipo_centro_carga=TipoCentroCargaEnum.TIPO_B,
+        requerimientos=[node(1, None, i) for i in range(roots)],
+    )
+
+
+def build_quotes(n: int = 100, lines: int = 12) -> QuoteListResponse:
+    quotes = []
+    for i in range(n):
+        quote_lines = [
+            QuoteLineResponse(
+                id=i * lines + j,
+                tenant_id=1,
+                quote_id=i,
+                quote_item_id=j,
+                description=f"Concepto {j} de la cotización",
+                quantity=Decimal("2.00"),
+                unit_price=Decimal("1500.50"),
+                subtotal=Decimal("3001.00"),
+                created_at=NOW,
+                updated_at=NOW,
+            )
+            for j in range(lines)
+        ]
+        quotes.append(QuoteResponse(
+            id=i,
+            tenant_id=1,
+            company_id=i % 10,
+            title=f"Cotización {i}",
+            quote_number=f"COT-2026-{i:05d}",
+            status="enviada",
+            total=Decimal("36012.00"),
+            iva_percent=16,
+            iva_amount=Decimal("5761.92"),
+            total_con_iva=Decimal("41773.92"),
+            fecha_vigencia=date(2026, 4, 1),
+            tipo_centro_carga="TIPO_B",
+            razon_social="Empresa de Prueba SA de CV",
+            created_at=NOW,
+            updated_at=NOW,
+            lines=quote_lines,
+        ))
+    return QuoteListResponse(quotes=quotes, total=n, page=1, page_size=n)
+
+
+async def default_path(field, model) -> bytes:
+    """Lo que hace FastAPI con `return modelo` y response_model"""
+    content = await serialize_response(field=field, response_content=model)
+    return JSONResponse(content).body
+
+
+def fast_path(model) -> bytes:
+    return FastJSONResponse(model).body
+
+
+async def bench(name: str, model, iterations: int) -> None:
+    field = create_response_field(name=f"bench_{name}", type_=type(model))
+    body = fast_path(model)
+    assert json.loads(body) == json.loads(await default_path(field, model)), f"{name}: salidas distintas"
+    size = len(body)
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await default_path(field, model)
+    default_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fast_path(model)
+    fast_s = time.perf_counter() - started
+
+    print(
+        f"{name:<20} {size / 1024:>8.1f} KB"
+        f" {iterations / default_s:>10.1f} req/s"
+        f" {iterations / fast_s:>10.1f} req/s"
+        f" {default_s / fast_s:>7.1f}x"
+    )
+
+
+async def main(iterations: int) -> None:
+    print(f"{'respuesta':<20} {'tamaño':>11} {'default':>15} {'FastJSON':>15} {'mejora':>8}")
+    await bench("audit_logs", build_audit_logs(), iterations)
+    await bench("compliance_matrix", build_compliance_matrix(), iterations)
+    await bench("quotes", build_quotes(), iterations)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))